@@ -0,0 +1,105 @@
+import threading
+import time
+
+def _az_diff(a, b):
+    return (a - b + 180.0) % 360.0 - 180.0
+
+class TargetArbiter:
+    """Sits between the rotctl clients and MotorController.
+
+    - Coalescing: at most one target is applied per `window` seconds; newer
+      targets replace a pending one instead of queueing.
+    - Dead band: targets within `deadband` degrees of the last applied one are
+      dropped, so tracker jitter does not reverse the motors.
+    - Ownership: the first client to send a target owns control until it
+      disconnects or is silent for `owner_timeout`; targets and stops from
+      other clients are rejected.
+    """
+
+    def __init__(self, controller, window=0.2, deadband=0.1, owner_timeout=5.0):
+        self.controller = controller
+        self.window = float(window)
+        self.deadband = float(deadband)
+        self.owner_timeout = float(owner_timeout)
+        self.owner = None
+        self._owner_t = 0.0
+        self._applied = None
+        self._applied_t = 0.0
+        self._pending = None
+        self._cond = threading.Condition()
+        self.counts = {"received": 0, "applied": 0, "coalesced": 0, "suppressed": 0, "rejected": 0}
+        threading.Thread(target=self._flush_loop, daemon=True).start()
+
+    def submit(self, client, az: float, el: float) -> bool:
+        now = time.monotonic()
+        with self._cond:
+            self.counts["received"] += 1
+            if not self._may_control(client, now):
+                self.counts["rejected"] += 1
+                return False
+            self.owner = client
+            self._owner_t = now
+            if self._pending is not None:
+                self.counts["coalesced"] += 1
+            self._pending = (float(az), float(el))
+            if now - self._applied_t >= self.window:
+                self._apply(now)
+            else:
+                self._cond.notify()
+            return True
+
+    def set_target(self, az: float, el: float):
+        self.submit(None, az, el)
+
+    def release(self, client):
+        with self._cond:
+            if self.owner == client:
+                self.owner = None
+
+    def stop(self, client=None) -> bool:
+        now = time.monotonic()
+        with self._cond:
+            if not self._may_control(client, now):
+                self.counts["rejected"] += 1
+                return False
+            self._pending = None
+            self._applied = None
+            self.controller.stop()
+            return True
+
+    def get_position(self):
+        return self.controller.get_position()
+
+    def snapshot(self):
+        return self.controller.snapshot()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return dict(self.counts, owner=self.owner)
+
+    def _may_control(self, client, now):
+        return self.owner is None or client == self.owner or now - self._owner_t >= self.owner_timeout
+
+    def _apply(self, now):
+        az, el = self._pending
+        self._pending = None
+        a = self._applied
+        if a is not None and abs(_az_diff(az, a[0])) < self.deadband and abs(el - a[1]) < self.deadband:
+            self.counts["suppressed"] += 1
+            return
+        self.controller.set_target(az, el)
+        self._applied = (az, el)
+        self._applied_t = now
+        self.counts["applied"] += 1
+
+    def _flush_loop(self):
+        with self._cond:
+            while True:
+                if self._pending is None:
+                    self._cond.wait()
+                    continue
+                wait = self._applied_t + self.window - time.monotonic()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+                self._apply(time.monotonic())
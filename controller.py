@@ -1,46 +1,219 @@
+import logging
+import os
+import sys
 import time
 import threading
+from typing import NamedTuple
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from gimbal.control import AdaptiveControl
+from gimbal.gain_schedule import load_schedules
+from gimbal.scheduler import PeriodicScheduler
+from gimbal.slew import SlewPlan, nearest_branch, plan_pass
+from gimbal.trajectory import TargetTrajectory
+
+GAINS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "src", "motorPID", "gains.json")
+
+log = logging.getLogger(__name__)
+
+class PositionSnapshot(NamedTuple):
+    t: float
+    az: float
+    el: float
+    vaz: float
+    vel: float
+    target_az: float
+    target_el: float
 
 class MotorController:
-    def __init__(self, mock=True):
+    """Readers never take the lock: the loop publishes an immutable
+    PositionSnapshot each tick and get_position()/snapshot() just read that
+    reference. The lock only orders the (rare) target writers.
+
+    Without mock, `sensor` (read() -> raw az, el) and `actuator`
+    (drive(az_duty, el_duty)) come from gimbal.backends and the loop runs the
+    adaptive PID from gimbal.control on them.
+
+    Targets go through a TargetTrajectory: set_target() timestamps each
+    point, the loop samples the fitted trajectory every tick and the target
+    velocity is fed forward, so a moving target is not chased one step late.
+
+    Azimuth is mechanical (unwrapped, within `az_limits`): each target
+    bearing is placed on the branch nearest the current target, and steps
+    larger than `slew_min` degrees are flown as a synchronised
+    trapezoidal/S-curve SlewPlan (`profile`) at `slew_rate`/`slew_accel`.
+    follow_pass() picks the branch that holds a whole pass without an unwind.
+
+    `peaker` (gimbal.steptrack.StepTrack / ConicalScan) adds its pointing
+    correction and probe offset to the target every tick.
+
+    A sensor that reports `stale` (gimbal.wt901.WT901Sensor without a fresh
+    reply) stops the motors until readings resume; `stale_ticks` counts the
+    loop periods skipped that way.
+
+    An exception in a loop tick (sensor, trajectory, peaker, control law)
+    stops the motors, is logged and counted in `faults` (`fault` keeps the
+    last one); the loop carries on with the next tick.
+
+    `clock` (e.g. gimbal.sim.VirtualClock) replaces time.monotonic/sleep for
+    the loop timing and snapshot timestamps, for faster-than-real-time runs
+    against gimbal.sim.SimPlant.
+    """
+
+    def __init__(self, mock=True, period=0.02, sensor=None, actuator=None, gains=GAINS_PATH, clock=None,
+                 az_limits=(-180.0, 180.0), slew_rate=(20.0, 20.0), slew_accel=(20.0, 20.0), profile="trapezoid",
+                 slew_min=2.0, peaker=None):
         self._mock = mock
-        self._target_az = 0.0
-        self._target_el = 0.0
+        if not mock and (sensor is None or actuator is None):
+            raise ValueError("hardware mode needs a sensor and an actuator backend")
+        self.sensor = sensor
+        self.actuator = actuator
+        self._now = time.monotonic if clock is None else clock.monotonic
+        self.control = None if mock else AdaptiveControl(load_schedules(gains), wrap_az=False, clock=self._now)
+        self.az_limits = az_limits
+        self.slew_rate = slew_rate
+        self.slew_accel = slew_accel
+        self.profile = profile
+        self.slew_min = slew_min
+        self.peaker = peaker
+        self._offset = (0.0, 0.0)
+        if clock is None:
+            self.scheduler = PeriodicScheduler(period)
+        else:
+            self.scheduler = PeriodicScheduler(period, clock.monotonic_ns, clock.sleep)
+        self.trajectory = TargetTrajectory(unwrap=False)
         self._az = 0.0
         self._el = 0.0
+        self._snap = PositionSnapshot(self._now(), 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
         self._lock = threading.Lock()
-        self._stop = False
-        threading.Thread(target=self._loop, daemon=True).start()
+        self._run = True
+        self.stale_ticks = 0
+        self.faults = 0
+        self.fault = None
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
 
     def set_target(self, az: float, el: float):
         with self._lock:
-            self._target_az = float(az)
-            self._target_el = float(el)
+            now = self._now()
+            az = nearest_branch(float(az), self.trajectory.sample(now)[0], self.az_limits)
+            if self.trajectory.push(now, az, el):
+                s = self._snap
+                if max(abs(az - s.az), abs(el - s.el)) > self.slew_min:
+                    plan = SlewPlan((s.az, s.el), (az, el), self.slew_rate, self.slew_accel, self.profile)
+                    self.trajectory.follow(*plan.arrays(now))
 
-    def get_position(self):
+    def follow(self, t, az, el):
+        """Track a precomputed trajectory (arrays; t on this controller's
+        clock, az mechanical)."""
+        with self._lock:
+            self.trajectory.follow(t, az, el)
+
+    def follow_pass(self, t, az, el):
+        """Track a whole pass (t on this controller's clock, az as a bearing):
+        slew to it now on the azimuth branch that needs no unwind during the
+        pass, wait there for AOS, then follow it."""
+        t, el = np.asarray(t, dtype=np.float64), np.asarray(el, dtype=np.float64)
         with self._lock:
-            return float(self._az), float(self._el)
+            now = self._now()
+            k = min(int(np.searchsorted(t, now)), len(t) - 1)
+            s = self._snap
+            step = float(np.median(np.diff(t[k:]))) if len(t) - k > 1 else 1.0
+            mech, plan = plan_pass((s.az, s.el), az[k:], el[k:], self.az_limits, self.slew_rate,
+                                   self.slew_accel, self.profile, step)
+            ts, a, e = plan.arrays(now)
+            keep = t[k:] > ts[-1]
+            self.trajectory.follow(np.concatenate([ts, t[k:][keep]]), np.concatenate([a, mech[keep]]),
+                                   np.concatenate([e, el[k:][keep]]))
+
+    def snapshot(self) -> PositionSnapshot:
+        return self._snap
+
+    def get_position(self):
+        s = self._snap
+        return s.az, s.el
 
     def stop(self):
         with self._lock:
-            self._target_az = self._az
-            self._target_el = self._el
-            self._stop = True
+            s = self._snap
+            self.trajectory.hold(s.az, s.el, self._now())
 
-    def _loop(self):
-        dt = 0.02
-        while True:
-            time.sleep(dt)
+    def calibrate(self):
+        """Take the current sensor reading as az = 0, el = 0."""
+        if self.sensor is not None:
+            self._offset = self.sensor.read()
             with self._lock:
-                if self._mock:
-                    s = 20.0 * dt
-                    if abs(self._target_az - self._az) > s:
-                        self._az += s if self._target_az > self._az else -s
-                    else:
-                        self._az = self._target_az
-                    if abs(self._target_el - self._el) > s:
-                        self._el += s if self._target_el > self._el else -s
-                    else:
-                        self._el = self._target_el
-                else:
-                    pass
+                self._az = self._el = 0.0
+                self.trajectory.hold(0.0, 0.0, self._now())
+            self.control.reset()
+
+    def close(self, timeout=1.0):
+        self._run = False
+        self._thread.join(timeout)
+        if self.actuator is not None:
+            self.actuator.stop()
+            self.actuator.close()
+        if self.sensor is not None and self.sensor is not self.actuator:
+            self.sensor.close()
+
+    def _loop(self):
+        failing = False
+        while self._run:
+            dt = self.scheduler.wait()
+            try:
+                self._tick(dt)
+                failing = False
+            except Exception as e:
+                self.faults += 1
+                self.fault = e
+                if not failing:
+                    log.exception("control loop tick failed")
+                failing = True
+                if self.actuator is not None:
+                    try:
+                        self.actuator.stop()
+                    except Exception:
+                        log.exception("actuator stop failed")
+                if self.control is not None:
+                    self.control.reset()
+
+    def _tick(self, dt):
+        now = self._now()
+        target_az, target_el, vaz_t, vel_t = self.trajectory.sample(now)
+        aim_az, aim_el = target_az, target_el
+        if self.peaker is not None:
+            oaz, oel = self.peaker.offset(now, self._el)
+            aim_az += oaz
+            aim_el += oel
+        az0, el0 = self._az, self._el
+        if self._mock:
+            s = 20.0 * dt
+            if abs(aim_az - self._az) > s:
+                self._az += s if aim_az > self._az else -s
+            else:
+                self._az = aim_az
+            if abs(aim_el - self._el) > s:
+                self._el += s if aim_el > self._el else -s
+            else:
+                self._el = aim_el
+        elif getattr(self.sensor, "stale", False):
+            # Never drive on a frozen angle: hold the motors off and
+            # restart the PID once the sensor answers again.
+            if self._run:
+                self.actuator.stop()
+                self.control.reset()
+            self.stale_ticks += 1
+            return
+        else:
+            raw_az, raw_el = self.sensor.read()
+            # The sensor reports a bearing; count turns to keep az mechanical.
+            a = raw_az - self._offset[0]
+            self._az += (a - self._az + 180.0) % 360.0 - 180.0
+            self._el = raw_el - self._offset[1]
+            if self._run:
+                out = self.control.step(aim_az, aim_el, self._az, self._el, dt, vaz_t, vel_t)
+                self.actuator.drive(*out)
+        self._snap = PositionSnapshot(self._now(), self._az, self._el,
+                                      (self._az - az0) / dt, (self._el - el0) / dt, target_az, target_el)
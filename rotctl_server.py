@@ -1,18 +1,214 @@
+import asyncio
+import logging
 import socket
 import threading
+import time
 
-class RotctlServer:
-    def __init__(self, controller, host="0.0.0.0", port=4533):
+RIG_OK = 0
+RIG_EINVAL = -1
+RIG_EINTERNAL = -7
+RIG_EPROTO = -8
+RIG_ERJCTED = -9
+
+# Hamlib ROT_MOVE_* direction codes for the M / \move command.
+MOVE_UP, MOVE_DOWN, MOVE_LEFT, MOVE_RIGHT = 2, 4, 8, 16
+
+EXT_SEPARATORS = {"+": "\n", ";": ";", "|": "|", ",": ","}
+MAX_LINE = 4096
+
+log = logging.getLogger(__name__)
+
+def _set_pos(srv, client, args):
+    return srv.set_target(client, float(args[0]), float(args[1])), []
+
+def _get_pos(srv, client, args):
+    return RIG_OK, srv.position_values()
+
+def _stop(srv, client, args):
+    return srv.stop(client), []
+
+def _park(srv, client, args):
+    return srv.set_target(client, *srv.park), []
+
+def _reset(srv, client, args):
+    return srv.stop(client), []
+
+def _move(srv, client, args):
+    direction = int(args[0])
+    az, el = srv.controller.get_position()
+    if direction == MOVE_UP:
+        el = srv.el_limits[1]
+    elif direction == MOVE_DOWN:
+        el = srv.el_limits[0]
+    elif direction == MOVE_LEFT:
+        az = srv.az_limits[0]
+    elif direction == MOVE_RIGHT:
+        az = srv.az_limits[1]
+    else:
+        return RIG_EINVAL, []
+    return srv.set_target(client, az, el), []
+
+def _get_info(srv, client, args):
+    return RIG_OK, [("Info", srv.info)]
+
+def _dump_caps(srv, client, args):
+    return RIG_OK, [
+        ("Model name", srv.info),
+        ("Rot type", "Az-El"),
+        ("Min Azimuth", f"{srv.az_limits[0]:.2f}"),
+        ("Max Azimuth", f"{srv.az_limits[1]:.2f}"),
+        ("Min Elevation", f"{srv.el_limits[0]:.2f}"),
+        ("Max Elevation", f"{srv.el_limits[1]:.2f}"),
+    ]
+
+def _dump_state(srv, client, args):
+    # Layout read by Hamlib's NET rotctl backend: protocol version, model,
+    # then key=value limits terminated by "done".
+    return RIG_OK, [
+        (None, "1"),
+        (None, "2"),
+        (None, f"min_az={srv.az_limits[0]:.6f}"),
+        (None, f"max_az={srv.az_limits[1]:.6f}"),
+        (None, f"min_el={srv.el_limits[0]:.6f}"),
+        (None, f"max_el={srv.el_limits[1]:.6f}"),
+        (None, "south_zero=0"),
+        (None, "rot_type=AzEl"),
+        (None, "done"),
+    ]
+
+# (short, long name, number of args, handler); short None = long form only.
+COMMANDS = [
+    ("P", "set_pos", 2, _set_pos),
+    ("p", "get_pos", 0, _get_pos),
+    ("S", "stop", 0, _stop),
+    ("K", "park", 0, _park),
+    ("R", "reset", 1, _reset),
+    ("M", "move", 2, _move),
+    ("_", "get_info", 0, _get_info),
+    ("1", "dump_caps", 0, _dump_caps),
+    (None, "dump_state", 0, _dump_state),
+]
+SHORT = {c[0]: c for c in COMMANDS if c[0]}
+LONG = {c[1]: c for c in COMMANDS}
+QUIT = {"Q", "q", "\\quit"}
+
+class RotctlSession:
+    """Per-connection parser: buffers input, runs every complete line in order
+    and returns all replies as one bytes object."""
+
+    def __init__(self, server, client=None):
+        self.server = server
+        self.client = client
+        self._buf = b""
+
+    def feed(self, data: bytes):
+        self._buf += data
+        *lines, self._buf = self._buf.split(b"\n")
+        out = []
+        if len(self._buf) > MAX_LINE:
+            self._buf = b""
+            out.append(f"RPRT {RIG_EPROTO}\n")
+        for line in lines:
+            cmd = line.decode("ascii", errors="ignore").strip()
+            if not cmd:
+                continue
+            if cmd in QUIT:
+                out.append(f"RPRT {RIG_OK}\n")
+                return "".join(out).encode("ascii"), True
+            try:
+                out.append(self.execute(cmd))
+            except Exception:
+                log.exception("rotctl %s: %r failed", self.client, cmd)
+                out.append(f"RPRT {RIG_EINTERNAL}\n")
+        return "".join(out).encode("ascii"), False
+
+    def execute(self, cmd: str) -> str:
+        sep = None
+        if cmd[0] in EXT_SEPARATORS:
+            sep = EXT_SEPARATORS[cmd[0]]
+            cmd = cmd[1:].lstrip()
+        if cmd.startswith("\\"):
+            name, _, rest = cmd[1:].partition(" ")
+            entry = LONG.get(name)
+        else:
+            name, rest = cmd[:1], cmd[1:]
+            entry = SHORT.get(name)
+        if entry is None:
+            return f"RPRT {RIG_EPROTO}\n"
+        short, long_name, nargs, fn = entry
+        args = rest.split()
+        if len(args) < nargs:
+            code, values = RIG_EINVAL, []
+        else:
+            try:
+                code, values = fn(self.server, self.client, args[:nargs])
+            except (ValueError, IndexError):
+                code, values = RIG_EINVAL, []
+            except Exception:
+                log.exception("rotctl %s: %r failed", self.client, cmd)
+                code, values = RIG_EINTERNAL, []
+        if sep is None:
+            if values and code == RIG_OK:
+                return "".join((f"{k}: {v}\n" if k else f"{v}\n") for k, v in values)
+            return f"RPRT {code}\n"
+        head = f"{long_name}:" + "".join(" " + a for a in args[:nargs])
+        fields = [head] + [(f"{k}: {v}" if k else v) for k, v in values] + [f"RPRT {code}"]
+        return sep.join(fields) + "\n"
+
+class _ProtocolConfig:
+    def __init__(self, controller, az_limits=(-180.0, 180.0), el_limits=(0.0, 90.0), park=(0.0, 0.0),
+                 info="Rotator Bridge", pos_max_age=0.0, arbiter=None):
         self.controller = controller
+        self.arbiter = arbiter
+        self.az_limits = az_limits
+        self.el_limits = el_limits
+        self.park = park
+        self.info = info
+        self.pos_max_age = pos_max_age
+        self._pos_cache = None
+
+    def set_target(self, client, az, el):
+        if self.arbiter is None:
+            self.controller.set_target(az, el)
+            return RIG_OK
+        return RIG_OK if self.arbiter.submit(client, az, el) else RIG_ERJCTED
+
+    def stop(self, client):
+        if self.arbiter is None:
+            self.controller.stop()
+            return RIG_OK
+        return RIG_OK if self.arbiter.stop(client) else RIG_ERJCTED
+
+    def release(self, client):
+        if self.arbiter is not None:
+            self.arbiter.release(client)
+
+    def position_values(self):
+        # Optional read-side cache: pollers within pos_max_age seconds share one
+        # formatted reply instead of each hitting the controller.
+        now = time.monotonic()
+        c = self._pos_cache
+        if c is not None and now - c[0] <= self.pos_max_age:
+            return c[1]
+        az, el = self.controller.get_position()
+        vals = [("Azimuth", f"{az:.3f}"), ("Elevation", f"{el:.3f}")]
+        if self.pos_max_age > 0:
+            self._pos_cache = (now, vals)
+        return vals
+
+class RotctlServer(_ProtocolConfig):
+    def __init__(self, controller, host="0.0.0.0", port=4533, backlog=128, **kw):
+        super().__init__(controller, **kw)
         self.host = host
         self.port = port
+        self.backlog = backlog
         self._srv = None
 
     def start(self):
         self._srv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self._srv.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         self._srv.bind((self.host, self.port))
-        self._srv.listen(5)
+        self._srv.listen(self.backlog)
         threading.Thread(target=self._accept_loop, daemon=True).start()
 
     def _accept_loop(self):
@@ -21,44 +217,102 @@ class RotctlServer:
             threading.Thread(target=self._handle_client, args=(conn,), daemon=True).start()
 
     def _handle_client(self, conn: socket.socket):
-        f = conn.makefile("rwb", buffering=0)
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        client = "%s:%s" % conn.getpeername()[:2]
+        session = RotctlSession(self, client)
         try:
             while True:
-                line = f.readline()
-                if not line:
+                data = conn.recv(4096)
+                if not data:
                     break
-                cmd = line.decode("ascii", errors="ignore").strip()
-                if not cmd:
-                    continue
-                if cmd.startswith("P"):
-                    try:
-                        parts = cmd.split()
-                        az = float(parts[1]); el = float(parts[2])
-                        self.controller.set_target(az, el)
-                        f.write(b"RPRT 0\n")
-                    except Exception:
-                        f.write(b"RPRT -1\n")
-                elif cmd == "p":
-                    az, el = self.controller.get_position()
-                    f.write(f"Azimuth: {az:.3f}\n".encode("ascii"))
-                    f.write(f"Elevation: {el:.3f}\n".encode("ascii"))
-                elif cmd == "S":
-                    try:
-                        self.controller.stop()
-                        f.write(b"RPRT 0\n")
-                    except Exception:
-                        f.write(b"RPRT -1\n")
-                elif cmd == "Q":
-                    f.write(b"RPRT 0\n")
+                reply, close = session.feed(data)
+                if reply:
+                    conn.sendall(reply)
+                if close:
                     break
-                else:
-                    f.write(b"RPRT -8\n")
+        except OSError:
+            pass
         finally:
+            self.release(client)
             try:
-                f.close()
+                conn.close()
             except Exception:
                 pass
+
+class AsyncRotctlServer(_ProtocolConfig):
+    """Same protocol as RotctlServer, all clients served by one asyncio loop.
+
+    start() runs the loop in a background thread so callers use it exactly
+    like the threaded server.
+    """
+
+    def __init__(self, controller, host="0.0.0.0", port=4533, backlog=128, **kw):
+        super().__init__(controller, **kw)
+        self.host = host
+        self.port = port
+        self.backlog = backlog
+        self.loop = None
+        self._server = None
+        self._ready = threading.Event()
+        self._error = None
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error:
+            raise self._error
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            self._server = self.loop.run_until_complete(asyncio.start_server(
+                self._handle_client, self.host, self.port, reuse_address=True, backlog=self.backlog))
+        except Exception as e:
+            self._error = e
+            self._ready.set()
+            return
+        self._ready.set()
+        self.loop.run_forever()
+        # shutdown(): close the listener, cancel client tasks, release the loop.
+        self._server.close()
+        tasks = asyncio.all_tasks(self.loop)
+        for t in tasks:
+            t.cancel()
+        self.loop.run_until_complete(asyncio.gather(self._server.wait_closed(), *tasks, return_exceptions=True))
+        self.loop.close()
+
+    def shutdown(self, timeout=2.0):
+        # Not named stop(): that is the per-client rotator stop used by S/R.
+        if self.loop is not None and self._thread.is_alive():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout)
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        peer = writer.get_extra_info("peername") or ("?", 0)
+        client = "%s:%s" % peer[:2]
+        session = RotctlSession(self, client)
+        try:
+            while True:
+                data = await reader.read(4096)
+                if not data:
+                    break
+                reply, close = session.feed(data)
+                if reply:
+                    writer.write(reply)
+                    await writer.drain()
+                if close:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self.release(client)
             try:
-                conn.close()
+                writer.close()
             except Exception:
                 pass
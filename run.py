@@ -1,7 +1,11 @@
 import argparse
 import time
-from rotctl_server import RotctlServer
-from controller import MotorController
+from arbiter import TargetArbiter
+from rotctl_server import AsyncRotctlServer, RotctlServer
+from controller import GAINS_PATH, MotorController
+from gimbal.backends import open_backends
+from gimbal.steptrack import PEAKERS, start_feed
+from sdr_signal.telemetry import TelemetryReader
 from telemetry_sdr import TelemetrySDR
 
 def main():
@@ -9,15 +13,61 @@ def main():
     p.add_argument("--port", type=int, default=4533)
     p.add_argument("--mock", action="store_true")
     p.add_argument("--interval", type=float, default=0.5)
+    p.add_argument("--server", choices=["asyncio", "thread"], default="asyncio",
+                   help="asyncio: satu event loop untuk semua klien; thread: satu thread per klien (fallback)")
+    p.add_argument("--pos_max_age", type=float, default=0.0,
+                   help="umur maksimum (detik) cache balasan posisi bersama untuk banyak poller; 0 = tanpa cache")
+    p.add_argument("--coalesce", type=float, default=0.2, help="jendela (detik) penggabungan perintah P beruntun")
+    p.add_argument("--deadband", type=float, default=0.1, help="perubahan target (derajat) di bawah ini diabaikan")
+    p.add_argument("--owner_timeout", type=float, default=5.0,
+                   help="klien pemilik kontrol dilepas setelah diam selama ini (detik)")
+    p.add_argument("--driver", choices=["l298n", "bts7960", "sim"], default=None,
+                   help="driver motor untuk loop tertutup di controller; tanpa opsi ini tidak ada motor yang digerakkan")
+    p.add_argument("--sensor", choices=["wt901", "wt901sdk", "sim"], default=None, help="sensor sudut (default: wt901, atau sim untuk --driver sim)")
+    p.add_argument("--sensor_port", default="/dev/ttyUSB0")
+    p.add_argument("--sensor_baud", type=int, default=9600)
+    p.add_argument("--gains", default=GAINS_PATH, help="tabel gain-schedule JSON")
+    p.add_argument("--az_min", type=float, default=-180.0, help="batas mekanis azimuth (derajat, boleh < -180)")
+    p.add_argument("--az_max", type=float, default=180.0, help="batas mekanis azimuth (derajat, boleh > 180 untuk overlap kabel)")
+    p.add_argument("--profile", choices=["trapezoid", "scurve"], default="trapezoid", help="profil kecepatan slew")
+    p.add_argument("--peak", choices=["none", "step", "conical"], default="none",
+                   help="koreksi pointing dari daya SDR (telemetri shm): step-track atau conical scan")
+    p.add_argument("--peak_size", type=float, default=0.5, help="offset probe peaking (derajat)")
+    p.add_argument("--calibrate", action="store_true", help="jadikan posisi sensor saat start sebagai AZ=0 EL=0")
     args = p.parse_args()
+    az_limits = (args.az_min, args.az_max)
+    peaker = None if args.peak == "none" else PEAKERS[args.peak](args.peak_size)
 
-    ctrl = MotorController(mock=args.mock)
-    srv = RotctlServer(ctrl, port=args.port)
+    if args.sensor and not args.driver:
+        p.error("--sensor hanya berlaku bersama --driver")
+    if not args.driver and not args.mock:
+        # No motor backend: report mock positions (the old default) rather than fail.
+        print("Tanpa --driver: posisi mock (pakai --driver l298n|bts7960|sim untuk loop tertutup)")
+        args.mock = True
+    if args.driver and not args.mock:
+        try:
+            sensor, actuator = open_backends(args.driver, args.sensor, args.sensor_port, args.sensor_baud)
+        except (ImportError, OSError, ValueError) as e:
+            p.error(f"backend {args.driver}/{args.sensor or 'default'} gagal dibuka: {e}")
+        ctrl = MotorController(mock=False, sensor=sensor, actuator=actuator, gains=args.gains,
+                               az_limits=az_limits, profile=args.profile,
+                               peaker=peaker)
+        if args.calibrate:
+            time.sleep(0.5)
+            ctrl.calibrate()
+    else:
+        ctrl = MotorController(mock=args.mock, az_limits=az_limits, profile=args.profile,
+                               peaker=peaker)
+    server_cls = AsyncRotctlServer if args.server == "asyncio" else RotctlServer
+    arb = TargetArbiter(ctrl, args.coalesce, args.deadband, args.owner_timeout)
+    srv = server_cls(ctrl, port=args.port, pos_max_age=args.pos_max_age, arbiter=arb, az_limits=az_limits)
     srv.start()
     tel = TelemetrySDR(interval=args.interval)
+    if peaker is not None:
+        start_feed(peaker, TelemetryReader())
 
-    print(f"Rotator Bridge listening on port {args.port} (mock={args.mock})")
     try:
+        print(f"Rotator Bridge listening on port {args.port} (mock={args.mock}, driver={args.driver})")
         while True:
             t = tel.poll()
             if t:
@@ -27,6 +77,13 @@ def main():
             time.sleep(args.interval)
     except KeyboardInterrupt:
         pass
+    finally:
+        ctrl.close()
+    print(f"Targets: {arb.stats()}")
+    print(f"Control loop: {ctrl.scheduler.stats()}")
+    if peaker is not None:
+        print(f"Pointing correction: az={peaker.correction[0]:+.2f} el={peaker.correction[1]:+.2f} "
+              f"({peaker.updates} updates)")
 
 if __name__ == "__main__":
     main()
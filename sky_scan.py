@@ -0,0 +1,128 @@
+import argparse
+import time
+import numpy as np
+from controller import GAINS_PATH, MotorController
+from gimbal.backends import open_backends
+from gimbal.skyscan import SkyMap, raster, spiral
+from sdr_signal.telemetry import DEFAULT_PATH, TelemetryReader
+
+def scan(args):
+    limits = (args.az_limit_min, args.az_limit_max)
+    # The scan grid stays inside the mechanical azimuth limits.
+    az_range = (max(args.az_min, limits[0]), min(args.az_max, limits[1]))
+    if args.pattern == "raster":
+        if az_range[0] >= az_range[1]:
+            print(f"Rentang AZ {args.az_min:.1f}..{args.az_max:.1f} di luar batas mekanis "
+                  f"{limits[0]:.1f}..{limits[1]:.1f}, scan dibatalkan")
+            return
+        t, az, el = raster(az_range, (args.el_min, args.el_max), args.step, args.speed)
+    else:
+        t, az, el = spiral((args.center_az, args.center_el), args.radius, args.step, args.speed)
+        az = np.clip(az, *limits)
+    print(f"Pola {args.pattern}: {len(t)} titik, {t[-1]:.0f} s")
+
+    if args.driver and not args.mock:
+        sensor, actuator = open_backends(args.driver, args.sensor, args.sensor_port, args.sensor_baud)
+        ctrl = MotorController(mock=False, sensor=sensor, actuator=actuator, gains=args.gains,
+                               az_limits=limits, profile=args.profile)
+    else:
+        ctrl = MotorController(mock=True, az_limits=limits, profile=args.profile)
+    reader = TelemetryReader(args.shm)
+    sky = SkyMap(az_range, (args.el_min, args.el_max), args.res) if args.pattern == "raster" else \
+        SkyMap((max(limits[0], args.center_az - args.radius * 3), min(limits[1], args.center_az + args.radius * 3)),
+               (max(-5.0, args.center_el - args.radius), args.center_el + args.radius), args.res)
+
+    # Gimbal position and SDR frames, both stamped with time.monotonic.
+    pos = []
+    frames = []
+    seq = None
+    try:
+        # Go to the start point first, then run the pattern on the controller clock.
+        ctrl.set_target(az[0], el[0])
+        deadline = time.monotonic() + args.start_timeout
+        while True:
+            s = ctrl.snapshot()
+            if abs(s.az - az[0]) < 0.5 and abs(s.el - el[0]) < 0.5:
+                break
+            if time.monotonic() > deadline:
+                print(f"Titik awal AZ={az[0]:.1f} EL={el[0]:.1f} tidak tercapai dalam {args.start_timeout:.0f} s "
+                      f"(posisi AZ={s.az:.1f} EL={s.el:.1f}), scan dibatalkan")
+                return
+            time.sleep(0.1)
+        t0 = time.monotonic() + 0.5
+        ctrl.follow(t + t0, az, el)
+
+        while time.monotonic() < t0 + t[-1] + 1.0:
+            s = ctrl.snapshot()
+            pos.append((s.t, s.az, s.el))
+            rec = reader.read()
+            if rec is not None and reader.seq != seq and args.metric in rec and "t_mono" in rec:
+                seq = reader.seq
+                frames.append((rec["t_mono"], rec[args.metric]))
+            time.sleep(0.02)
+    except KeyboardInterrupt:
+        print("\nDihentikan, menyimpan bagian yang sudah dipindai")
+    finally:
+        ctrl.stop()
+        ctrl.close()
+
+    if not pos:
+        return
+    pos = np.array(pos)
+    n = 0
+    if frames:
+        fr = np.array(frames)
+        n = sky.add_frames(fr[:, 0], fr[:, 1], pos[:, 0], pos[:, 1], pos[:, 2])
+    sky.save(args.out, metric=args.metric, pattern=args.pattern)
+    print(f"{len(frames)} frame SDR, {n} masuk grid, {int((sky.hits > 0).sum())} sel terisi -> {args.out}")
+    for a, e, p, h in sky.peaks(args.peaks):
+        print(f"  AZ={a:7.2f} EL={e:6.2f}  {p:7.2f} dB  ({h} frame)")
+
+def query(args):
+    sky = SkyMap.load(args.map)
+    if args.az is not None and args.el is not None:
+        mean, peak, hits = sky.query(args.az, args.el)
+        print(f"AZ={args.az} EL={args.el}: rata-rata {mean:.2f} dB, maks {peak:.2f} dB, {hits} frame")
+    for a, e, p, h in sky.peaks(args.peaks):
+        print(f"  AZ={a:7.2f} EL={e:6.2f}  {p:7.2f} dB  ({h} frame)")
+
+def main():
+    p = argparse.ArgumentParser(description="Sky scan raster/spiral: peta daya SDR pada grid az/el")
+    sub = p.add_subparsers(dest="cmd", required=True)
+    s = sub.add_parser("scan")
+    s.add_argument("--pattern", choices=["raster", "spiral"], default="raster")
+    s.add_argument("--az_min", type=float, default=-180.0)
+    s.add_argument("--az_max", type=float, default=180.0)
+    s.add_argument("--el_min", type=float, default=5.0)
+    s.add_argument("--el_max", type=float, default=60.0)
+    s.add_argument("--center_az", type=float, default=0.0, help="pusat spiral")
+    s.add_argument("--center_el", type=float, default=30.0)
+    s.add_argument("--radius", type=float, default=10.0, help="radius spiral (derajat)")
+    s.add_argument("--step", type=float, default=2.0, help="jarak antar baris/putaran (derajat)")
+    s.add_argument("--speed", type=float, default=5.0, help="kecepatan sapuan (derajat/detik)")
+    s.add_argument("--start_timeout", type=float, default=120.0,
+                   help="batas waktu (detik) menuju titik awal pola sebelum scan dibatalkan")
+    s.add_argument("--res", type=float, default=1.0, help="resolusi grid (derajat)")
+    s.add_argument("--metric", default="peak_power_db", choices=["peak_power_db", "average_power_db"])
+    s.add_argument("--shm", default=DEFAULT_PATH)
+    s.add_argument("--out", default="skymap.npz")
+    s.add_argument("--peaks", type=int, default=5)
+    s.add_argument("--mock", action="store_true")
+    s.add_argument("--driver", choices=["l298n", "bts7960", "sim"], default=None)
+    s.add_argument("--sensor", choices=["wt901", "wt901sdk", "sim"], default=None)
+    s.add_argument("--sensor_port", default="/dev/ttyUSB0")
+    s.add_argument("--sensor_baud", type=int, default=9600)
+    s.add_argument("--gains", default=GAINS_PATH)
+    s.add_argument("--az_limit_min", type=float, default=-180.0, help="batas mekanis azimuth (derajat, boleh < -180)")
+    s.add_argument("--az_limit_max", type=float, default=180.0, help="batas mekanis azimuth (derajat, boleh > 180)")
+    s.add_argument("--profile", choices=["trapezoid", "scurve"], default="trapezoid", help="profil kecepatan slew")
+    q = sub.add_parser("query")
+    q.add_argument("map")
+    q.add_argument("--az", type=float)
+    q.add_argument("--el", type=float)
+    q.add_argument("--peaks", type=int, default=5)
+    args = p.parse_args()
+    scan(args) if args.cmd == "scan" else query(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+import itertools
+import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+import numpy as np
+
+from gimbal.control import AdaptiveControl
+from gimbal.gain_schedule import GainSchedule
+from gimbal.scheduler import PeriodicScheduler
+
+AXES = ("az", "el")
+
+class RelayResult(NamedTuple):
+    ku: float        # ultimate gain, duty % per degree
+    tu: float        # ultimate period, s
+    amplitude: float  # oscillation half peak-to-peak, deg
+    relay: float     # relay amplitude, duty %
+
+def relay_test(sensor, actuator, clock, axis="az", relay=40.0, hysteresis=0.1, bias=0.0, cycles=6,
+               period=0.02, timeout=60.0):
+    """Astrom-Hagglund relay test of one axis around its start position; the
+    first cycle is discarded."""
+    k = AXES.index(axis)
+    sched = PeriodicScheduler(period, clock.monotonic_ns, clock.sleep)
+    center = sensor.read()[k]
+    u = relay
+    t0 = clock.monotonic()
+    switches, ts, ys = [], [], []
+    try:
+        while len(switches) < 2 * cycles + 2:
+            t = clock.monotonic() - t0
+            if t > timeout:
+                raise RuntimeError(f"relay test on {axis} did not oscillate within {timeout:.0f} s")
+            y = sensor.read()[k]
+            e = center - y
+            if k == 0:
+                e = (e + 180.0) % 360.0 - 180.0
+            if e > hysteresis and u < 0:
+                u = relay
+                switches.append(t)
+            elif e < -hysteresis and u > 0:
+                u = -relay
+                switches.append(t)
+            out = [0.0, 0.0]
+            out[k] = u + bias
+            actuator.drive(*out)
+            ts.append(t)
+            ys.append(-e)
+            sched.wait()
+    finally:
+        actuator.stop()
+    ts, ys = np.array(ts), np.array(ys)
+    sw = np.array(switches[2:])
+    tu = 2.0 * float(np.mean(np.diff(sw)))
+    seg = ys[ts >= sw[0]]
+    a = float(seg.max() - seg.min()) / 2.0
+    return RelayResult(4.0 * relay / (math.pi * a), tu, a, relay)
+
+def seed_gains(r: RelayResult, ki=0.03):
+    """kp, kd from the ZN "no overshoot" rule; the axis integrates, so ki
+    is not taken from Tu and is swept on its own grid."""
+    kp = 0.2 * r.ku
+    return kp, ki, kp * r.tu / 3.0
+
+T_STEP = 0.5
+
+def _step(size):
+    return lambda t, s: s + size if t >= T_STEP else s
+
+def _ramp(rate):
+    return lambda t, s: s + rate * max(0.0, t - T_STEP)
+
+def _sine(amp, period):
+    return lambda t, s: s + amp * math.sin(2 * math.pi * max(0.0, t - T_STEP) / period)
+
+# (name, kind, duration, target(t, start) on the tuned axis)
+SUITE = (
+    ("step 2", "step", 10.0, _step(2.0)),
+    ("step 10", "step", 12.0, _step(10.0)),
+    ("step 60", "step", 20.0, _step(60.0)),
+    ("ramp 1/s", "track", 20.0, _ramp(1.0)),
+    ("ramp 4/s", "track", 12.0, _ramp(4.0)),
+    ("sine 15/20s", "track", 25.0, _sine(15.0, 20.0)),
+)
+START = {"az": (0.0, 45.0), "el": (0.0, 20.0)}
+
+# deg overshoot, s settling, deg RMS tracking error
+W_OVERSHOOT = 4.0
+W_SETTLE = 1.0
+W_TRACK = 10.0
+
+def step_metrics(t, err, t_step=T_STEP, tol=0.5):
+    """Overshoot, settling time (last exit from +-tol) and final error."""
+    k0 = int(np.searchsorted(t, t_step))
+    e = err[k0:]
+    s0 = np.sign(e[0]) or 1.0
+    bad = np.nonzero(np.abs(e) > tol)[0]
+    if not len(bad):
+        settle = 0.0
+    elif bad[-1] + 1 < len(e):
+        settle = float(t[k0 + bad[-1] + 1] - t_step)
+    else:
+        settle = math.inf
+    return {"overshoot": max(0.0, float(np.max(-s0 * e))), "settle": settle, "final": float(abs(e[-1]))}
+
+def track_metrics(t, err, warmup=3.0):
+    e = err[t >= T_STEP + warmup]
+    return {"rms": float(np.sqrt(np.mean(e * e))), "max": float(np.max(np.abs(e)))}
+
+def run_suite(schedules, axis, seed=0, period=0.02):
+    """(score, {test name: metrics}) of SUITE on a simulated axis."""
+    from gimbal.sim import SimPlant, VirtualClock, simulate
+    k = AXES.index(axis)
+    score = 0.0
+    results = {}
+    for i, (name, kind, duration, fn) in enumerate(SUITE):
+        start = START[axis]
+        clock = VirtualClock()
+        plant = SimPlant(clock, seed=seed + i, start=start)
+        ctl = AdaptiveControl(schedules, clock=clock.monotonic)
+        s = start[k]
+        if k == 0:
+            target = lambda t: (fn(t, s), start[1])
+        else:
+            target = lambda t: (start[0], fn(t, s))
+        r = simulate(ctl, plant, clock, target, duration, period)
+        err = r["target_" + axis] - r[axis]
+        if k == 0:
+            err = (err + 180.0) % 360.0 - 180.0
+        if kind == "step":
+            m = step_metrics(r["t"], err)
+            settle = m["settle"] if math.isfinite(m["settle"]) else 2.0 * duration
+            score += W_OVERSHOOT * m["overshoot"] + W_SETTLE * settle
+        else:
+            m = track_metrics(r["t"], err)
+            score += W_TRACK * m["rms"]
+        results[name] = m
+    return score, results
+
+def scaled_schedule(base: GainSchedule, kp, ki, kd):
+    """`base` rescaled so its largest-error knot is (kp, ki, kd)."""
+    d = base.to_dict()
+    for key, g in (("kp", kp), ("ki", ki), ("kd", kd)):
+        ref = d[key][-1] or max(d[key]) or 1.0
+        d[key] = [round(v / ref * g, 5) for v in d[key]] if any(d[key]) else [g] * len(d[key])
+    return GainSchedule.from_dict(d)
+
+def _evaluate(job):
+    axis, base, gains = job
+    schedules = {a: GainSchedule.from_dict(d) for a, d in base.items()}
+    schedules[axis] = scaled_schedule(schedules[axis], *gains)
+    score, results = run_suite(schedules, axis)
+    return score, gains, results
+
+KP_FACTORS = (0.5, 0.7, 1.0, 1.4, 2.0)
+KI_FACTORS = (0.0, 0.3, 1.0, 3.0)
+KD_FACTORS = (0.5, 0.7, 1.0, 1.4, 2.0)
+
+def sweep(axis, seed, schedules, jobs=None, kp_factors=KP_FACTORS, ki_factors=KI_FACTORS, kd_factors=KD_FACTORS):
+    """Scores seed * factors candidates in a process pool, best first."""
+    base = {a: s.to_dict() for a, s in schedules.items()}
+    cands = [(seed[0] * a, seed[1] * b, seed[2] * c) for a, b, c in
+             itertools.product(kp_factors, ki_factors, kd_factors)]
+    with ProcessPoolExecutor(jobs) as ex:
+        res = list(ex.map(_evaluate, [(axis, base, g) for g in cands], chunksize=4))
+    res.sort(key=lambda r: r[0])
+    return res
@@ -0,0 +1,164 @@
+import logging
+import threading
+import time
+
+# Sensors return (az, el) in degrees, actuators take signed duty in percent.
+
+WT901_SDK = "/home/raspberrypi5/WitStandardModbus_WT901C485/Python/Python-SDK-WT901C485/chs"
+
+log = logging.getLogger(__name__)
+
+class WT901SdkSensor:
+    """WT901C485 through the WitMotion Python SDK (as the motorPID scripts do)."""
+
+    def __init__(self, port="/dev/ttyUSB0", baud=9600, addr=0x50, sdk_path=WT901_SDK, poll=0.01, max_age=0.5,
+                 max_backoff=1.0):
+        import sys
+        if sdk_path not in sys.path:
+            sys.path.insert(0, sdk_path)
+        import lib.device_model as deviceModel
+        from lib.data_processor.roles.jy901s_dataProcessor import JY901SDataProcessor
+        from lib.protocol_resolver.roles.protocol_485_resolver import Protocol485Resolver
+
+        self.az = 0.0
+        self.el = 0.0
+        self.t = None
+        self.poll = poll
+        self.max_age = max_age
+        self.max_backoff = max_backoff
+        self.errors = 0
+        self._run = True
+        self._wake = threading.Event()
+        dev = deviceModel.DeviceModel("WT901", Protocol485Resolver(), JY901SDataProcessor(), "51_0")
+        dev.ADDR = addr
+        dev.serialConfig.portName = port
+        dev.serialConfig.baud = baud
+        dev.openDevice()
+        dev.dataProcessor.onVarChanged.append(self._on_update)
+        self._dev = dev
+        self._thread = threading.Thread(target=self._poll_loop, daemon=True)
+        self._thread.start()
+
+    def _on_update(self, dev):
+        self.az = dev.getDeviceData("angleZ")
+        self.el = dev.getDeviceData("angleY")
+        self.t = time.monotonic()
+
+    def _poll_loop(self):
+        delay = self.poll
+        while self._run:
+            try:
+                self._dev.readReg(0x30, 41)
+            except Exception as e:
+                if delay == self.poll:
+                    log.warning("WT901 SDK read failed: %r", e)
+                self.errors += 1
+                delay = min(self.max_backoff, max(delay, 1e-3) * 2.0)
+            else:
+                delay = self.poll
+            self._wake.wait(delay)
+
+    @property
+    def age(self):
+        return float("inf") if self.t is None else time.monotonic() - self.t
+
+    @property
+    def stale(self):
+        return self.age > self.max_age
+
+    def read(self):
+        return self.az, self.el
+
+    def close(self):
+        self._run = False
+        self._wake.set()
+        self._thread.join(1.0)
+        self._dev.closeDevice()
+
+class _GPIOActuator:
+    def __init__(self, freq):
+        import RPi.GPIO as GPIO
+        GPIO.setmode(GPIO.BCM)
+        GPIO.setwarnings(False)
+        self.GPIO = GPIO
+        self.freq = freq
+
+    def _pwm(self, pin):
+        self.GPIO.setup(pin, self.GPIO.OUT)
+        pwm = self.GPIO.PWM(pin, self.freq)
+        pwm.start(0)
+        return pwm
+
+    def stop(self):
+        self.drive(0.0, 0.0)
+
+    def close(self):
+        self.stop()
+        for pwm in self._pwms:
+            pwm.stop()
+        self.GPIO.cleanup()
+
+class L298NActuator(_GPIOActuator):
+    """L298N: one PWM enable pin plus two direction pins per axis."""
+
+    def __init__(self, az_pins=(18, 23, 24), el_pins=(13, 5, 6), freq=1000):
+        super().__init__(freq)
+        self._axes = []
+        for en, in1, in2 in (az_pins, el_pins):
+            self.GPIO.setup(in1, self.GPIO.OUT)
+            self.GPIO.setup(in2, self.GPIO.OUT)
+            self._axes.append((self._pwm(en), in1, in2))
+        self._pwms = [a[0] for a in self._axes]
+
+    def drive(self, az_out, el_out):
+        for (pwm, in1, in2), out in zip(self._axes, (az_out, el_out)):
+            out = max(-100.0, min(100.0, out))
+            self.GPIO.output(in1, out > 0)
+            self.GPIO.output(in2, out < 0)
+            pwm.ChangeDutyCycle(abs(out))
+
+class BTS7960Actuator(_GPIOActuator):
+    """BTS7960 / HW-039: separate forward (RPWM) and reverse (LPWM) PWM pins per axis."""
+
+    def __init__(self, az_pins=(18, 19), el_pins=(12, 13), freq=1000):
+        super().__init__(freq)
+        self._axes = [(self._pwm(r), self._pwm(l)) for r, l in (az_pins, el_pins)]
+        self._pwms = [p for a in self._axes for p in a]
+
+    def drive(self, az_out, el_out):
+        for (rpwm, lpwm), out in zip(self._axes, (az_out, el_out)):
+            out = max(-100.0, min(100.0, out))
+            if out >= 0:
+                lpwm.ChangeDutyCycle(0)
+                rpwm.ChangeDutyCycle(out)
+            else:
+                rpwm.ChangeDutyCycle(0)
+                lpwm.ChangeDutyCycle(-out)
+
+ACTUATORS = {"l298n": L298NActuator, "bts7960": BTS7960Actuator}
+
+def _wt901_native(port="/dev/ttyUSB0", baud=9600):
+    from gimbal.wt901 import WT901Sensor
+    return WT901Sensor(port, baud)
+
+SENSORS = {"wt901": _wt901_native, "wt901sdk": WT901SdkSensor}
+
+def open_backends(driver, sensor=None, port="/dev/ttyUSB0", baud=9600, clock=None):
+    """Returns (sensor, actuator); "sim" gives one SimPlant for both."""
+    if driver == "sim" or sensor == "sim":
+        if driver != "sim" or sensor not in (None, "sim"):
+            raise ValueError("the simulated backend is used for both sensor and driver")
+        from gimbal.sim import SimPlant
+        sim = SimPlant(clock=clock)
+        return sim, sim
+    if driver not in ACTUATORS:
+        raise ValueError(f"unknown driver {driver!r}")
+    sensor = sensor or "wt901"
+    if sensor not in SENSORS:
+        raise ValueError(f"unknown sensor {sensor!r}")
+    act = ACTUATORS[driver]()
+    try:
+        return SENSORS[sensor](port=port, baud=baud), act
+    except Exception:
+        act.close()
+        raise
@@ -0,0 +1,65 @@
+import argparse
+import os
+import time
+
+GAINS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "motorPID", "gains.json")
+
+def main():
+    p = argparse.ArgumentParser(description="Auto-tuning PID: identifikasi relay lalu sweep gain paralel di simulator")
+    p.add_argument("--axis", nargs="+", choices=["az", "el"], default=["az", "el"])
+    p.add_argument("--plant", choices=["sim", "hardware"], default="sim",
+                   help="tempat uji relay; sweep kandidat selalu di simulator")
+    p.add_argument("--driver", choices=["l298n", "bts7960"], default="l298n")
+    p.add_argument("--sensor_port", default="/dev/ttyUSB0")
+    p.add_argument("--sensor_baud", type=int, default=9600)
+    p.add_argument("--relay", type=float, default=40.0, help="amplitudo relay (duty %%)")
+    p.add_argument("--hysteresis", type=float, default=0.1, help="histeresis relay (derajat)")
+    p.add_argument("--gains", default=GAINS, help="tabel awal (bentuk kurva dan tabel gravitasi dipertahankan)")
+    p.add_argument("--out", default="gains_tuned.json")
+    p.add_argument("--jobs", type=int, default=os.cpu_count())
+    args = p.parse_args()
+
+    from gimbal.autotune import relay_test, run_suite, scaled_schedule, seed_gains, START, sweep
+    from gimbal.gain_schedule import load_schedules, save_schedules
+
+    schedules = load_schedules(args.gains)
+    if args.plant == "hardware":
+        from gimbal.backends import open_backends
+        sensor, actuator = open_backends(args.driver, "wt901", args.sensor_port, args.sensor_baud)
+        clock = time
+        time.sleep(0.5)
+    else:
+        from gimbal.sim import SimPlant, VirtualClock
+
+    for axis in args.axis:
+        if args.plant == "sim":
+            clock = VirtualClock()
+            sensor = actuator = SimPlant(clock, start=START[axis])
+        bias = schedules["el"].gravity(sensor.read()[1]) if axis == "el" else 0.0
+        r = relay_test(sensor, actuator, clock, axis, args.relay, args.hysteresis, bias)
+        seed = seed_gains(r)
+        print(f"[{axis}] relay: Ku={r.ku:.2f} %/deg  Tu={r.tu:.3f} s  a={r.amplitude:.3f} deg  "
+              f"-> seed kp={seed[0]:.3f} ki={seed[1]:.4f} kd={seed[2]:.3f}")
+
+        base_score, _ = run_suite(schedules, axis)
+        t0 = time.perf_counter()
+        res = sweep(axis, seed, schedules, args.jobs)
+        score, gains, results = res[0]
+        print(f"[{axis}] {len(res)} kandidat dalam {time.perf_counter() - t0:.1f} s; "
+              f"skor {base_score:.2f} (tabel awal) -> {score:.2f}")
+        print(f"[{axis}] terbaik kp={gains[0]:.3f} ki={gains[1]:.4f} kd={gains[2]:.3f}")
+        for name, m in results.items():
+            print(f"    {name:>12}: " + "  ".join(f"{k}={v:.3f}" for k, v in m.items()))
+        if score < base_score:
+            schedules[axis] = scaled_schedule(schedules[axis], *gains)
+        else:
+            print(f"[{axis}] tidak lebih baik dari tabel awal, tabel {axis} tidak diubah")
+
+    if args.plant == "hardware":
+        actuator.close()
+        sensor.close()
+    save_schedules(args.out, schedules)
+    print(f"Tabel gain ditulis ke {args.out} (pakai dengan run.py --gains {args.out})")
+
+if __name__ == "__main__":
+    main()
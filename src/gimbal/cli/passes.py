@@ -0,0 +1,39 @@
+import argparse
+import time
+
+def fmt(t):
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(t))
+
+def main():
+    p = argparse.ArgumentParser(description="Prediksi lintasan satelit (SGP4) dari file TLE lokal")
+    p.add_argument("--tle", required=True)
+    p.add_argument("--lat", type=float, required=True)
+    p.add_argument("--lon", type=float, required=True)
+    p.add_argument("--alt", type=float, default=0.0, help="ketinggian stasiun (m)")
+    p.add_argument("--sat", nargs="*", help="nama satelit (default: semua di file TLE)")
+    p.add_argument("--hours", type=float, default=24.0)
+    p.add_argument("--min_el", type=float, default=10.0)
+    p.add_argument("--start", type=float, default=None, help="waktu mulai (unix, default sekarang)")
+    p.add_argument("--track", action="store_true", help="cetak tabel az/el/Doppler lintasan pertama")
+    p.add_argument("--freq", type=float, default=437e6, help="frekuensi untuk kolom Doppler (Hz)")
+    args = p.parse_args()
+
+    from gimbal.passes import PassPredictor, Station
+    pred = PassPredictor(args.tle, Station(args.lat, args.lon, args.alt), args.min_el)
+    passes = []
+    for name in args.sat or pred.sats:
+        passes += pred.passes(name, args.start, args.hours)
+    passes.sort(key=lambda p: p.aos)
+
+    print(f"{'satelit':<20} {'AOS (UTC)':<20} {'durasi':>7} {'max el':>7} {'az AOS':>7} {'az LOS':>7}")
+    for ps in passes:
+        print(f"{ps.name[:20]:<20} {fmt(ps.aos):<20} {ps.duration:6.0f}s {ps.max_el:7.1f} {ps.aos_az:7.1f} {ps.los_az:7.1f}")
+    if args.track and passes:
+        tr = pred.track(passes[0], step=10.0)
+        dop = tr.doppler_hz(args.freq)
+        print(f"\n{'UTC':<20} {'az':>7} {'el':>6} {'range km':>9} {'Doppler Hz':>11}")
+        for k in range(len(tr.t)):
+            print(f"{fmt(tr.t[k]):<20} {tr.az[k]:7.2f} {tr.el[k]:6.2f} {tr.range_km[k]:9.1f} {dop[k]:11.1f}")
+
+if __name__ == "__main__":
+    main()
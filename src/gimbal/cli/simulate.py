@@ -0,0 +1,70 @@
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+from gimbal import autotune
+
+GAINS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "motorPID", "gains.json")
+
+def scenario(seed):
+    """Random step: start and target az/el, target applied at t = 0.5 s."""
+    rng = random.Random(seed)
+    start = (rng.uniform(-180, 180), rng.uniform(0, 90))
+    goal = (rng.uniform(-180, 180), rng.uniform(0, 90))
+    return start, goal
+
+def step_metrics(r):
+    out = {}
+    for axis in ("az", "el"):
+        e = r["target_" + axis] - r[axis]
+        if axis == "az":
+            e = (e + 180.0) % 360.0 - 180.0
+        m = autotune.step_metrics(r["t"], e)
+        out.update({f"{axis}_{k}": v for k, v in m.items()})
+    return out
+
+def run_one(args):
+    seed, duration, gains = args
+    from gimbal.control import AdaptiveControl
+    from gimbal.gain_schedule import load_schedules
+    from gimbal.sim import SimPlant, VirtualClock, simulate
+    start, goal = scenario(seed)
+    clock = VirtualClock()
+    plant = SimPlant(clock, seed=seed, start=start)
+    ctl = AdaptiveControl(load_schedules(gains), clock=clock.monotonic)
+    r = simulate(ctl, plant, clock, lambda t: goal if t >= 0.5 else start, duration)
+    return step_metrics(r)
+
+def main():
+    p = argparse.ArgumentParser(description="Uji gain PID pada plant gimbal simulasi (jam virtual, lebih cepat dari real time)")
+    p.add_argument("--passes", type=int, default=200)
+    p.add_argument("--duration", type=float, default=20.0, help="detik waktu simulasi per skenario")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--gains", default=GAINS)
+    p.add_argument("--jobs", type=int, default=os.cpu_count())
+    args = p.parse_args()
+
+    t0 = time.perf_counter()
+    work = [(args.seed + i, args.duration, args.gains) for i in range(args.passes)]
+    with ProcessPoolExecutor(args.jobs) as ex:
+        res = list(ex.map(run_one, work, chunksize=max(1, args.passes // (4 * (args.jobs or 1)))))
+    wall = time.perf_counter() - t0
+
+    print(f"{args.passes} skenario x {args.duration:.0f} s simulasi dalam {wall:.1f} s "
+          f"({args.passes * args.duration / wall:.0f}x real time)")
+    print(f"{'metric':>14} {'mean':>8} {'p95':>8} {'max':>8}")
+    for k in res[0]:
+        v = np.array([r[k] for r in res])
+        fin = v[np.isfinite(v)]
+        unsettled = len(v) - len(fin)
+        if len(fin):
+            stats = f"{fin.mean():8.2f} {np.percentile(fin, 95):8.2f} {fin.max():8.2f}"
+        else:
+            stats = f"{'-':>8} {'-':>8} {'-':>8}"
+        print(f"{k:>14} {stats}" + (f"  ({unsettled} tidak settle)" if unsettled else ""))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+from gimbal.gain_schedule import ScheduledPID
+
+def clamp(v, lo, hi):
+    return max(lo, min(hi, v))
+
+def az_error_shortest(target, current):
+    return (target - current + 180.0) % 360.0 - 180.0
+
+def min_pwm(out, m=18.0):
+    return 0.0 if out == 0 else out + m if out > 0 else out - m
+
+class AdaptiveControl:
+    """The AdaptivePID.py control law for both axes: gain-scheduled PID,
+    gravity feed-forward on elevation, minimum-PWM offset for motor stiction
+    and a lock zone that cuts the drive once within `lock` degrees.
+
+    With target velocities (vaz, vel in deg/s, e.g. from
+    gimbal.trajectory.TargetTrajectory) the schedule's `kv` adds a velocity
+    feed-forward; inside the lock zone only that term drives the motor, so a
+    moving target is followed instead of waited for. There the minimum-PWM
+    offset is scaled by |rate| / `ff_full_rate`, so a slow target gets a
+    small push instead of an 18 % kick that overshoots and limit-cycles.
+
+    With wrap_az=False az is a mechanical angle (unwrapped, beyond +-180 on
+    rotators with cable overlap) and the error is taken as is, so the
+    caller, not the shortest way round, decides the direction.
+
+    step() returns signed duty cycles (percent) for the az and el motors.
+    """
+
+    def __init__(self, schedules, az_max=70.0, el_max=80.0, min_duty=18.0, lock=0.2, ff_min_rate=0.05,
+                 ff_full_rate=1.0, wrap_az=True, clock=None):
+        kw = {} if clock is None else {"clock": clock}
+        self.schedules = schedules
+        self.wrap_az = wrap_az
+        self.pid_az = ScheduledPID(schedules["az"], -az_max, az_max, wrap=360.0 if wrap_az else None, **kw)
+        self.pid_el = ScheduledPID(schedules["el"], -el_max, el_max, **kw)
+        self.az_max, self.el_max = az_max, el_max
+        self.min_duty = min_duty
+        self.lock = lock
+        self.ff_min_rate = ff_min_rate
+        self.ff_full_rate = ff_full_rate
+
+    def reset(self):
+        self.pid_az.reset()
+        self.pid_el.reset()
+
+    def _axis(self, pid, err, meas, bias, rate, limit, dt):
+        u = pid.compute(err, meas, dt)
+        ff = rate * pid.schedule.kv
+        if abs(err) < self.lock:
+            if abs(rate) <= self.ff_min_rate:
+                return 0.0
+            m = self.min_duty * min(1.0, abs(rate) / self.ff_full_rate)
+            return min_pwm(clamp(ff, -limit, limit), m)
+        return min_pwm(clamp(u + bias + ff, -limit, limit), self.min_duty)
+
+    def step(self, target_az, target_el, az, el, dt=None, vaz=0.0, vel=0.0):
+        az_err = az_error_shortest(target_az, az) if self.wrap_az else target_az - az
+        el_err = target_el - el
+        grav = self.schedules["el"].gravity(el)
+        az_out = self._axis(self.pid_az, az_err, az, 0.0, vaz, self.az_max, dt)
+        el_out = self._axis(self.pid_el, el_err, el, grav, vel, self.el_max, dt)
+        return az_out, el_out
@@ -0,0 +1,68 @@
+import os
+import struct
+import threading
+import time
+
+from gimbal.wt901 import ANGLE_SCALE, BAUD_CODES, RATE_CODES, REG_BAUD, REG_ROLL, REG_RRATE, _frame, crc16
+
+class FakeWT901:
+    """WT901C485 on a pseudo-terminal (open `port` with WT901); `mute`
+    leaves requests unanswered."""
+
+    def __init__(self, addr=0x50, angles=(0.0, 0.0, 0.0), delay=0.0):
+        import pty
+        import tty
+        self.addr = addr
+        self.angles = angles
+        self.delay = delay
+        self.mute = False
+        self.regs = {REG_RRATE: RATE_CODES[10], REG_BAUD: BAUD_CODES[9600]}
+        self.requests = 0
+        self._master, slave = pty.openpty()
+        tty.setraw(slave)
+        self._slave = slave
+        self.port = os.ttyname(slave)
+        self._run = True
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _register(self, reg):
+        k = reg - REG_ROLL
+        if 0 <= k < 3:
+            return int(round(self.angles[k] / ANGLE_SCALE)) & 0xFFFF
+        return self.regs.get(reg, 0) & 0xFFFF
+
+    def _serve(self):
+        buf = b""
+        while self._run:
+            try:
+                buf += os.read(self._master, 256)
+            except OSError:
+                break
+            while len(buf) >= 8:
+                req, buf = buf[:8], buf[8:]
+                if crc16(req[:6]) != struct.unpack("<H", req[6:])[0] or req[0] != self.addr:
+                    buf = b""
+                    continue
+                self.requests += 1
+                if self.mute:
+                    continue
+                fn, reg, val = struct.unpack(">BHH", req[1:6])
+                if fn == 0x03:
+                    data = b"".join(struct.pack(">H", self._register(reg + i)) for i in range(val))
+                    resp = _frame(bytes([self.addr, 0x03, len(data)]) + data)
+                elif fn == 0x06:
+                    self.regs[reg] = val
+                    resp = req
+                else:
+                    continue
+                if self.delay:
+                    time.sleep(self.delay)
+                try:
+                    os.write(self._master, resp)
+                except OSError:
+                    return
+
+    def close(self):
+        self._run = False
+        os.close(self._master)
+        os.close(self._slave)
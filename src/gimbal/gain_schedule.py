@@ -0,0 +1,119 @@
+import json
+from bisect import bisect_right
+from gimbal.pid import INF, PID
+
+class Table1D:
+    """Piecewise-linear lookup, clamped to the end values outside the knots."""
+
+    __slots__ = ("xs", "ys")
+
+    def __init__(self, xs, ys):
+        if len(xs) != len(ys) or not xs:
+            raise ValueError("table needs matching, non-empty x and y")
+        if any(b <= a for a, b in zip(xs, xs[1:])):
+            raise ValueError("table x must be strictly increasing")
+        self.xs = [float(x) for x in xs]
+        self.ys = [float(y) for y in ys]
+
+    def __call__(self, x):
+        xs, ys = self.xs, self.ys
+        if x <= xs[0]:
+            return ys[0]
+        if x >= xs[-1]:
+            return ys[-1]
+        i = bisect_right(xs, x)
+        x0, x1 = xs[i - 1], xs[i]
+        return ys[i - 1] + (ys[i] - ys[i - 1]) * (x - x0) / (x1 - x0)
+
+class GainSchedule:
+    """kp/ki/kd over |error|, gravity feed-forward over elevation, velocity
+    feed-forward `kv` (duty % per deg/s) and integral limit `ilim` (deg*s)."""
+
+    def __init__(self, error, kp, ki, kd, gravity_el=None, gravity_ff=None, kv=0.0, ilim=40.0):
+        self.kp = Table1D(error, kp)
+        self.ki = Table1D(error, ki)
+        self.kd = Table1D(error, kd)
+        self.gravity_table = Table1D(gravity_el, gravity_ff) if gravity_el else None
+        self.kv = float(kv)
+        self.ilim = float(ilim)
+
+    def gains(self, err):
+        e = abs(err)
+        return self.kp(e), self.ki(e), self.kd(e)
+
+    def gravity(self, el):
+        return self.gravity_table(el) if self.gravity_table else 0.0
+
+    @classmethod
+    def from_dict(cls, d):
+        g = d.get("gravity") or {}
+        return cls(d["error"], d["kp"], d["ki"], d["kd"], g.get("el"), g.get("ff"), d.get("kv", 0.0),
+                   d.get("ilim", 40.0))
+
+    def to_dict(self):
+        d = {"error": self.kp.xs, "kp": self.kp.ys, "ki": self.ki.ys, "kd": self.kd.ys}
+        if self.kv:
+            d["kv"] = self.kv
+        d["ilim"] = self.ilim
+        if self.gravity_table:
+            d["gravity"] = {"el": self.gravity_table.xs, "ff": self.gravity_table.ys}
+        return d
+
+# the former AdaptivePID bands at their centres and its 12*el/90 gravity term
+DEFAULT_SCHEDULES = {
+    "az": {
+        "error": [0.4, 1.9, 6.5, 12.0],
+        "kp": [4.0, 6.0, 8.0, 9.0],
+        "ki": [0.0, 0.03, 0.05, 0.02],
+        "kd": [4.0, 3.0, 2.0, 1.2],
+        "kv": 2.5,
+        "ilim": 40.0,
+    },
+    "el": {
+        "error": [0.4, 1.9, 6.5, 12.0],
+        "kp": [4.0, 6.0, 8.0, 9.0],
+        "ki": [0.0, 0.03, 0.05, 0.02],
+        "kd": [4.0, 3.0, 2.0, 1.2],
+        "kv": 2.5,
+        "ilim": 40.0,
+        "gravity": {"el": [0.0, 90.0], "ff": [0.0, 12.0]},
+    },
+}
+
+def load_schedules(path=None):
+    d = dict(DEFAULT_SCHEDULES)
+    if path:
+        try:
+            with open(path, "r") as f:
+                d.update(json.load(f))
+        except FileNotFoundError:
+            pass
+    return {axis: GainSchedule.from_dict(v) for axis, v in d.items()}
+
+def save_schedules(path, schedules):
+    # one table row per line, like gains.json
+    axes = []
+    for axis, s in schedules.items():
+        rows = [f'    "{k}": {json.dumps(v)}' for k, v in s.to_dict().items()]
+        axes.append(f'  "{axis}": {{\n' + ",\n".join(rows) + "\n  }")
+    with open(path, "w") as f:
+        f.write("{\n" + ",\n".join(axes) + "\n}\n")
+
+class ScheduledPID(PID):
+    """PID whose gains follow a GainSchedule every step; the integral share
+    is limited to ki * schedule.ilim."""
+
+    __slots__ = ("schedule",)
+
+    def __init__(self, schedule, out_min=-INF, out_max=INF, tau=0.05, wrap=None, **kw):
+        self.schedule = schedule
+        super().__init__(0.0, 0.0, 0.0, out_min, out_max, ilim=0.0, tau=tau, wrap=wrap, **kw)
+
+    def gains(self, err):
+        return self.schedule.gains(err)
+
+    def compute(self, err, meas=None, dt=None):
+        kp, ki, kd = self.gains(err)
+        self.set_gains(kp, ki, kd)
+        self.ilim = abs(ki) * self.schedule.ilim
+        return super().compute(err, meas, dt)
@@ -0,0 +1,189 @@
+import math
+import time
+from typing import NamedTuple
+import numpy as np
+from sgp4.api import Satrec
+
+# WGS84
+_A = 6378.137
+_F = 1.0 / 298.257223563
+_E2 = _F * (2.0 - _F)
+_OMEGA_E = 7.292115146706979e-5  # rad/s
+C_KM_S = 299792.458
+_UNIX_JD = 2440587.5
+
+def load_tle(path: str) -> dict:
+    """Name -> (line1, line2) from a 2- or 3-line TLE file; unnamed entries
+    are keyed by catalogue number."""
+    lines = [l.rstrip() for l in open(path, "r") if l.strip()]
+    out = {}
+    i = 0
+    while i < len(lines):
+        if lines[i].startswith("1 ") and i + 1 < len(lines) and lines[i + 1].startswith("2 "):
+            name, l1, l2 = lines[i][2:7].strip(), lines[i], lines[i + 1]
+            i += 2
+        elif i + 2 < len(lines) and lines[i + 1].startswith("1 ") and lines[i + 2].startswith("2 "):
+            name, l1, l2 = lines[i].lstrip("0 ").strip(), lines[i + 1], lines[i + 2]
+            i += 3
+        else:
+            raise ValueError(f"{path}:{i + 1}: not a TLE line: {lines[i]!r}")
+        out[name] = (l1, l2)
+    return out
+
+class Station(NamedTuple):
+    lat_deg: float
+    lon_deg: float
+    alt_m: float = 0.0
+
+    def ecef(self) -> np.ndarray:
+        lat, lon = math.radians(self.lat_deg), math.radians(self.lon_deg)
+        n = _A / math.sqrt(1.0 - _E2 * math.sin(lat) ** 2)
+        h = self.alt_m / 1000.0
+        return np.array([(n + h) * math.cos(lat) * math.cos(lon),
+                         (n + h) * math.cos(lat) * math.sin(lon),
+                         (n * (1.0 - _E2) + h) * math.sin(lat)])
+
+    def enu_matrix(self) -> np.ndarray:
+        lat, lon = math.radians(self.lat_deg), math.radians(self.lon_deg)
+        sl, cl, sp, cp = math.sin(lon), math.cos(lon), math.sin(lat), math.cos(lat)
+        return np.array([[-sl, cl, 0.0],
+                         [-sp * cl, -sp * sl, cp],
+                         [cp * cl, cp * sl, sp]])
+
+def _jd(t_unix):
+    d = np.asarray(t_unix, dtype=np.float64) / 86400.0
+    day = np.floor(d)
+    return day + _UNIX_JD, d - day
+
+def _gmst(jd, fr):
+    # IAU-82 GMST (as used with SGP4/TEME), UT1 taken as UTC.
+    tut1 = ((jd - 2451545.0) + fr) / 36525.0
+    g = (67310.54841 + (876600.0 * 3600.0 + 8640184.812866) * tut1 + 0.093104 * tut1 ** 2
+         - 6.2e-6 * tut1 ** 3)
+    return np.mod(g % 86400.0 / 240.0, 360.0) * (math.pi / 180.0)
+
+def look_angles(sat: Satrec, station: Station, t_unix):
+    """az (deg, 0-360 from north), el (deg), range (km) and range rate (km/s,
+    positive receding) for every time in `t_unix`, in one sgp4_array call.
+    Propagation errors give NaN."""
+    jd, fr = _jd(t_unix)
+    jd, fr = np.atleast_1d(jd), np.atleast_1d(fr)
+    err, r, v = sat.sgp4_array(jd, fr)
+    th = _gmst(jd, fr)
+    c, s = np.cos(th), np.sin(th)
+    # TEME -> ECEF (rotation by GMST about z, polar motion ignored)
+    x = c * r[:, 0] + s * r[:, 1]
+    y = -s * r[:, 0] + c * r[:, 1]
+    vx = c * v[:, 0] + s * v[:, 1] + _OMEGA_E * y
+    vy = -s * v[:, 0] + c * v[:, 1] - _OMEGA_E * x
+    rho = np.stack([x, y, r[:, 2]], axis=1) - station.ecef()
+    vel = np.stack([vx, vy, v[:, 2]], axis=1)
+    enu = rho @ station.enu_matrix().T
+    rng = np.linalg.norm(rho, axis=1)
+    az = np.degrees(np.arctan2(enu[:, 0], enu[:, 1])) % 360.0
+    el = np.degrees(np.arcsin(enu[:, 2] / rng))
+    rr = np.einsum("ij,ij->i", rho, vel) / rng
+    bad = err != 0
+    if bad.any():
+        for a in (az, el, rng, rr):
+            a[bad] = np.nan
+    return az, el, rng, rr
+
+class Track(NamedTuple):
+    t: np.ndarray
+    az: np.ndarray
+    el: np.ndarray
+    range_km: np.ndarray
+    range_rate_km_s: np.ndarray
+
+    def doppler_hz(self, freq_hz: float) -> np.ndarray:
+        return -freq_hz * self.range_rate_km_s / C_KM_S
+
+    def at(self, t: float):
+        """(az, el) interpolated at time t; az is unwrapped first so passes
+        crossing north interpolate correctly."""
+        az = np.degrees(np.unwrap(np.radians(self.az)))
+        return float(np.interp(t, self.t, az) % 360.0), float(np.interp(t, self.t, self.el))
+
+class Pass(NamedTuple):
+    name: str
+    aos: float
+    tca: float
+    los: float
+    max_el: float
+    aos_az: float
+    los_az: float
+
+    @property
+    def duration(self) -> float:
+        return self.los - self.aos
+
+def _refine(f, lo, hi, tol=0.5):
+    """Bisect the el-threshold crossing of f between lo and hi (sign differs)."""
+    flo = f(lo)
+    while hi - lo > tol:
+        mid = 0.5 * (lo + hi)
+        if (f(mid) > 0) == (flo > 0):
+            lo = mid
+        else:
+            hi = mid
+    return 0.5 * (lo + hi)
+
+class PassPredictor:
+    """SGP4 pass prediction for the satellites of one TLE file at one station.
+
+    passes() scans a coarse grid (vectorized) and bisects AOS/LOS; track()
+    gives the full az/el/range-rate table of a pass at `step` seconds and
+    keeps the last few in a cache, so the controller and Doppler code can ask
+    for the same pass repeatedly at no cost.
+    """
+
+    _MAX_TRACKS = 8
+
+    def __init__(self, tle_path: str, station: Station, min_el: float = 0.0):
+        self.station = station
+        self.min_el = float(min_el)
+        self.sats = {name: Satrec.twoline2rv(l1, l2) for name, (l1, l2) in load_tle(tle_path).items()}
+        self._tracks = {}
+
+    def look(self, name: str, t_unix):
+        return look_angles(self.sats[name], self.station, t_unix)
+
+    def passes(self, name: str, start: float = None, hours: float = 24.0, step: float = 30.0):
+        start = time.time() if start is None else float(start)
+        t = np.arange(start, start + hours * 3600.0 + step, step)
+        el = self.look(name, t)[1] - self.min_el
+        up = el > 0
+        edges = np.flatnonzero(np.diff(up.astype(np.int8)))
+        f = lambda x: float(self.look(name, x)[1][0]) - self.min_el
+        out = []
+        aos = start if up[0] else None
+        for k in edges:
+            cross = _refine(f, t[k], t[k + 1])
+            if not up[k]:
+                aos = cross
+            elif aos is not None:
+                out.append(self._make_pass(name, aos, cross))
+                aos = None
+        return out
+
+    def _make_pass(self, name, aos, los):
+        tt = np.linspace(aos, los, max(3, int((los - aos) / 2.0)))
+        az, el, _, _ = self.look(name, tt)
+        k = int(np.nanargmax(el))
+        return Pass(name, aos, float(tt[k]), los, float(el[k]), float(az[0]), float(az[-1]))
+
+    def next_pass(self, name: str, start: float = None, hours: float = 48.0):
+        p = self.passes(name, start, hours)
+        return p[0] if p else None
+
+    def track(self, p: Pass, step: float = 1.0) -> Track:
+        key = (p.name, p.aos, p.los, float(step))
+        tr = self._tracks.get(key)
+        if tr is None:
+            t = np.append(np.arange(p.aos, p.los, step), p.los)
+            tr = Track(t, *self.look(p.name, t))
+            if len(self._tracks) >= self._MAX_TRACKS:
+                del self._tracks[next(iter(self._tracks))]
+            self._tracks[key] = tr
+        return tr
@@ -0,0 +1,135 @@
+import math
+import time
+import numpy as np
+
+INF = math.inf
+
+class PID:
+    """Single-axis PID: filtered derivative on measurement, integral kept as
+    its share of the output (ki*e*dt) with back-calculation anti-windup,
+    optional output rate limit and azimuth wrap."""
+
+    __slots__ = ("kp", "ki", "kd", "out_min", "out_max", "ilim", "ileak", "tau", "kaw", "rate", "wrap", "clock",
+                 "i", "d", "u", "last_meas", "last_err", "last_t")
+
+    def __init__(self, kp, ki, kd, out_min=-INF, out_max=INF, ilim=None, tau=0.0, kaw=1.0, rate=None,
+                 wrap=None, clock=time.monotonic, ileak=None):
+        self.kp, self.ki, self.kd = kp, ki, kd
+        self.out_min, self.out_max = out_min, out_max
+        self.ilim = ilim
+        self.ileak = ileak
+        self.tau = tau
+        self.kaw = kaw
+        self.rate = rate
+        self.wrap = wrap
+        self.clock = clock
+        self.reset()
+
+    def reset(self):
+        self.i = 0.0
+        self.d = 0.0
+        self.u = 0.0
+        self.last_meas = None
+        self.last_err = 0.0
+        self.last_t = self.clock()
+
+    def set_gains(self, kp, ki, kd, bumpless=True):
+        # `i` already holds ki*integral, so a new ki does not step the output.
+        if not bumpless and self.ki != ki:
+            self.i = self.i * ki / self.ki if self.ki else 0.0
+        self.kp, self.ki, self.kd = kp, ki, kd
+
+    def compute(self, err, meas=None, dt=None):
+        if dt is None:
+            now = self.clock()
+            dt = now - self.last_t
+            self.last_t = now
+        if dt <= 0:
+            return self.u
+
+        if meas is None:
+            d_raw = (err - self.last_err) / dt
+        elif self.last_meas is None:
+            d_raw = 0.0
+        else:
+            dm = meas - self.last_meas
+            if self.wrap:
+                h = self.wrap / 2.0
+                dm = (dm + h) % self.wrap - h
+            d_raw = -dm / dt
+        self.last_err = err
+        self.last_meas = meas
+        if self.tau > 0:
+            self.d += dt / (self.tau + dt) * (d_raw - self.d)
+        else:
+            self.d = d_raw
+
+        if self.ki:
+            self.i += self.ki * err * dt
+        elif self.ileak:
+            self.i -= self.i * dt / (self.ileak + dt)
+        if self.ilim is not None:
+            self.i = max(-self.ilim, min(self.ilim, self.i))
+
+        v = self.kp * err + self.i + self.kd * self.d
+        u = max(self.out_min, min(self.out_max, v))
+        if self.rate is not None:
+            step = self.rate * dt
+            u = max(self.u - step, min(self.u + step, u))
+        if self.ki and u != v:
+            self.i += self.kaw * (u - v) * dt
+        self.u = u
+        return u
+
+class PIDArray:
+    """PID for N axes in one set of NumPy operations; dt is required."""
+
+    def __init__(self, n, kp, ki, kd, out_min=-INF, out_max=INF, ilim=None, tau=0.0, kaw=1.0, rate=None,
+                 wrap=None, ileak=None):
+        f = lambda v: np.broadcast_to(np.asarray(v, dtype=np.float64), (n,)).copy()
+        self.n = n
+        self.kp, self.ki, self.kd = f(kp), f(ki), f(kd)
+        self.out_min, self.out_max = f(out_min), f(out_max)
+        self.ilim = None if ilim is None else f(ilim)
+        self.ileak = None if ileak is None else f(ileak)
+        self.tau = f(tau)
+        self.kaw = f(kaw)
+        self.rate = None if rate is None else f(rate)
+        self.wrap = None if wrap is None else f(wrap)
+        self.reset()
+
+    def reset(self):
+        n = self.n
+        self.i = np.zeros(n)
+        self.d = np.zeros(n)
+        self.u = np.zeros(n)
+        self.last_meas = None
+
+    def compute(self, err, meas, dt):
+        err = np.asarray(err, dtype=np.float64)
+        meas = np.asarray(meas, dtype=np.float64)
+        if self.last_meas is None:
+            d_raw = np.zeros(self.n)
+        else:
+            dm = meas - self.last_meas
+            if self.wrap is not None:
+                h = self.wrap / 2.0
+                dm = np.where(self.wrap > 0, (dm + h) % self.wrap - h, dm)
+            d_raw = -dm / dt
+        self.last_meas = meas.copy()
+        self.d += dt / (self.tau + dt) * (d_raw - self.d)
+
+        self.i += self.ki * err * dt
+        if self.ileak is not None:
+            self.i -= np.where((self.ki == 0) & (self.ileak > 0), self.i * dt / (self.ileak + dt), 0.0)
+        if self.ilim is not None:
+            np.clip(self.i, -self.ilim, self.ilim, out=self.i)
+
+        v = self.kp * err + self.i + self.kd * self.d
+        u = np.clip(v, self.out_min, self.out_max)
+        if self.rate is not None:
+            step = self.rate * dt
+            u = np.clip(u, self.u - step, self.u + step)
+        self.i += np.where(self.ki != 0, self.kaw * (u - v) * dt, 0.0)
+        self.u = u
+        return u
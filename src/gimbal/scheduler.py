@@ -0,0 +1,66 @@
+import time
+
+class PeriodicScheduler:
+    """Fixed-rate loop on absolute monotonic deadlines; wait() returns the
+    measured dt and skips missed deadlines instead of bursting."""
+
+    def __init__(self, period_s: float, clock_ns=time.monotonic_ns, sleep=time.sleep, history: int = 1000):
+        self.period_s = float(period_s)
+        self.period_ns = int(round(period_s * 1e9))
+        self.clock_ns = clock_ns
+        self.sleep = sleep
+        self.count = 0
+        self.overruns = 0
+        self.skipped = 0
+        self._next = None
+        self._last = None
+        self._hist = [0] * history
+        self._n = 0
+
+    def reset(self):
+        self._next = None
+        self._last = None
+
+    def wait(self) -> float:
+        now = self.clock_ns()
+        if self._next is None:
+            self._next = now + self.period_ns
+            self._last = now
+        delay = self._next - now
+        if delay > 0:
+            self.sleep(delay / 1e9)
+        else:
+            self.overruns += 1
+            missed = -delay // self.period_ns
+            if missed:
+                self.skipped += missed
+                self._next += missed * self.period_ns
+        now = self.clock_ns()
+        dt = now - self._last
+        self._last = now
+        self._next += self.period_ns
+        self._hist[self._n % len(self._hist)] = dt
+        self._n += 1
+        self.count += 1
+        return dt / 1e9
+
+    def stats(self) -> dict:
+        n = min(self._n, len(self._hist))
+        if not n:
+            return {"count": 0, "overruns": 0, "skipped": 0}
+        periods = self._hist[:n]
+        jitter = sorted(abs(p - self.period_ns) for p in periods)
+
+        def pct(q):
+            return jitter[min(n - 1, int(q / 100.0 * n))] / 1e6
+
+        return {
+            "count": self.count,
+            "overruns": self.overruns,
+            "skipped": self.skipped,
+            "period_ms": sum(periods) / n / 1e6,
+            "jitter_p50_ms": pct(50),
+            "jitter_p95_ms": pct(95),
+            "jitter_p99_ms": pct(99),
+            "jitter_max_ms": jitter[-1] / 1e6,
+        }
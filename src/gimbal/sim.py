@@ -0,0 +1,143 @@
+import math
+import random
+from collections import deque
+import numpy as np
+
+class VirtualClock:
+    """time.monotonic/monotonic_ns/sleep stand-in; sleep() advances instantly."""
+
+    def __init__(self, t0: float = 0.0):
+        self.ns = int(round(t0 * 1e9))
+
+    def monotonic_ns(self) -> int:
+        return self.ns
+
+    def monotonic(self) -> float:
+        return self.ns / 1e9
+
+    def sleep(self, s: float):
+        if s > 0:
+            self.ns += int(round(s * 1e9))
+
+    advance = sleep
+
+class AxisParams:
+    """One geared DC motor axis in output-shaft units (rad, N*m)."""
+
+    def __init__(self, supply=12.0, resistance=2.0, k=0.17, gear=100.0, inertia=7.2, static=17.0,
+                 coulomb=14.0, viscous=2.0, gravity=0.0, limits=None, wrap=False):
+        self.supply = supply
+        self.resistance = resistance
+        self.k = k
+        self.gear = gear
+        self.inertia = inertia
+        self.static = static
+        self.coulomb = coulomb
+        self.viscous = viscous
+        self.gravity = gravity
+        self.limits = limits
+        self.wrap = wrap
+
+AZ_AXIS = AxisParams(wrap=True)
+EL_AXIS = AxisParams(gravity=12.0, limits=(-5.0, 95.0))
+
+class SimPlant:
+    """Two-axis DC motor gimbal with a simulated WT901 (noise, quantisation,
+    latency); sensor + actuator interface of gimbal.backends."""
+
+    QUANTUM = 180.0 / 32768.0
+
+    def __init__(self, clock=None, az=AZ_AXIS, el=EL_AXIS, noise=0.05, latency=0.02, sample_period=0.01,
+                 substep=0.005, seed=0, start=(0.0, 0.0)):
+        if clock is None:
+            import time
+            clock = time
+        self.clock = clock
+        self.axes = (az, el)
+        self.noise = noise
+        self.latency = latency
+        self.sample_period = sample_period
+        self.substep = substep
+        self._rng = random.Random(seed)
+        self.pos = [math.radians(start[0]), math.radians(start[1])]
+        self.vel = [0.0, 0.0]
+        self.duty = [0.0, 0.0]
+        self.t = clock.monotonic()
+        self._next_sample = self.t
+        self._samples = deque()
+        self._last = self._sample()
+
+    def _sample(self):
+        out = []
+        for p in self.pos:
+            v = math.degrees(p) + self._rng.gauss(0.0, self.noise)
+            out.append(round(v / self.QUANTUM) * self.QUANTUM)
+        out[0] = (out[0] + 180.0) % 360.0 - 180.0
+        return tuple(out)
+
+    def _step(self, h):
+        for i, ax in enumerate(self.axes):
+            w = self.vel[i]
+            v = max(-1.0, min(1.0, self.duty[i] / 100.0)) * ax.supply
+            tau = ax.gear * ax.k * (v - ax.gear * ax.k * w) / ax.resistance
+            tau -= ax.gravity * math.sin(self.pos[i])
+            if w == 0.0 and abs(tau) <= ax.static:
+                continue
+            tau -= ax.viscous * w + math.copysign(ax.coulomb, w if w else tau)
+            w_new = w + tau / ax.inertia * h
+            if w and (w_new > 0) != (w > 0):
+                w_new = 0.0
+            self.vel[i] = w_new
+            self.pos[i] += w_new * h
+            if ax.wrap:
+                self.pos[i] = (self.pos[i] + math.pi) % (2 * math.pi) - math.pi
+            elif ax.limits:
+                lo, hi = math.radians(ax.limits[0]), math.radians(ax.limits[1])
+                if not lo <= self.pos[i] <= hi:
+                    self.pos[i] = max(lo, min(hi, self.pos[i]))
+                    self.vel[i] = 0.0
+
+    def advance(self, t=None):
+        t = self.clock.monotonic() if t is None else t
+        while self.t < t:
+            h = min(self.substep, t - self.t)
+            self._step(h)
+            self.t += h
+            while self._next_sample <= self.t:
+                self._samples.append((self._next_sample + self.latency, self._sample()))
+                self._next_sample += self.sample_period
+        while self._samples and self._samples[0][0] <= self.t:
+            self._last = self._samples.popleft()[1]
+
+    def read(self):
+        self.advance()
+        return self._last
+
+    def truth(self):
+        """Noise- and latency-free position in degrees."""
+        return ((math.degrees(self.pos[0]) + 180.0) % 360.0 - 180.0, math.degrees(self.pos[1]))
+
+    def drive(self, az_out, el_out):
+        self.advance()
+        self.duty = [az_out, el_out]
+
+    def stop(self):
+        self.drive(0.0, 0.0)
+
+    def close(self):
+        pass
+
+def simulate(control, plant, clock, target, duration, period=0.02):
+    """Runs `control` against `plant` for `duration` s of virtual time."""
+    n = int(round(duration / period))
+    rec = np.empty((7, n))
+    t0 = clock.monotonic()
+    for k in range(n):
+        t = clock.monotonic() - t0
+        taz, tel = target(t)
+        az, el = plant.read()
+        out = control.step(taz, tel, az, el, period)
+        plant.drive(*out)
+        rec[:, k] = (t, *plant.truth(), taz, tel, *out)
+        clock.advance(period)
+    return dict(zip(("t", "az", "el", "target_az", "target_el", "out_az", "out_el"), rec))
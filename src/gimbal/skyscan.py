@@ -0,0 +1,125 @@
+import math
+import numpy as np
+
+def raster(az_range, el_range, step=1.0, speed=5.0, dt=0.1):
+    """Boustrophedon raster: az sweeps at `speed` deg/s, el steps by `step`
+    between rows. Returns (t, az, el) arrays starting at t = 0."""
+    rows = np.arange(el_range[0], el_range[1] + 1e-9, step)
+    az, el = [], []
+    n = max(2, int(abs(az_range[1] - az_range[0]) / (speed * dt)) + 1)
+    sweep = np.linspace(az_range[0], az_range[1], n)
+    for i, e in enumerate(rows):
+        row = sweep if i % 2 == 0 else sweep[::-1]
+        az.append(row)
+        el.append(np.full(n, e))
+    az, el = np.concatenate(az), np.concatenate(el)
+    return _timed(az, el, speed, dt)
+
+def spiral(center, radius, step=1.0, speed=5.0, dt=0.1):
+    """Archimedean spiral out from `center` (az, el) with `step` deg between
+    turns, at constant speed on the sky (az widened by 1/cos(el))."""
+    # arc length of r = b*theta is ~ b*theta^2/2; sample it uniformly
+    b = step / (2.0 * math.pi)
+    th_max = radius / b
+    length = b * th_max * th_max / 2.0
+    s = np.linspace(0.0, length, max(2, int(length / (speed * dt)) + 1))
+    th = np.sqrt(2.0 * s / b)
+    r = b * th
+    el = center[1] + r * np.sin(th)
+    az = center[0] + r * np.cos(th) / np.maximum(0.17, np.cos(np.radians(el)))
+    return _timed(az, el, speed, dt)
+
+def _timed(az, el, speed, dt):
+    d = np.hypot(np.diff(az), np.diff(el))
+    t = np.concatenate([[0.0], np.cumsum(np.maximum(d / speed, 1e-3))])
+    return t, az, el
+
+class SkyMap:
+    """Power binned on a regular az/el grid.
+
+    Cells keep the sum of linear power and a hit count (so the mean is a
+    power average, not a mean of dB values) and the max in dB; add() takes
+    whole arrays and accumulates with np.add.at / np.maximum.at.
+    """
+
+    def __init__(self, az_range=(-180.0, 180.0), el_range=(0.0, 90.0), res=1.0):
+        self.az_edges = np.arange(az_range[0], az_range[1] + res * 0.5, res)
+        self.el_edges = np.arange(el_range[0], el_range[1] + res * 0.5, res)
+        shape = (len(self.az_edges) - 1, len(self.el_edges) - 1)
+        self.power = np.zeros(shape)
+        self.hits = np.zeros(shape, dtype=np.int64)
+        self.peak_db = np.full(shape, -np.inf)
+
+    def _index(self, az, el):
+        i = np.searchsorted(self.az_edges, az, side="right") - 1
+        j = np.searchsorted(self.el_edges, el, side="right") - 1
+        ok = (i >= 0) & (i < self.hits.shape[0]) & (j >= 0) & (j < self.hits.shape[1])
+        return i, j, ok
+
+    def add(self, az, el, p_db):
+        az, el, p_db = (np.asarray(a, dtype=np.float64).ravel() for a in (az, el, p_db))
+        i, j, ok = self._index(az, el)
+        ok &= np.isfinite(p_db)
+        i, j, p_db = i[ok], j[ok], p_db[ok]
+        np.add.at(self.power, (i, j), 10.0 ** (p_db / 10.0))
+        np.add.at(self.hits, (i, j), 1)
+        np.maximum.at(self.peak_db, (i, j), p_db)
+        return int(ok.sum())
+
+    def add_frames(self, frame_t, p_db, pos_t, pos_az, pos_el):
+        """Bins SDR frames (timestamps `frame_t`) at the position
+        interpolated from the gimbal samples (pos_t, pos_az, pos_el) taken on
+        the same monotonic clock; frames outside the position record are
+        dropped."""
+        frame_t = np.asarray(frame_t, dtype=np.float64)
+        pos_t = np.asarray(pos_t, dtype=np.float64)
+        inside = (frame_t >= pos_t[0]) & (frame_t <= pos_t[-1])
+        ft = frame_t[inside]
+        az = np.interp(ft, pos_t, pos_az)
+        el = np.interp(ft, pos_t, pos_el)
+        return self.add(az, el, np.asarray(p_db, dtype=np.float64)[inside])
+
+    def mean_db(self):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self.hits > 0, 10.0 * np.log10(self.power / np.maximum(self.hits, 1)), np.nan)
+
+    def query(self, az, el):
+        """(mean dB, max dB, hits) of the cell containing az, el."""
+        i, j, ok = self._index(np.atleast_1d(float(az)), np.atleast_1d(float(el)))
+        if not ok[0] or self.hits[i[0], j[0]] == 0:
+            return math.nan, math.nan, 0
+        i, j = i[0], j[0]
+        return float(self.mean_db()[i, j]), float(self.peak_db[i, j]), int(self.hits[i, j])
+
+    def peaks(self, n=5):
+        """The n strongest cells as (az centre, el centre, mean dB, hits)."""
+        m = self.mean_db()
+        flat = np.where(np.isnan(m), -np.inf, m).ravel()
+        k = min(n, int(np.count_nonzero(np.isfinite(flat))))
+        if k == 0:
+            return []
+        idx = np.argpartition(flat, -k)[-k:]
+        idx = idx[np.argsort(flat[idx])[::-1]]
+        i, j = np.unravel_index(idx, m.shape)
+        azc = (self.az_edges[:-1] + self.az_edges[1:]) / 2.0
+        elc = (self.el_edges[:-1] + self.el_edges[1:]) / 2.0
+        return [(float(azc[a]), float(elc[b]), float(m[a, b]), int(self.hits[a, b])) for a, b in zip(i, j)]
+
+    def merge(self, other):
+        if other.power.shape != self.power.shape:
+            raise ValueError("sky maps have different grids")
+        self.power += other.power
+        self.hits += other.hits
+        np.maximum(self.peak_db, other.peak_db, out=self.peak_db)
+
+    def save(self, path, **meta):
+        np.savez_compressed(path, az_edges=self.az_edges, el_edges=self.el_edges, power=self.power,
+                            hits=self.hits, peak_db=self.peak_db, mean_db=self.mean_db(), **meta)
+
+    @classmethod
+    def load(cls, path):
+        d = np.load(path)
+        m = cls.__new__(cls)
+        m.az_edges, m.el_edges = d["az_edges"], d["el_edges"]
+        m.power, m.hits, m.peak_db = d["power"], d["hits"], d["peak_db"]
+        return m
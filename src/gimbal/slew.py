@@ -0,0 +1,120 @@
+import math
+import numpy as np
+
+def branches(az, limits):
+    """All az + k*360 inside limits (mechanical positions of one bearing)."""
+    lo, hi = limits
+    k0 = math.ceil((lo - az) / 360.0)
+    k1 = math.floor((hi - az) / 360.0)
+    return [az + 360.0 * k for k in range(k0, k1 + 1)]
+
+def nearest_branch(az, ref, limits):
+    """Branch of `az` closest to `ref` (clamped when unreachable)."""
+    c = branches(az, limits)
+    if not c:
+        a = ref + (az - ref + 180.0) % 360.0 - 180.0
+        return max(limits[0], min(limits[1], a))
+    return min(c, key=lambda x: abs(x - ref))
+
+class Profile:
+    """Move p0 -> p1 under vmax/amax, "trapezoid" or "scurve" (raised-cosine
+    ramps); `duration` stretches it to a given time."""
+
+    def __init__(self, p0, p1, vmax, amax, shape="trapezoid", duration=None):
+        if shape not in ("trapezoid", "scurve"):
+            raise ValueError(f"unknown profile shape: {shape}")
+        self.p0, self.p1 = float(p0), float(p1)
+        self.shape = shape
+        d = abs(self.p1 - self.p0)
+        self.sign = 1.0 if self.p1 >= self.p0 else -1.0
+        # ramp time per unit peak velocity
+        k = (math.pi / 2.0 if shape == "scurve" else 1.0) / amax
+        self._k = k
+        if d == 0.0:
+            self.v, self.ta, self.duration = 0.0, 0.0, float(duration or 0.0)
+            return
+        v = min(vmax, math.sqrt(d / k))
+        if duration is not None and duration > d / v + k * v:
+            disc = duration * duration - 4.0 * k * d
+            v = (duration - math.sqrt(max(0.0, disc))) / (2.0 * k)
+        self.v = v
+        self.ta = k * v
+        self.duration = d / v + self.ta
+
+    def sample(self, t):
+        """(position, velocity) at time t after the start."""
+        if self.v == 0.0 or t <= 0.0:
+            return self.p0, 0.0
+        T, ta, v = self.duration, self.ta, self.v
+        if t >= T:
+            return self.p1, 0.0
+        if t < ta:
+            x, vel = self._ramp(t)
+        elif t > T - ta:
+            xr, vr = self._ramp(T - t)
+            x = abs(self.p1 - self.p0) - xr
+            vel = vr
+        else:
+            x = self._ramp(ta)[0] + v * (t - ta)
+            vel = v
+        return self.p0 + self.sign * x, self.sign * vel
+
+    def _ramp(self, t):
+        v, ta = self.v, self.ta
+        if self.shape == "trapezoid":
+            a = v / ta
+            return 0.5 * a * t * t, a * t
+        w = math.pi / ta
+        return 0.5 * v * (t - math.sin(w * t) / w), 0.5 * v * (1.0 - math.cos(w * t))
+
+class SlewPlan:
+    """Both axes timed to arrive together."""
+
+    def __init__(self, start, goal, vmax=(20.0, 20.0), amax=(20.0, 20.0), shape="trapezoid"):
+        az = Profile(start[0], goal[0], vmax[0], amax[0], shape)
+        el = Profile(start[1], goal[1], vmax[1], amax[1], shape)
+        T = max(az.duration, el.duration)
+        self.az = Profile(start[0], goal[0], vmax[0], amax[0], shape, T)
+        self.el = Profile(start[1], goal[1], vmax[1], amax[1], shape, T)
+        self.duration = T
+
+    def sample(self, t):
+        az, vaz = self.az.sample(t)
+        el, vel = self.el.sample(t)
+        return az, el, vaz, vel
+
+    def arrays(self, t0, step=0.02):
+        """Times (t0-based) and az, el arrays for TargetTrajectory.follow()."""
+        t = np.append(np.arange(0.0, self.duration, step), self.duration)
+        s = np.array([self.sample(x) for x in t])
+        return t + t0, s[:, 0], s[:, 1]
+
+def choose_wrap(current_az, track_az, limits, vmax=20.0, step=1.0):
+    """Multiple of 360 for the pass track losing the least time: slew to the
+    first point, `step` s per sample outside the limits, 360/vmax per exit."""
+    track = np.degrees(np.unwrap(np.radians(np.asarray(track_az, dtype=np.float64))))
+    lo, hi = limits
+    best = None
+    k0 = math.floor((lo - track.max()) / 360.0)
+    k1 = math.ceil((hi - track.min()) / 360.0)
+    for k in range(k0, k1 + 1):
+        a = track + 360.0 * k
+        inside = (a >= lo) & (a <= hi)
+        if not inside.any():
+            continue
+        exits = int(np.count_nonzero(inside[:-1] & ~inside[1:]))
+        first = a[np.argmax(inside)]
+        cost = abs(first - current_az) / vmax + exits * 360.0 / vmax + step * np.count_nonzero(~inside)
+        if best is None or cost < best[0]:
+            best = (cost, 360.0 * k)
+    if best is None:
+        raise ValueError("pass azimuth never inside the azimuth limits")
+    return best[1]
+
+def plan_pass(current, track_az, track_el, limits, vmax=(20.0, 20.0), amax=(20.0, 20.0), shape="trapezoid",
+              step=1.0):
+    """(mechanical az track, SlewPlan to its first point)."""
+    off = choose_wrap(current[0], track_az, limits, vmax[0], step)
+    az = np.degrees(np.unwrap(np.radians(np.asarray(track_az, dtype=np.float64)))) + off
+    az = np.clip(az, limits[0], limits[1])
+    return az, SlewPlan(current, (az[0], float(track_el[0])), vmax, amax, shape)
@@ -0,0 +1,152 @@
+import math
+import threading
+import time
+
+class _Peaker:
+    """Pointing correction from SDR power (stamped on the controller's
+    monotonic clock); weak-signal samples are ignored."""
+
+    def __init__(self, size=0.5, gain=0.5, max_offset=3.0, min_snr_db=6.0, clock=time.monotonic):
+        self.size = float(size)
+        self.gain = float(gain)
+        self.max_offset = float(max_offset)
+        self.min_snr_db = float(min_snr_db)
+        self.clock = clock
+        self.correction = (0.0, 0.0)
+        self.updates = 0
+        self.el = 45.0
+        self._t0 = clock()
+
+    def reset(self):
+        self.correction = (0.0, 0.0)
+        self._t0 = self.clock()
+
+    def offset(self, t=None, el=None):
+        """Correction plus probe offset; az widened by 1/cos(el)."""
+        t = self.clock() if t is None else t
+        if el is not None:
+            self.el = el
+        pa, pe = self._probe(t - self._t0)
+        ca, ce = self.correction
+        return ca + pa * self._az_scale(), ce + pe
+
+    def _az_scale(self):
+        return 1.0 / max(0.17, math.cos(math.radians(self.el)))
+
+    def _move(self, gaz, gel):
+        """Steps the correction along the gradient (dB/deg)."""
+        step_az, step_el = self.gain * gaz, self.gain * gel
+        n = math.hypot(step_az, step_el)
+        if n > self.size:
+            step_az, step_el = step_az * self.size / n, step_el * self.size / n
+        ca, ce = self.correction
+        ca = max(-self.max_offset, min(self.max_offset, ca + step_az * self._az_scale()))
+        ce = max(-self.max_offset, min(self.max_offset, ce + step_el))
+        self.correction = (ca, ce)
+        self.updates += 1
+
+    def add_record(self, rec):
+        p = rec.get("peak_power_db")
+        t = rec.get("t_mono")
+        if p is None or t is None:
+            return
+        nf = rec.get("noise_floor_db")
+        if nf is not None and p - nf < self.min_snr_db:
+            return
+        self.add(t, p)
+
+class StepTrack(_Peaker):
+    """Dwells on centre, +-az, +-el and steps along the power gradient."""
+
+    PATTERN = ((0, 0), (1, 0), (-1, 0), (0, 1), (0, -1))
+
+    def __init__(self, size=0.5, dwell=1.5, settle=0.5, **kw):
+        super().__init__(size, **kw)
+        self.dwell = float(dwell)
+        self.settle = float(settle)
+        self._acc = [[0.0, 0] for _ in self.PATTERN]
+        self._cycle = 0
+
+    def _slot(self, tr):
+        k = int(tr // self.dwell)
+        return k // len(self.PATTERN), k % len(self.PATTERN), tr - k * self.dwell
+
+    def _probe(self, tr):
+        _, i, _ = self._slot(tr)
+        da, de = self.PATTERN[i]
+        return da * self.size, de * self.size
+
+    def add(self, t, p_db):
+        cycle, i, into = self._slot(t - self._t0)
+        if cycle != self._cycle:
+            self._finish()
+            self._cycle = cycle
+        if into >= self.settle:
+            a = self._acc[i]
+            a[0] += p_db
+            a[1] += 1
+
+    def _finish(self):
+        m = [a[0] / a[1] if a[1] else None for a in self._acc]
+        self._acc = [[0.0, 0] for _ in self.PATTERN]
+        if None in m:
+            return
+        self._move((m[1] - m[2]) / (2 * self.size), (m[3] - m[4]) / (2 * self.size))
+
+class ConicalScan(_Peaker):
+    """Circles `size` deg every `period` s; the gradient comes from a
+    cos/sin fit of the power per revolution."""
+
+    def __init__(self, size=0.5, period=8.0, latency=0.3, min_samples=8, **kw):
+        super().__init__(size, **kw)
+        self.period = float(period)
+        self.latency = float(latency)
+        self.min_samples = min_samples
+        self._sums = [0.0] * 5
+        self._n = 0
+        self._rev = 0
+
+    def _probe(self, tr):
+        w = 2.0 * math.pi * tr / self.period
+        return self.size * math.cos(w), self.size * math.sin(w)
+
+    def add(self, t, p_db):
+        tr = t - self._t0 - self.latency
+        rev = int(tr // self.period)
+        if rev != self._rev:
+            self._finish()
+            self._rev = rev
+        w = 2.0 * math.pi * tr / self.period
+        c, s = math.cos(w), math.sin(w)
+        for k, v in enumerate((p_db, p_db * c, p_db * s, c, s)):
+            self._sums[k] += v
+        self._n += 1
+
+    def _finish(self):
+        n, (sp, spc, sps, sc, ss) = self._n, self._sums
+        self._sums = [0.0] * 5
+        self._n = 0
+        if n < self.min_samples:
+            return
+        mean = sp / n
+        # least-squares b, c on (roughly) uniform angles: 2*cov(p, cos|sin)
+        b = 2.0 * (spc - mean * sc) / n
+        c = 2.0 * (sps - mean * ss) / n
+        self._move(b / self.size, c / self.size)
+
+PEAKERS = {"step": StepTrack, "conical": ConicalScan}
+
+def feed_from_telemetry(peaker, reader, stop_event, poll=0.02):
+    """Passes each new telemetry record to the peaker."""
+    seq = None
+    while not stop_event.is_set():
+        rec = reader.read()
+        if rec is not None and reader.seq != seq:
+            seq = reader.seq
+            peaker.add_record(rec)
+        stop_event.wait(poll)
+
+def start_feed(peaker, reader, poll=0.02):
+    stop = threading.Event()
+    threading.Thread(target=feed_from_telemetry, args=(peaker, reader, stop, poll), daemon=True).start()
+    return stop
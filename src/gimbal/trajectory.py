@@ -0,0 +1,110 @@
+from collections import deque
+import numpy as np
+
+def _unwrap_to(a, ref):
+    return ref + (a - ref + 180.0) % 360.0 - 180.0
+
+class TargetTrajectory:
+    """Target as a function of time instead of a static point.
+
+    push() takes the timestamped targets as they arrive (rotctl `P`
+    commands); position, velocity and acceleration are fitted over the last
+    `window` points (quadratic from 3 points, linear from 2) and
+    sample() evaluates the fit at loop rate, extrapolating at most `horizon`
+    seconds past the last point. A jump faster than `max_rate` deg/s, or a
+    gap longer than `horizon`, starts a new fit (the target stepped rather
+    than moved). follow() installs a full precomputed trajectory instead,
+    e.g. a gimbal.passes.Track converted to the controller's clock or a
+    gimbal.slew.SlewPlan; it is followed to its end, points pushed meanwhile
+    only take over afterwards. With unwrap=False az is used as given
+    (mechanical positions chosen by the caller) instead of being taken the
+    short way round from the previous point.
+
+    Writers (push/follow/hold) must be serialized by the caller; they
+    publish the fit, the followed track and the time of the last point as
+    one tuple, so sample() never takes a lock.
+    """
+
+    def __init__(self, window=5, horizon=3.0, max_rate=10.0, unwrap=True):
+        self.window = window
+        self.unwrap = unwrap
+        self.horizon = float(horizon)
+        self.max_rate = float(max_rate)
+        self._pts = deque(maxlen=window)
+        self._state = ((0.0, (0.0, 0.0, 0.0), (0.0, 0.0, 0.0)), None, None)
+
+    def hold(self, az, el, t=0.0):
+        self._pts.clear()
+        self._state = ((t, (float(az), 0.0, 0.0), (float(el), 0.0, 0.0)), None, None)
+
+    def push(self, t, az, el) -> bool:
+        """Adds a target point; returns True if it started a new fit (first
+        point, step or gap), which also drops any followed trajectory."""
+        az, el = float(az), float(el)
+        restart = True
+        if self._pts:
+            t1, az1, el1 = self._pts[-1]
+            dt = t - t1
+            azu = _unwrap_to(az, az1) if self.unwrap else az
+            if dt > self.horizon or dt <= 0 or max(abs(azu - az1), abs(el - el1)) > self.max_rate * dt:
+                self._pts.clear()
+            else:
+                az = azu
+                restart = False
+        track = self._state[1]
+        if restart or (track is not None and t >= track[0][-1]):
+            track = None
+        self._pts.append((t, az, el))
+        n = len(self._pts)
+        if n == 1:
+            self._state = ((t, (az, 0.0, 0.0), (el, 0.0, 0.0)), track, t)
+            return restart
+        p = np.array(self._pts)
+        ts = p[:, 0] - t
+        deg = 2 if n >= 3 else 1
+        fits = []
+        for y in (p[:, 1], p[:, 2]):
+            c = np.polyfit(ts, y, deg)
+            fits.append((float(c[-1]), float(c[-2]), float(c[0]) if deg == 2 else 0.0))
+        self._state = ((t, fits[0], fits[1]), track, t)
+        return restart
+
+    def follow(self, t, az, el):
+        """Track a supplied trajectory: arrays of times (controller clock),
+        az and el. Velocities come from np.gradient of the samples."""
+        t = np.asarray(t, dtype=np.float64)
+        az = np.asarray(az, dtype=np.float64)
+        el = np.asarray(el, dtype=np.float64)
+        if self.unwrap:
+            az = np.degrees(np.unwrap(np.radians(az)))
+        fit, _, last = self._state
+        self._state = (fit, (t, az, el, np.gradient(az, t), np.gradient(el, t)), last)
+
+    def sample(self, t):
+        """(az, el, vaz, vel) at time t; az is not re-wrapped."""
+        fit, tr, last = self._state
+        # A followed trajectory wins until its end, and afterwards too unless
+        # newer points were pushed while it ran.
+        if tr is not None and (t < tr[0][-1] or last is None or last < tr[0][0]):
+            tt, az, el, vaz, vel = tr
+            if t <= tt[0] or t >= tt[-1]:
+                k = 0 if t <= tt[0] else -1
+                return float(az[k]), float(el[k]), 0.0, 0.0
+            return (float(np.interp(t, tt, az)), float(np.interp(t, tt, el)),
+                    float(np.interp(t, tt, vaz)), float(np.interp(t, tt, vel)))
+        t0, (a0, a1, a2), (e0, e1, e2) = fit
+        dt = t - t0
+        if dt > self.horizon:
+            dt = self.horizon
+            moving = False
+        else:
+            moving = True
+        dt = max(0.0, dt)
+        az = a0 + a1 * dt + a2 * dt * dt
+        el = e0 + e1 * dt + e2 * dt * dt
+        if not moving:
+            return az, el, 0.0, 0.0
+        r = self.max_rate
+        vaz = max(-r, min(r, a1 + 2.0 * a2 * dt))
+        vel = max(-r, min(r, e1 + 2.0 * e2 * dt))
+        return az, el, vaz, vel
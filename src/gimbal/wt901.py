@@ -0,0 +1,189 @@
+import math
+import struct
+import threading
+import time
+import serial
+
+# WT901C485 over Modbus RTU; only the three angle registers are polled.
+
+REG_SAVE = 0x00
+REG_RRATE = 0x03
+REG_BAUD = 0x04
+REG_ROLL = 0x3D  # then pitch 0x3E, yaw 0x3F
+REG_KEY = 0x69
+UNLOCK_KEY = 0xB588
+
+BAUD_CODES = {4800: 1, 9600: 2, 19200: 3, 38400: 4, 57600: 5, 115200: 6, 230400: 7}
+RATE_CODES = {0.2: 1, 0.5: 2, 1: 3, 2: 4, 5: 5, 10: 6, 20: 7, 50: 8, 100: 9, 200: 11}
+ANGLE_SCALE = 180.0 / 32768.0
+
+def _crc_table():
+    table = []
+    for i in range(256):
+        c = i
+        for _ in range(8):
+            c = (c >> 1) ^ 0xA001 if c & 1 else c >> 1
+        table.append(c)
+    return tuple(table)
+
+CRC_TABLE = _crc_table()
+
+def crc16(data: bytes) -> int:
+    crc = 0xFFFF
+    t = CRC_TABLE
+    for b in data:
+        crc = (crc >> 8) ^ t[(crc ^ b) & 0xFF]
+    return crc
+
+def _frame(body: bytes) -> bytes:
+    return body + struct.pack("<H", crc16(body))
+
+class WT901Error(IOError):
+    pass
+
+class WT901:
+    """Minimal Modbus RTU client for the WT901C485."""
+
+    def __init__(self, port="/dev/ttyUSB0", baud=9600, addr=0x50, timeout=0.1):
+        self.port = port
+        self.addr = addr
+        self.timeout = timeout
+        self._ser = serial.Serial(port, baud, timeout=timeout)
+        self._baud = baud
+        self._read_req = _frame(struct.pack(">BBHH", addr, 0x03, REG_ROLL, 3))
+
+    @property
+    def baud(self):
+        return self._ser.baudrate
+
+    def _transact(self, req: bytes, n: int) -> bytes:
+        ser = self._ser
+        ser.reset_input_buffer()
+        ser.write(req)
+        resp = ser.read(n)
+        if len(resp) != n:
+            raise WT901Error(f"WT901 timeout ({len(resp)}/{n} bytes)")
+        if crc16(resp[:-2]) != struct.unpack("<H", resp[-2:])[0]:
+            raise WT901Error("WT901 CRC error")
+        if resp[0] != self.addr or resp[1] != req[1]:
+            raise WT901Error(f"WT901 unexpected reply {resp[:2].hex()}")
+        return resp
+
+    def read_registers(self, reg: int, n: int):
+        """n signed 16-bit registers starting at reg (function 0x03)."""
+        req = _frame(struct.pack(">BBHH", self.addr, 0x03, reg, n))
+        resp = self._transact(req, 5 + 2 * n)
+        return struct.unpack(f">{n}h", resp[3:3 + 2 * n])
+
+    def read_angles(self):
+        """(roll, pitch, yaw) in degrees."""
+        resp = self._transact(self._read_req, 11)
+        r, p, y = struct.unpack(">3h", resp[3:9])
+        return r * ANGLE_SCALE, p * ANGLE_SCALE, y * ANGLE_SCALE
+
+    def write_register(self, reg: int, value: int):
+        req = _frame(struct.pack(">BBHH", self.addr, 0x06, reg, value & 0xFFFF))
+        self._transact(req, 8)
+
+    def unlock(self):
+        self.write_register(REG_KEY, UNLOCK_KEY)
+
+    def save(self):
+        self.write_register(REG_SAVE, 0x0000)
+
+    def set_rate(self, hz):
+        """Output (return) rate of the sensor's internal update."""
+        if hz not in RATE_CODES:
+            raise ValueError(f"unsupported WT901 rate {hz} (choose from {sorted(RATE_CODES)})")
+        self.unlock()
+        self.write_register(REG_RRATE, RATE_CODES[hz])
+        self.save()
+
+    def set_baud(self, baud: int):
+        """Switches and saves the sensor baud, then follows it on the port."""
+        if baud not in BAUD_CODES:
+            raise ValueError(f"unsupported WT901 baud {baud} (choose from {sorted(BAUD_CODES)})")
+        self.unlock()
+        self.write_register(REG_BAUD, BAUD_CODES[baud])
+        time.sleep(0.05)
+        self._ser.baudrate = baud
+        self._baud = baud
+        time.sleep(0.05)
+        self.unlock()
+        self.save()
+
+    def reopen(self):
+        """Reopens the port, e.g. after the adapter was replugged."""
+        try:
+            self._ser.close()
+        except serial.SerialException:
+            pass
+        self._ser = serial.Serial(self.port, self._baud, timeout=self.timeout)
+
+    def close(self):
+        self._ser.close()
+
+class WT901Sensor:
+    """Polls the angle registers in a thread; read() returns the latest
+    (yaw, pitch) as (az, el), `stale` once no reply came for `max_age` s.
+    A failed port is reopened with exponential backoff."""
+
+    def __init__(self, port="/dev/ttyUSB0", baud=9600, addr=0x50, interval=0.0, timeout=0.1, max_age=0.5,
+                 backoff=0.1, max_backoff=2.0):
+        self.dev = WT901(port, baud, addr, timeout)
+        self.interval = interval
+        self.max_age = max_age
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.az = 0.0
+        self.el = 0.0
+        self.t = None
+        self.reads = 0
+        self.errors = 0
+        self.reopens = 0
+        self._run = True
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._poll_loop, daemon=True)
+        self._thread.start()
+
+    def _poll_loop(self):
+        delay = self.backoff
+        broken = False
+        while self._run:
+            try:
+                if broken:
+                    self.dev.reopen()
+                    self.reopens += 1
+                    broken = False
+                _, pitch, yaw = self.dev.read_angles()
+            except WT901Error:
+                self.errors += 1
+                continue
+            except (serial.SerialException, OSError):
+                self.errors += 1
+                broken = True
+                self._wake.wait(delay)
+                delay = min(self.max_backoff, delay * 2.0)
+                continue
+            delay = self.backoff
+            self.az, self.el, self.t = yaw, pitch, time.monotonic()
+            self.reads += 1
+            if self.interval:
+                self._wake.wait(self.interval)
+
+    @property
+    def age(self):
+        return math.inf if self.t is None else time.monotonic() - self.t
+
+    @property
+    def stale(self):
+        return self.age > self.max_age
+
+    def read(self):
+        return self.az, self.el
+
+    def close(self):
+        self._run = False
+        self._wake.set()
+        self._thread.join(1.0)
+        self.dev.close()
@@ -1,17 +1,16 @@
 # coding: UTF-8
+import os
 import sys
 import time
 import threading
 
 # =====================================================
-# WT901 SDK PATH
+# PROJECT LIBS (src/)
 # =====================================================
-SDK_CHS = "/home/raspberrypi5/WitStandardModbus_WT901C485/Python/Python-SDK-WT901C485/chs"
-sys.path.insert(0, SDK_CHS)
-
-import lib.device_model as deviceModel
-from lib.data_processor.roles.jy901s_dataProcessor import JY901SDataProcessor
-from lib.protocol_resolver.roles.protocol_485_resolver import Protocol485Resolver
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from gimbal.pid import PID
+from gimbal.wt901 import WT901Sensor
+from gimbal.scheduler import PeriodicScheduler
 
 # =====================================================
 # GPIO MOTOR
@@ -101,32 +100,9 @@ def motor_drive(pwm, in1, in2, speed):
 # =====================================================
 # PID
 # =====================================================
-class PID:
-    def __init__(self, kp, ki, kd, ilim=60):
-        self.kp, self.ki, self.kd = kp, ki, kd
-        self.integral = 0
-        self.last_error = 0
-        self.last_time = time.time()
-        self.ilim = ilim
-
-    def compute(self, err):
-        now = time.time()
-        dt = now - self.last_time
-        self.last_time = now
-        if dt <= 0:
-            return 0
-
-        self.integral += err * dt
-        self.integral = clamp(self.integral, -self.ilim, self.ilim)
-
-        d = (err - self.last_error) / dt
-        self.last_error = err
-
-        return self.kp * err + self.ki * self.integral + self.kd * d
-
 # 🔧 FINAL PID (ANTI OVERSHOOT)
-pid_az = PID(8.75, 0.05, 2.2)
-pid_el = PID(9.0,  0.05, 2.4)
+pid_az = PID(8.75, 0.05, 2.2, -70, 70, ilim=3.0, tau=0.05, wrap=360.0)
+pid_el = PID(9.0,  0.05, 2.4, -80, 80, ilim=3.0, tau=0.05)
 
 # =====================================================
 # STATE
@@ -139,20 +115,13 @@ TARGET_AZ = 0.0
 TARGET_EL = 0.0
 
 # =====================================================
-# WT901 CALLBACK
+# WT901 LOOP (native Modbus driver: angle registers only)
 # =====================================================
-def onUpdate(dev):
+def wt901_loop(sensor):
     global raw_az, raw_el
-    raw_az = dev.getDeviceData("angleZ")
-    raw_el = dev.getDeviceData("angleY")
-
-# =====================================================
-# WT901 THREAD
-# =====================================================
-def wt901_loop(dev):
     while True:
-        dev.readReg(0x30, 41)
-        time.sleep(0.01)
+        raw_az, raw_el = sensor.read()  # yaw, pitch
+        time.sleep(0.005)
 
 # =====================================================
 # KEYBOARD
@@ -188,33 +157,31 @@ def keyboard_loop():
 # =====================================================
 print("=== AZIMUTH / ELEVATION CONTROLLER ===")
 
-device = deviceModel.DeviceModel(
-    "WT901",
-    Protocol485Resolver(),
-    JY901SDataProcessor(),
-    "51_0"
-)
-
-device.ADDR = 0x50
-device.serialConfig.portName = "/dev/ttyUSB0"
-device.serialConfig.baud = 9600
-
-device.openDevice()
-device.dataProcessor.onVarChanged.append(onUpdate)
+device = WT901Sensor("/dev/ttyUSB0", 9600, 0x50)
 
 threading.Thread(target=wt901_loop, args=(device,), daemon=True).start()
 threading.Thread(target=keyboard_loop, daemon=True).start()
 
+loop_timer = PeriodicScheduler(0.02)
+
 try:
     while True:
+        # No fresh WT901 reply: stop rather than drive on a frozen angle.
+        if device.stale:
+            motor_drive(az_pwm, AZ_IN1, AZ_IN2, 0)
+            motor_drive(el_pwm, EL_IN1, EL_IN2, 0)
+            print_status("WT901 TIDAK MERESPON → motor berhenti")
+            loop_timer.wait()
+            continue
+
         az = clamp(raw_az - az_offset, MIN_AZ, MAX_AZ)
         el = clamp(raw_el - el_offset, MIN_EL, MAX_EL)
 
         az_err = deadzone(az_error_shortest(TARGET_AZ, az), 0.1)
         el_err = deadzone(TARGET_EL - el, 0.1)
 
-        az_out = pid_az.compute(az_err)
-        el_out = pid_el.compute(el_err)
+        az_out = pid_az.compute(az_err, az)
+        el_out = pid_el.compute(el_err, el)
 
         az_out = near_target_boost(az_err, soft_scale(az_err, az_out))
         el_out = near_target_boost(el_err, soft_scale(el_err, el_out))
@@ -240,14 +207,15 @@ try:
             f"STATUS → AZ={az:6.1f}  EL={el:6.1f}"
         )
 
-        time.sleep(0.02)
+        loop_timer.wait()
 
 except KeyboardInterrupt:
     pass
 finally:
+    print(f"\nLOOP {loop_timer.stats()}")
     motor_drive(az_pwm, AZ_IN1, AZ_IN2, 0)
     motor_drive(el_pwm, EL_IN1, EL_IN2, 0)
-    device.closeDevice()
+    device.close()
     az_pwm.stop()
     el_pwm.stop()
     GPIO.cleanup()
@@ -1,18 +1,17 @@
 # coding: UTF-8
+import os
 import sys
 import time
 import threading
 import platform
 
 # =====================================================
-# WT901 SDK PATH
+# PROJECT LIBS (src/)
 # =====================================================
-SDK_CHS = "/home/raspberrypi5/WitStandardModbus_WT901C485/Python/Python-SDK-WT901C485/chs"
-sys.path.insert(0, SDK_CHS)
-
-import lib.device_model as deviceModel
-from lib.data_processor.roles.jy901s_dataProcessor import JY901SDataProcessor
-from lib.protocol_resolver.roles.protocol_485_resolver import Protocol485Resolver
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from gimbal.pid import PID
+from gimbal.wt901 import WT901Sensor
+from gimbal.scheduler import PeriodicScheduler
 
 # =====================================================
 # GPIO MOTOR
@@ -56,38 +55,9 @@ def motor_drive(pwm, in1, in2, speed):
     else:
         pwm.ChangeDutyCycle(0)
 
-# =====================================================
-# PID CONTROLLER
-# =====================================================
-class PID:
-    def __init__(self, kp, ki, kd):
-        self.kp = kp
-        self.ki = ki
-        self.kd = kd
-        self.integral = 0.0
-        self.last_error = 0.0
-        self.last_time = time.time()
-
-    def compute(self, error):
-        now = time.time()
-        dt = now - self.last_time
-        self.last_time = now
-        if dt <= 0:
-            return 0
-
-        self.integral += error * dt
-        derivative = (error - self.last_error) / dt
-        self.last_error = error
-
-        return (
-            self.kp * error +
-            self.ki * self.integral +
-            self.kd * derivative
-        )
-
 # ===== PID TUNING =====
-pid_az = PID(kp=4.0, ki=0.0, kd=1.2)
-pid_el = PID(kp=6.0, ki=0.0, kd=1.8)
+pid_az = PID(kp=4.0, ki=0.0, kd=1.2, out_min=-50, out_max=50, tau=0.05)
+pid_el = PID(kp=6.0, ki=0.0, kd=1.8, out_min=-60, out_max=60, tau=0.05)
 
 # ===== TARGET =====
 TARGET_AZ = 0.0
@@ -102,20 +72,13 @@ az_offset = 0.0
 el_offset = 0.0
 
 # =====================================================
-# WT901 CALLBACK
+# WT901 LOOP (native Modbus driver: angle registers only)
 # =====================================================
-def onUpdate(device):
+def wt901_loop(sensor):
     global raw_az, raw_el
-    raw_az = device.getDeviceData("angleZ")  # Yaw
-    raw_el = device.getDeviceData("angleY")  # Pitch
-
-# =====================================================
-# WT901 LOOP
-# =====================================================
-def wt901_loop(device):
     while True:
-        device.readReg(0x30, 41)
-        time.sleep(0.01)
+        raw_az, raw_el = sensor.read()  # yaw, pitch
+        time.sleep(0.005)
 
 # =====================================================
 # KEYBOARD CALIBRATION THREAD
@@ -136,25 +99,23 @@ def keyboard_loop():
 print("=== AZIMUTH / ELEVATION CONTROL ===")
 print("Press 'c' + Enter to CALIBRATE ZERO")
 
-device = deviceModel.DeviceModel(
-    "WT901",
-    Protocol485Resolver(),
-    JY901SDataProcessor(),
-    "51_0"
-)
-
-device.ADDR = 0x50
-device.serialConfig.portName = "/dev/ttyUSB0"
-device.serialConfig.baud = 9600
-
-device.openDevice()
-device.dataProcessor.onVarChanged.append(onUpdate)
+device = WT901Sensor("/dev/ttyUSB0", 9600, 0x50)
 
 threading.Thread(target=wt901_loop, args=(device,), daemon=True).start()
 threading.Thread(target=keyboard_loop, daemon=True).start()
 
+loop_timer = PeriodicScheduler(0.02)
+
 try:
     while True:
+        # ===== SENSOR STALE → STOP =====
+        if device.stale:
+            motor_drive(az_pwm, AZ_IN1, AZ_IN2, 0)
+            motor_drive(el_pwm, EL_IN1, EL_IN2, 0)
+            print("WT901 TIDAK MERESPON → motor berhenti", end="\r")
+            loop_timer.wait()
+            continue
+
         # ===== APPLY OFFSET =====
         azimuth   = raw_az - az_offset
         elevation = raw_el - el_offset
@@ -164,8 +125,8 @@ try:
         el_error = TARGET_EL - elevation
 
         # ===== PID =====
-        az_out = pid_az.compute(az_error)
-        el_out = pid_el.compute(el_error)
+        az_out = pid_az.compute(az_error, azimuth)
+        el_out = pid_el.compute(el_error, elevation)
 
         # ===== SAFETY =====
         az_out = max(-50, min(50, az_out))
@@ -181,15 +142,16 @@ try:
             end="\r"
         )
 
-        time.sleep(0.02)
+        loop_timer.wait()
 
 except KeyboardInterrupt:
     print("\nSTOP")
 
 finally:
+    print(f"\nLOOP {loop_timer.stats()}")
     motor_drive(az_pwm, AZ_IN1, AZ_IN2, 0)
     motor_drive(el_pwm, EL_IN1, EL_IN2, 0)
-    device.closeDevice()
+    device.close()
     az_pwm.stop()
     el_pwm.stop()
     GPIO.cleanup()
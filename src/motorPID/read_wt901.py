@@ -1,71 +1,61 @@
 # coding: UTF-8
+import argparse
+import os
+import platform
 import sys
 import time
-import threading
-import platform
 
 # =====================================================
-# PYTHON PATH → HARUS KE FOLDER chs
+# PROJECT LIBS (src/)
 # =====================================================
-SDK_CHS = "/home/raspberrypi5/WitStandardModbus_WT901C485/Python/Python-SDK-WT901C485/chs"
-sys.path.insert(0, SDK_CHS)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from gimbal.fake_wt901 import FakeWT901
+from gimbal.wt901 import BAUD_CODES, RATE_CODES, WT901, WT901Error
 
 # =====================================================
-# IMPORT SDK (SEKARANG AKAN BERHASIL)
+# ARGS
 # =====================================================
-import lib.device_model as deviceModel
-from lib.data_processor.roles.jy901s_dataProcessor import JY901SDataProcessor
-from lib.protocol_resolver.roles.protocol_485_resolver import Protocol485Resolver
-
-# =====================================================
-# CALLBACK DATA
-# =====================================================
-def onUpdate(device):
-    roll  = device.getDeviceData("angleX")
-    pitch = device.getDeviceData("angleY")
-    yaw   = device.getDeviceData("angleZ")
-
-    print(f"ROLL={roll:7.2f}  PITCH={pitch:7.2f}  YAW={yaw:7.2f}")
-
-# =====================================================
-# LOOP READ
-# =====================================================
-def loop_read(device):
-    while True:
-        device.readReg(0x30, 41)
-        time.sleep(0.01)
+p = argparse.ArgumentParser(description="Baca sudut WT901C485 (Modbus RTU, hanya register sudut 0x3D-0x3F)")
+p.add_argument("--port", default="/dev/ttyUSB0" if platform.system().lower() == "linux" else "COM82")
+p.add_argument("--baud", type=int, default=9600)
+p.add_argument("--addr", type=lambda v: int(v, 0), default=0x50)
+p.add_argument("--set_baud", type=int, choices=sorted(BAUD_CODES), help="ubah baud sensor (disimpan di sensor)")
+p.add_argument("--set_rate", type=float, choices=sorted(RATE_CODES), help="ubah return rate sensor (Hz)")
+p.add_argument("--fake", action="store_true", help="uji tanpa hardware: sensor palsu di pseudo-terminal")
+args = p.parse_args()
 
 # =====================================================
 # MAIN
 # =====================================================
-print("WT901C485 running from motor-dc... Ctrl+C to stop")
-
-device = deviceModel.DeviceModel(
-    "WT901",
-    Protocol485Resolver(),
-    JY901SDataProcessor(),
-    "51_0"
-)
-
-device.ADDR = 0x50
-
-if platform.system().lower() == "linux":
-    device.serialConfig.portName = "/dev/ttyUSB0"
-else:
-    device.serialConfig.portName = "COM82"
-
-device.serialConfig.baud = 9600
-device.openDevice()
-
-device.dataProcessor.onVarChanged.append(onUpdate)
-
-t = threading.Thread(target=loop_read, args=(device,), daemon=True)
-t.start()
-
+fake = None
+if args.fake:
+    fake = FakeWT901(args.addr, angles=(1.0, 12.5, -30.0))
+    args.port = fake.port
+
+dev = WT901(args.port, args.baud, args.addr)
+if args.set_rate:
+    dev.set_rate(args.set_rate if args.set_rate % 1 else int(args.set_rate))
+    print(f"Return rate -> {args.set_rate} Hz")
+if args.set_baud:
+    dev.set_baud(args.set_baud)
+    print(f"Baud -> {args.set_baud} (port dibuka ulang)")
+
+print(f"WT901C485 @ {args.port} {dev.baud} baud... Ctrl+C to stop")
+n = 0
+t0 = time.monotonic()
 try:
     while True:
-        time.sleep(1)
+        try:
+            roll, pitch, yaw = dev.read_angles()
+        except WT901Error as e:
+            print(f"\n{e}")
+            continue
+        n += 1
+        rate = n / (time.monotonic() - t0)
+        print(f"ROLL={roll:7.2f}  PITCH={pitch:7.2f}  YAW={yaw:7.2f}  ({rate:5.1f} Hz)", end="\r")
 except KeyboardInterrupt:
     print("\nStop")
 finally:
-    device.closeDevice()
+    dev.close()
+    if fake is not None:
+        fake.close()
@@ -1,33 +1,351 @@
+import json
 import math
+import threading
 import numpy as np
 
+WINDOWS = {
+    "hann": np.hanning,
+    "hamming": np.hamming,
+    "blackman": np.blackman,
+    "rect": np.ones,
+}
+
+AVERAGING = ("none", "welch")
+
+_FFT_OUT = np.lib.NumpyVersion(np.__version__) >= "2.0.0"
+
+class PSDEngine:
+    """PSD for one (nfft, fs, fc, window) setup with cached window, scale and axis.
+
+    `psd()` writes into a reused internal buffer unless `out` is given, so the
+    returned array is only valid until the next call on the same engine.
+    """
+
+    def __init__(self, nfft: int, fs_hz: float, fc_hz: float, window: str = "hann"):
+        if window not in WINDOWS:
+            raise ValueError(f"unknown window: {window}")
+        self.nfft = int(nfft)
+        self.fs_hz = float(fs_hz)
+        self.fc_hz = float(fc_hz)
+        self.window = window
+        f = np.fft.fftshift(np.fft.fftfreq(self.nfft, d=1.0 / self.fs_hz)) + self.fc_hz
+        f.flags.writeable = False
+        self.freq = f
+        self._win = {}
+        self._xw = np.zeros(self.nfft, dtype=np.complex128)
+        self._X = np.empty(self.nfft, dtype=np.complex128)
+        self._P = np.empty(self.nfft, dtype=np.float64)
+        self._tmp = np.empty(self.nfft, dtype=np.float64)
+        self._seg = None
+
+    def _window(self, m: int):
+        # For even nfft, fftshift of the output equals modulating the input by (-1)^n,
+        # so the shift is folded into the window and no per-frame fftshift is needed.
+        c = self._win.get(m)
+        if c is None:
+            if m < 1:
+                raise ValueError("empty input")
+            w = WINDOWS[self.window](m)
+            scale = 1.0 / float(np.sum(w ** 2))
+            shifted = self.nfft % 2 == 0
+            if shifted:
+                w = w * np.where(np.arange(m) % 2 == 0, 1.0, -1.0)
+            c = (w, scale, shifted)
+            self._win[m] = c
+        return c
+
+    def _fft(self, xw):
+        if _FFT_OUT:
+            return np.fft.fft(xw, out=self._X)
+        return np.fft.fft(xw)
+
+    def _to_db(self, out, scale):
+        out *= scale
+        out += 1e-12
+        np.log10(out, out=out)
+        out *= 10.0
+        return out
+
+    def psd(self, x: np.ndarray, out: np.ndarray | None = None):
+        m = min(len(x), self.nfft)
+        w, scale, shifted = self._window(m)
+        xw = self._xw
+        np.multiply(x[:m], w, out=xw[:m])
+        if m < self.nfft:
+            xw[m:] = 0.0
+        X = self._fft(xw)
+        if not shifted:
+            X = np.fft.fftshift(X)
+        out = self._P if out is None else out
+        np.multiply(X.real, X.real, out=out)
+        np.multiply(X.imag, X.imag, out=self._tmp)
+        out += self._tmp
+        return self._to_db(out, scale)
+
+    def welch(self, x: np.ndarray, overlap: float = 0.5, batch: int = 256, out: np.ndarray | None = None):
+        if not 0.0 <= overlap < 1.0:
+            raise ValueError("overlap must be in [0, 1)")
+        n = self.nfft
+        if len(x) < n:
+            return self.psd(x, out)
+        hop = max(1, int(round(n * (1.0 - overlap))))
+        segs = np.lib.stride_tricks.sliding_window_view(np.asarray(x), n)[::hop]
+        w, scale, shifted = self._window(n)
+        if self._seg is None or len(self._seg) < min(batch, len(segs)):
+            self._seg = np.empty((min(batch, len(segs)), n), dtype=np.complex128)
+        acc = self._tmp
+        acc[:] = 0.0
+        for i in range(0, len(segs), len(self._seg)):
+            blk = segs[i:i + len(self._seg)]
+            buf = self._seg[:len(blk)]
+            np.multiply(blk, w, out=buf)
+            X = np.fft.fft(buf, axis=1)
+            acc += np.einsum("ij,ij->j", X.real, X.real)
+            acc += np.einsum("ij,ij->j", X.imag, X.imag)
+        out = self._P if out is None else out
+        if shifted:
+            out[:] = acc
+        else:
+            out[:] = np.fft.fftshift(acc)
+        return self._to_db(out, scale / len(segs))
+
+    def psd_batch(self, X: np.ndarray):
+        X = np.asarray(X)
+        m = min(X.shape[1], self.nfft)
+        w, scale, shifted = self._window(m)
+        F = np.fft.fft(X[:, :m] * w, self.nfft, axis=1)
+        if not shifted:
+            F = np.fft.fftshift(F, axes=1)
+        P = F.real ** 2
+        P += F.imag ** 2
+        return self._to_db(P, scale)
+
+# Engines own their output buffers, so each thread gets its own cache.
+_LOCAL = threading.local()
+_MAX_ENGINES = 8
+
+def get_engine(nfft: int, fs_hz: float, fc_hz: float, window: str = "hann") -> PSDEngine:
+    engines = getattr(_LOCAL, "engines", None)
+    if engines is None:
+        engines = _LOCAL.engines = {}
+    key = (int(nfft), float(fs_hz), float(fc_hz), window)
+    eng = engines.get(key)
+    if eng is None:
+        eng = PSDEngine(*key)
+        if len(engines) >= _MAX_ENGINES:
+            del engines[next(iter(engines))]
+        engines[key] = eng
+    return eng
+
 def average_power_db(x: np.ndarray) -> float:
     return 10.0 * math.log10(float(np.var(x)) + 1e-12)
 
-def psd_arrays(x: np.ndarray, fs_hz: float, fc_hz: float, nfft: int):
-    m = min(len(x), nfft)
-    w = np.hanning(m)
-    X = np.fft.fftshift(np.fft.fft(x[:m] * w, nfft))
-    P = 10.0 * np.log10((np.abs(X) ** 2) / float(np.sum(w ** 2)) + 1e-12)
-    f = np.fft.fftshift(np.fft.fftfreq(nfft, d=1.0 / fs_hz)) + fc_hz
-    return P, f
+def _engine_psd(eng, x, avg, overlap):
+    if avg == "welch":
+        return eng.welch(x, overlap)
+    if avg != "none":
+        raise ValueError(f"unknown averaging: {avg}")
+    return eng.psd(x)
+
+def psd_arrays(x: np.ndarray, fs_hz: float, fc_hz: float, nfft: int, window: str = "hann",
+               avg: str = "none", overlap: float = 0.5):
+    eng = get_engine(nfft, fs_hz, fc_hz, window)
+    return _engine_psd(eng, x, avg, overlap).copy(), eng.freq
+
+def _percentile(P: np.ndarray, q: float):
+    # Same result as np.percentile(P, q, axis=-1) (linear method), but selects
+    # only the two neighbouring order statistics instead of sorting.
+    n = P.shape[-1]
+    pos = q / 100.0 * (n - 1)
+    k = int(math.floor(pos))
+    frac = pos - k
+    if frac == 0.0 or k + 1 >= n:
+        return np.partition(P, k, axis=-1)[..., k]
+    part = np.partition(P, (k, k + 1), axis=-1)
+    lo = part[..., k]
+    return lo + frac * (part[..., k + 1] - lo)
+
+class PercentileFloor:
+    """Reference estimator: np.percentile over the PSD bins (full sort)."""
+
+    def __init__(self, q: float = 10.0):
+        self.q = float(q)
+
+    def __call__(self, P: np.ndarray) -> float:
+        return float(np.percentile(P, self.q))
+
+    def batch(self, P: np.ndarray) -> np.ndarray:
+        return np.percentile(P, self.q, axis=1)
+
+    def reset(self):
+        pass
+
+class PartitionFloor(PercentileFloor):
+    """Same value as PercentileFloor, selected with np.partition."""
+
+    def __call__(self, P: np.ndarray) -> float:
+        return float(_percentile(P, self.q))
+
+    def batch(self, P: np.ndarray) -> np.ndarray:
+        return _percentile(P, self.q)
+
+class MedianFloor(PartitionFloor):
+    """Median over all bins; insensitive to a few strong carriers."""
+
+    def __init__(self):
+        super().__init__(50.0)
+
+class StreamingQuantileFloor:
+    """Tracks the q-th percentile across frames without sorting.
+
+    Each frame only counts the bins below the current estimate and nudges the
+    estimate towards the target fraction, so the result is smoothed over
+    roughly 1 / (gain_db * pdf) frames. Call reset() after retuning.
+    """
 
-def psd_peak(x: np.ndarray, fs_hz: float, fc_hz: float, nfft: int = 1024):
-    P, f = psd_arrays(x, fs_hz, fc_hz, nfft)
+    def __init__(self, q: float = 10.0, gain_db: float = 5.0):
+        self.q = float(q)
+        self.gain_db = float(gain_db)
+        self.value = None
+        self._init = PartitionFloor(q)
+
+    def __call__(self, P: np.ndarray) -> float:
+        if self.value is None:
+            self.value = self._init(P)
+        else:
+            below = np.count_nonzero(P < self.value) / float(len(P))
+            self.value += self.gain_db * (self.q / 100.0 - below)
+        return self.value
+
+    def batch(self, P: np.ndarray) -> np.ndarray:
+        return np.array([self(row) for row in P])
+
+    def reset(self):
+        self.value = None
+
+NOISE_FLOORS = {
+    "partition": PartitionFloor,
+    "percentile": PercentileFloor,
+    "median": MedianFloor,
+    "streaming": StreamingQuantileFloor,
+}
+
+def make_floor(name: str = "partition"):
+    if name not in NOISE_FLOORS:
+        raise ValueError(f"unknown noise floor estimator: {name}")
+    return NOISE_FLOORS[name]()
+
+_DEFAULT_FLOOR = PartitionFloor(10.0)
+
+def _ratio(peak_db, floor_db):
+    return np.clip((peak_db - floor_db) / np.maximum(1.0, np.abs(floor_db)), 0.0, 1.0)
+
+def _peak(P, f):
     i = int(np.argmax(P))
-    return float(P[i]), float(f[i]), P, f
+    return float(P[i]), float(f[i])
+
+SCALAR_KEYS = ("average_power_db", "peak_power_db", "peak_freq_hz", "noise_floor_db", "signal_strength_ratio")
+PSD_KEYS = ("psd_db", "psd_freq_hz")
+
+class MetricsResult:
+    """Result of compute_metrics with the PSD kept as NumPy arrays.
+
+    Indexing with the old dict keys still works; "psd_db"/"psd_freq_hz" are
+    converted to lists only when asked for. `psd` is the engine's reused
+    buffer, so call copy() before keeping a result past the next frame.
+    """
+
+    __slots__ = SCALAR_KEYS + ("psd", "freq")
+
+    def __init__(self, average_power_db, peak_power_db, peak_freq_hz, noise_floor_db, signal_strength_ratio, psd, freq):
+        self.average_power_db = average_power_db
+        self.peak_power_db = peak_power_db
+        self.peak_freq_hz = peak_freq_hz
+        self.noise_floor_db = noise_floor_db
+        self.signal_strength_ratio = signal_strength_ratio
+        self.psd = psd
+        self.freq = freq
+
+    def copy(self):
+        return MetricsResult(*(getattr(self, k) for k in SCALAR_KEYS), self.psd.copy(), self.freq)
 
-def compute_metrics(x: np.ndarray, fs_hz: float, fc_hz: float, nfft: int = 1024):
+    def __getitem__(self, key):
+        if key in SCALAR_KEYS:
+            return getattr(self, key)
+        if key == "psd_db":
+            return self.psd.tolist()
+        if key == "psd_freq_hz":
+            return self.freq.tolist()
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        return key in SCALAR_KEYS or key in PSD_KEYS
+
+    def keys(self):
+        return list(SCALAR_KEYS + PSD_KEYS)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(SCALAR_KEYS) + len(PSD_KEYS)
+
+    def items(self):
+        return [(k, self[k]) for k in self.keys()]
+
+    def values(self):
+        return [self[k] for k in self.keys()]
+
+    def to_dict(self, psd: bool = False):
+        d = {k: getattr(self, k) for k in SCALAR_KEYS}
+        if psd:
+            d["psd_db"] = self.psd.tolist()
+            d["psd_freq_hz"] = self.freq.tolist()
+        return d
+
+    def to_json(self, psd: bool = False) -> str:
+        return json.dumps(self.to_dict(psd))
+
+    def __repr__(self):
+        return "MetricsResult(" + ", ".join(f"{k}={getattr(self, k)!r}" for k in SCALAR_KEYS) + ")"
+
+def psd_peak(x: np.ndarray, fs_hz: float, fc_hz: float, nfft: int = 1024, window: str = "hann",
+             avg: str = "none", overlap: float = 0.5):
+    P, f = psd_arrays(x, fs_hz, fc_hz, nfft, window, avg, overlap)
+    peak_db, peak_f_hz = _peak(P, f)
+    return peak_db, peak_f_hz, P, f
+
+def compute_metrics(x: np.ndarray, fs_hz: float, fc_hz: float, nfft: int = 1024, window: str = "hann",
+                    avg: str = "none", overlap: float = 0.5, floor=None):
+    eng = get_engine(nfft, fs_hz, fc_hz, window)
+    P, f = _engine_psd(eng, x, avg, overlap), eng.freq
     avg_db = average_power_db(x)
-    peak_db, peak_f_hz, P, f = psd_peak(x, fs_hz, fc_hz, nfft)
-    floor_db = float(np.percentile(P, 10.0))
-    ratio = float(np.clip((peak_db - floor_db) / max(1.0, abs(floor_db)), 0.0, 1.0))
+    peak_db, peak_f_hz = _peak(P, f)
+    floor_db = float((floor or _DEFAULT_FLOOR)(P))
+    ratio = float(_ratio(peak_db, floor_db))
+    return MetricsResult(float(avg_db), float(peak_db), float(peak_f_hz), floor_db, ratio, P, f)
+
+def compute_metrics_batch(X: np.ndarray, fs_hz: float, fc_hz: float, nfft: int = 1024, window: str = "hann",
+                          floor=None):
+    X = np.asarray(X)
+    if X.ndim != 2:
+        raise ValueError("X must have shape (n_frames, n)")
+    eng = get_engine(nfft, fs_hz, fc_hz, window)
+    P = eng.psd_batch(X)
+    avg_db = 10.0 * np.log10(np.var(X, axis=1) + 1e-12)
+    i = np.argmax(P, axis=1)
+    peak_db = np.take_along_axis(P, i[:, None], axis=1)[:, 0]
+    floor_db = (floor or _DEFAULT_FLOOR).batch(P)
     return {
-        "average_power_db": float(avg_db),
-        "peak_power_db": float(peak_db),
-        "peak_freq_hz": float(peak_f_hz),
+        "average_power_db": avg_db,
+        "peak_power_db": peak_db,
+        "peak_freq_hz": eng.freq[i],
         "noise_floor_db": floor_db,
-        "signal_strength_ratio": ratio,
-        "psd_db": P.tolist(),
-        "psd_freq_hz": f.tolist(),
+        "signal_strength_ratio": _ratio(peak_db, floor_db),
     }
@@ -0,0 +1,35 @@
+import argparse
+import time
+import numpy as np
+
+def timeit(fn, reps):
+    fn()
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        fn()
+    return (time.perf_counter() - t0) / reps
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark estimator noise floor pada PSD mock")
+    p.add_argument("--rate", type=float, default=2.048e6)
+    p.add_argument("--nfft", type=int, nargs="+", default=[1024, 8192, 16384])
+    p.add_argument("--frames", type=int, default=200)
+    p.add_argument("--snr_db", type=float, default=10.0)
+    args = p.parse_args()
+
+    from sdr_signal.analysis.metrics import NOISE_FLOORS, get_engine
+    from sdr_signal.sources.mock_reader import gen_tone_noise
+
+    print(f"{'nfft':>6} {'estimator':>10} {'us/frame':>10} {'mean dB':>9} {'std dB':>8}")
+    for nfft in args.nfft:
+        eng = get_engine(nfft, args.rate, 0.0)
+        frames = [eng.psd(gen_tone_noise(nfft, args.rate, 100e3, args.snr_db)).copy() for _ in range(args.frames)]
+        for name, cls in NOISE_FLOORS.items():
+            est = cls()
+            vals = np.array([est(P) for P in frames])
+            est.reset()
+            dt = timeit(lambda: [est(P) for P in frames], 3) / len(frames)
+            print(f"{nfft:>6} {name:>10} {dt * 1e6:>10.1f} {vals.mean():>9.2f} {vals.std():>8.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,26 @@
 import argparse
 import json
+import os
 import time
 from pathlib import Path
 import numpy as np
-import sys
 
 def main():
     p = argparse.ArgumentParser()
-    p.add_argument("--device", choices=["rtl", "pluto"], required=True)
-    p.add_argument("--freq", type=float, required=True)
+    p.add_argument("--device", choices=["rtl", "pluto"], default=None)
+    p.add_argument("--freq", type=float, default=None)
     p.add_argument("--rate", type=float, default=2.048e6)
     p.add_argument("--gain", default="auto")
     p.add_argument("--n", type=int, default=1024 * 1024)
     p.add_argument("--nfft", type=int, default=1024)
+    p.add_argument("--window", choices=["hann", "hamming", "blackman", "rect"], default="hann")
+    p.add_argument("--avg", choices=["none", "welch"], default="none", help="welch: rata-rata segmen overlap dari seluruh capture")
+    p.add_argument("--overlap", type=float, default=0.5)
+    p.add_argument("--floor", choices=["partition", "percentile", "median", "streaming"], default="partition",
+                   help="estimator noise floor; streaming dihaluskan antar frame")
     p.add_argument("--plot", action="store_true")
-    p.add_argument("--out", default="/tmp/sdr_last.json")
+    p.add_argument("--out", default="/tmp/sdr_last.json", help="output JSON kompatibilitas; kosongkan untuk menonaktifkan")
+    p.add_argument("--shm", default=None, help="file telemetri biner (mmap); default /dev/shm/sdr_telemetry.bin, kosongkan untuk menonaktifkan")
     p.add_argument("--uri", default=None, help="URI untuk Pluto (mis. ip:192.168.2.1)")
     p.add_argument("--mock", action="store_true")
     p.add_argument("--tone_offset_hz", type=float, default=100e3)
@@ -22,120 +28,133 @@ def main():
     p.add_argument("--continuous", action="store_true")
     p.add_argument("--interval", type=float, default=0.5)
     p.add_argument("--iterations", type=int, default=None)
+    p.add_argument("--ring", type=int, default=8, help="jumlah slot frame pada ring buffer capture (continuous)")
+    p.add_argument("--record", default=None, help="simpan frame IQ mentah (complex64) + sidecar .jsonl ke path ini")
+    p.add_argument("--replay", default=None, help="putar ulang rekaman dari --record (tanpa hardware)")
+    p.add_argument("--replay_realtime", action="store_true", help="putar rekaman dengan kecepatan sampel asli")
     args = p.parse_args()
+    if not args.replay and (args.device is None or args.freq is None):
+        p.error("--device dan --freq wajib kecuali memakai --replay")
 
-    def once(x):
-        from sdr_signal.analysis.metrics import compute_metrics
-        m = compute_metrics(x, args.rate, args.freq, args.nfft)
+    from sdr_signal.analysis.metrics import compute_metrics, make_floor
+    from sdr_signal.sources.base import open_source
+    from sdr_signal.sources.capture import CaptureThread, FrameRing
+    from sdr_signal.sources.recording import IQRecorder
+    from sdr_signal.telemetry import DEFAULT_PATH, TelemetryWriter, monotonic_from_wall
+    floor = make_floor(args.floor)
+
+    def analyse(x):
+        return compute_metrics(x, args.rate, args.freq, args.nfft, args.window, args.avg, args.overlap, floor)
+
+    shm_path = DEFAULT_PATH if args.shm is None else args.shm
+    shm = TelemetryWriter(shm_path) if shm_path else None
+
+    def emit(metrics, timestamp, **extra):
         rec = {
-            "timestamp": time.time(),
+            "timestamp": timestamp,
+            # Recorded wall times have no meaning on this host's monotonic clock.
+            "t_mono": None if args.replay else monotonic_from_wall(timestamp),
             "device": args.device,
             "center_freq_hz": args.freq,
             "sample_rate_hz": args.rate,
-            **{k: m[k] for k in ["average_power_db", "peak_power_db", "peak_freq_hz", "noise_floor_db", "signal_strength_ratio"]},
+            **metrics,
+            **extra,
         }
         s = json.dumps(rec)
         print(s)
-        Path(args.out).write_text(s)
-        if args.plot and not args.continuous:
-            import matplotlib.pyplot as plt
-            P, f = m["psd_db"], m["psd_freq_hz"]
-            plt.figure()
-            plt.plot(np.asarray(f) / 1e6, P)
-            plt.xlabel("Frequency (MHz)")
-            plt.ylabel("Relative power (dB)")
-            plt.show()
+        if shm:
+            shm.write(rec)
+        if args.out:
+            tmp = Path(args.out + ".tmp")
+            tmp.write_text(s)
+            os.replace(tmp, args.out)
 
-    if not args.continuous:
-        if args.mock:
-            from sdr_signal.sources.mock_reader import gen_tone_noise
-            x = gen_tone_noise(args.n, args.rate, args.tone_offset_hz, args.snr_db)
-        else:
-            if args.device == "rtl":
-                from sdr_signal.sources.rtl_sdr_reader import read_samples
-                x = read_samples(args.freq, args.rate, args.gain, args.n)
-            else:
-                from sdr_signal.sources.pluto_reader import read_samples
-                gain_db = float(args.gain) if isinstance(args.gain, str) else args.gain
-                x = read_samples(args.freq, args.rate, gain_db, args.n, args.uri)
-        once(x)
-        return
+    src = open_source(args.device, args.freq, args.rate, args.gain, args.uri or "auto", args.mock,
+                      args.tone_offset_hz, args.snr_db, args.replay)
+    if args.replay:
+        src.realtime = args.replay_realtime
+        args.device = src.header.get("device") or src.device
+        args.freq, args.rate, args.gain = src.freq_hz, src.rate_hz, src.gain
+    rec = None
+    if args.record:
+        try:
+            rec = IQRecorder(args.record, args.rate, args.freq, args.gain, args.device)
+        except ValueError as e:
+            p.error(str(e))
 
-    it = 0
-    try:
-        if args.mock:
-            from sdr_signal.sources.mock_reader import gen_tone_noise
+    def live_frames():
+        # Capture runs in its own thread into a preallocated ring so no samples
+        # are lost while a frame is being analysed.
+        ring = FrameRing(args.ring, args.n)
+        cap = CaptureThread(src, ring).start()
+        try:
             while True:
-                x = gen_tone_noise(args.n, args.rate, args.tone_offset_hz, args.snr_db)
-                once(x)
-                it += 1
-                if args.iterations and it >= args.iterations:
-                    break
-                time.sleep(args.interval)
-        elif args.device == "rtl":
-            from rtlsdr import RtlSdr
-            sdr = RtlSdr()
-            sdr.sample_rate = args.rate
-            sdr.center_freq = args.freq
-            sdr.gain = args.gain
-            try:
-                while True:
-                    x = sdr.read_samples(args.n)
-                    x = np.asarray(x)
-                    once(x)
-                    it += 1
-                    if args.iterations and it >= args.iterations:
-                        break
-                    time.sleep(args.interval)
-            finally:
-                sdr.close()
-        else:
-            import adi
-            def open_pluto(uri):
-                if uri and uri != "auto":
-                    return adi.Pluto(uri=uri)
-                for u in ["ip:192.168.2.1", "ip:pluto.local", "usb", "local:"]:
-                    try:
-                        return adi.Pluto(uri=u)
-                    except Exception as e:
-                        print(f"Pluto connect failed: {u}: {e}", file=sys.stderr)
-                        continue
-                raise Exception("No Pluto device found")
-            sdr = open_pluto(args.uri if args.uri else "auto")
-            sdr.rx_lo = int(args.freq)
-            sdr.sample_rate = int(args.rate)
-            sdr.rx_hardwaregain = float(args.gain) if isinstance(args.gain, str) else args.gain
-            while True:
-                x = sdr.rx()
-                x = np.asarray(x).astype(np.complex64)
-                if len(x) >= args.n:
-                    x = x[:args.n]
-                once(x)
-                it += 1
-                if args.iterations and it >= args.iterations:
-                    break
-                time.sleep(args.interval)
-    except KeyboardInterrupt:
-        pass
+                fr = ring.get(timeout=1.0)
+                if fr is None:
+                    if not cap.alive:
+                        if cap.error:
+                            raise cap.error
+                        return
+                    continue
+                yield fr.samples, fr.timestamp, fr.seq, cap.counters()
+        finally:
+            cap.stop()
+
+    def replay_frames():
+        for seq, (x, t) in enumerate(src.frames(args.n)):
+            yield x, t, seq, {}
 
-    from sdr_signal.analysis.metrics import compute_metrics, psd_arrays
-    m = compute_metrics(x, args.rate, args.freq, args.nfft)
-    rec = {
-        "timestamp": time.time(),
-        "device": args.device,
-        "center_freq_hz": args.freq,
-        "sample_rate_hz": args.rate,
-        **{k: m[k] for k in ["average_power_db", "peak_power_db", "peak_freq_hz", "noise_floor_db", "signal_strength_ratio"]},
-    }
-    s = json.dumps(rec)
-    print(s)
-    Path(args.out).write_text(s)
+    m = None
+    try:
+        with src:
+            if not args.continuous:
+                buf = np.empty(args.n, dtype=np.complex64)
+                k = src.read_into(buf)
+                if rec:
+                    rec.write(buf[:k])
+                m = analyse(buf[:k])
+                emit(m.to_dict(), src.timestamp_at(0) if args.replay else time.time())
+            else:
+                # Every frame is analysed; once per interval (in capture time) the
+                # strongest one is emitted so short bursts between outputs are not missed.
+                frames = replay_frames() if args.replay else live_frames()
+                best = None
+                last = None
+                counters = {}
+                it = 0
+                try:
+                    for x, t, seq, counters in frames:
+                        if rec:
+                            rec.write(x, t)
+                        m = analyse(x)
+                        if best is None or m.peak_power_db > best[0]["peak_power_db"]:
+                            best = (m.to_dict(), t, seq)
+                        if last is None:
+                            last = t
+                        if t - last >= args.interval:
+                            emit(best[0], best[1], frame_seq=best[2], **counters)
+                            best = None
+                            last = t
+                            it += 1
+                            if args.iterations and it >= args.iterations:
+                                break
+                except KeyboardInterrupt:
+                    pass
+                finally:
+                    frames.close()
+                # The last, partial interval (e.g. the end of a replay).
+                if best is not None:
+                    emit(best[0], best[1], frame_seq=best[2], **counters)
+    finally:
+        if rec:
+            rec.close()
+        if shm:
+            shm.close()
 
-    if args.plot:
+    if args.plot and m is not None:
         import matplotlib.pyplot as plt
-        P, f = m["psd_db"], m["psd_freq_hz"]
         plt.figure()
-        plt.plot(np.asarray(f) / 1e6, P)
+        plt.plot(m.freq / 1e6, m.psd)
         plt.xlabel("Frequency (MHz)")
         plt.ylabel("Relative power (dB)")
         plt.show()
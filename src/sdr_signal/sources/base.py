@@ -0,0 +1,105 @@
+import numpy as np
+
+def parse_gain(gain):
+    if gain is None or (isinstance(gain, str) and gain.lower() == "auto"):
+        return "auto"
+    return float(gain)
+
+class SampleSource:
+    """Opened once, then read repeatedly into caller-owned buffers.
+
+    Subclasses implement _open, _close, _read_into and _retune. read_into fills
+    as much of `buf` as one device read allows and returns the sample count;
+    0 means the source is exhausted (recordings).
+    """
+
+    device = "none"
+
+    def __init__(self, freq_hz: float, rate_hz: float, gain="auto"):
+        self.freq_hz = float(freq_hz)
+        self.rate_hz = float(rate_hz)
+        self.gain = parse_gain(gain)
+        self.is_open = False
+
+    def open(self):
+        if not self.is_open:
+            self._open()
+            self.is_open = True
+        return self
+
+    def close(self):
+        if self.is_open:
+            self.is_open = False
+            self._close()
+
+    def read_into(self, buf: np.ndarray) -> int:
+        if not self.is_open:
+            self.open()
+        return self._read_into(buf)
+
+    def read(self, n: int) -> np.ndarray:
+        buf = np.empty(n, dtype=np.complex64)
+        k = 0
+        while k < n:
+            r = self.read_into(buf[k:])
+            if r == 0:
+                break
+            k += r
+        return buf[:k]
+
+    def stream(self, ring, stop_event, on_samples=None):
+        while not stop_event.is_set():
+            slot = ring.acquire()
+            buf = ring.buf[slot]
+            k = 0
+            while k < len(buf) and not stop_event.is_set():
+                r = self._read_into(buf[k:])
+                if r == 0:
+                    break
+                k += r
+                if on_samples:
+                    on_samples(r)
+            if k:
+                ring.commit(slot, k)
+            if k < len(buf):
+                return
+
+    def retune(self, freq_hz: float):
+        self.freq_hz = float(freq_hz)
+        if self.is_open:
+            self._retune(self.freq_hz)
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def _open(self):
+        pass
+
+    def _close(self):
+        pass
+
+    def _retune(self, freq_hz: float):
+        pass
+
+    def _read_into(self, buf: np.ndarray) -> int:
+        raise NotImplementedError
+
+def open_source(device: str, freq_hz: float, rate_hz: float, gain="auto", uri=None, mock=False,
+                tone_offset_hz: float = 100e3, snr_db: float = 20.0, replay=None) -> SampleSource:
+    if replay:
+        from sdr_signal.sources.recording import ReplaySource
+        return ReplaySource(replay)
+    if mock:
+        from sdr_signal.sources.mock_reader import MockSource
+        return MockSource(freq_hz, rate_hz, tone_offset_hz, snr_db)
+    if device == "rtl":
+        from sdr_signal.sources.rtl_sdr_reader import RtlSource
+        return RtlSource(freq_hz, rate_hz, gain)
+    if device == "pluto":
+        from sdr_signal.sources.pluto_reader import PlutoSource
+        return PlutoSource(freq_hz, rate_hz, gain, uri)
+    raise ValueError(f"unknown device: {device}")
@@ -0,0 +1,123 @@
+import threading
+import time
+from collections import deque
+import numpy as np
+
+class Frame:
+    __slots__ = ("seq", "slot", "samples", "timestamp")
+
+    def __init__(self, seq, slot, samples, timestamp):
+        self.seq = seq
+        self.slot = slot
+        self.samples = samples
+        self.timestamp = timestamp
+
+class FrameRing:
+    """Preallocated frame slots shared by one capture thread and one consumer.
+
+    The producer fills a free slot and commits it. When the consumer falls
+    behind and no slot is free, the oldest queued frame is reused and counted
+    in `dropped`; the slot the consumer is holding is never touched.
+    """
+
+    def __init__(self, slots: int, frame_len: int, dtype=np.complex64):
+        if slots < 3:
+            raise ValueError("FrameRing needs at least 3 slots")
+        self.frame_len = int(frame_len)
+        self.buf = np.empty((slots, self.frame_len), dtype=dtype)
+        self._free = deque(range(slots))
+        self._queue = deque()
+        self._held = None
+        self._cond = threading.Condition()
+        self.seq = 0
+        self.captured = 0
+        self.dropped = 0
+        self.closed = False
+
+    def acquire(self) -> int:
+        with self._cond:
+            if self._free:
+                return self._free.popleft()
+            self.dropped += 1
+            return self._queue.popleft().slot
+
+    def commit(self, slot: int, k: int, timestamp: float | None = None):
+        with self._cond:
+            self._queue.append(Frame(self.seq, slot, self.buf[slot, :k], time.time() if timestamp is None else timestamp))
+            self.seq += 1
+            self.captured += 1
+            self._cond.notify()
+
+    def release(self):
+        with self._cond:
+            if self._held is not None:
+                self._free.append(self._held)
+                self._held = None
+
+    def get(self, timeout: float | None = None) -> Frame | None:
+        with self._cond:
+            if self._held is not None:
+                self._free.append(self._held)
+                self._held = None
+            if not self._queue and not self.closed:
+                self._cond.wait(timeout)
+            if not self._queue:
+                return None
+            fr = self._queue.popleft()
+            self._held = fr.slot
+            return fr
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    @property
+    def pending(self) -> int:
+        return len(self._queue)
+
+class CaptureThread:
+    """Streams a SampleSource into a FrameRing until stop() is called.
+
+    `overruns` is the number of frames the ring overwrote before the
+    consumer read them.
+    """
+
+    def __init__(self, source, ring: FrameRing):
+        self.source = source
+        self.ring = ring
+        self.stop_event = threading.Event()
+        self.error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 2.0):
+        self.stop_event.set()
+        self._thread.join(timeout)
+
+    @property
+    def alive(self) -> bool:
+        return self._thread.is_alive()
+
+    @property
+    def overruns(self) -> int:
+        return self.ring.dropped
+
+    def counters(self) -> dict:
+        return {
+            "frames_captured": self.ring.captured,
+            "frames_dropped": self.ring.dropped,
+            "overruns": self.overruns,
+        }
+
+    def _run(self):
+        try:
+            self.source.open()
+            self.source.stream(self.ring, self.stop_event)
+        except Exception as e:
+            self.error = e
+        finally:
+            self.ring.close()
@@ -1,4 +1,6 @@
+import time
 import numpy as np
+from sdr_signal.sources.base import SampleSource
 
 def gen_tone_noise(n: int, fs_hz: float, tone_offset_hz: float = 100e3, snr_db: float = 20.0):
     t = np.arange(n, dtype=np.float32) / float(fs_hz)
@@ -6,3 +8,38 @@ def gen_tone_noise(n: int, fs_hz: float, tone_offset_hz: float = 100e3, snr_db:
     tone = a_sig * np.exp(1j * 2.0 * np.pi * tone_offset_hz * t)
     noise = (np.random.randn(n).astype(np.float32) + 1j * np.random.randn(n).astype(np.float32))
     return tone + noise
+
+class MockSource(SampleSource):
+    device = "mock"
+
+    def __init__(self, freq_hz: float, rate_hz: float, tone_offset_hz: float = 100e3, snr_db: float = 20.0):
+        super().__init__(freq_hz, rate_hz)
+        self.tone_offset_hz = tone_offset_hz
+        self.snr_db = snr_db
+        self._n = 0
+        self._rng = np.random.default_rng()
+
+    def _read_into(self, buf: np.ndarray) -> int:
+        n = len(buf)
+        t = (self._n + np.arange(n)) / self.rate_hz
+        self._n += n
+        buf[:] = 10.0 ** (self.snr_db / 20.0) * np.exp(1j * 2.0 * np.pi * self.tone_offset_hz * t)
+        v = buf.view(buf.real.dtype)
+        v += self._rng.standard_normal(2 * n, dtype=v.dtype)
+        return n
+
+    def stream(self, ring, stop_event, on_samples=None):
+        # Paced to the nominal sample rate so ring/overrun behaviour matches a device.
+        t0 = time.monotonic()
+        sent = 0
+
+        def paced(k):
+            nonlocal sent
+            sent += k
+            d = t0 + sent / self.rate_hz - time.monotonic()
+            if d > 0:
+                stop_event.wait(d)
+            if on_samples:
+                on_samples(k)
+
+        super().stream(ring, stop_event, paced)
@@ -1,13 +1,78 @@
+import sys
 import numpy as np
 import adi
+from sdr_signal.sources.base import SampleSource
+
+PLUTO_URIS = ["ip:192.168.2.1", "ip:pluto.local", "usb", "local:"]
+
+def open_pluto(uri=None):
+    if uri is None:
+        return adi.Pluto()
+    if uri != "auto":
+        return adi.Pluto(uri=uri)
+    for u in PLUTO_URIS:
+        try:
+            return adi.Pluto(uri=u)
+        except Exception as e:
+            print(f"Pluto connect failed: {u}: {e}", file=sys.stderr)
+            continue
+    raise Exception("No Pluto device found")
+
+class PlutoSource(SampleSource):
+    device = "pluto"
+
+    def __init__(self, freq_hz: float, rate_hz: float, gain="auto", uri: str | None = None):
+        super().__init__(freq_hz, rate_hz, gain)
+        self.uri = uri
+        self._sdr = None
+        self._bufsize = 0
+
+    def _open(self):
+        sdr = open_pluto(self.uri)
+        sdr.rx_lo = int(self.freq_hz)
+        sdr.sample_rate = int(self.rate_hz)
+        if self.gain == "auto":
+            sdr.gain_control_mode_chan0 = "slow_attack"
+        else:
+            sdr.gain_control_mode_chan0 = "manual"
+            sdr.rx_hardwaregain_chan0 = self.gain
+        self._sdr = sdr
+
+    def _close(self):
+        try:
+            self._sdr.rx_destroy_buffer()
+        except Exception:
+            pass
+        self._sdr = None
+        self._bufsize = 0
+
+    def _retune(self, freq_hz: float):
+        self._sdr.rx_lo = int(freq_hz)
+
+    def _read_into(self, buf: np.ndarray) -> int:
+        n = len(buf)
+        if n != self._bufsize:
+            # The libiio buffer is sized on first rx(); resizing means recreating it.
+            if self._bufsize:
+                self._sdr.rx_destroy_buffer()
+            self._sdr.rx_buffer_size = n
+            self._bufsize = n
+        x = self._sdr.rx()
+        k = min(n, len(x))
+        np.copyto(buf[:k], x[:k], casting="unsafe")
+        return k
+
+    def stream(self, ring, stop_event, on_samples=None, kernel_buffers: int = 4):
+        # More libiio kernel buffers let the DMA keep filling while a frame is analysed.
+        if self._bufsize:
+            self._sdr.rx_destroy_buffer()
+            self._bufsize = 0
+        try:
+            self._sdr._rxadc.set_kernel_buffers_count(kernel_buffers)
+        except Exception as e:
+            print(f"Pluto kernel buffers not set: {e}", file=sys.stderr)
+        super().stream(ring, stop_event, on_samples)
 
 def read_samples(freq_hz: float, rate_hz: float, gain_db: float, n: int, uri: str | None = None) -> np.ndarray:
-    sdr = adi.Pluto(uri=uri) if uri else adi.Pluto()
-    sdr.rx_lo = int(freq_hz)
-    sdr.sample_rate = int(rate_hz)
-    sdr.rx_hardwaregain = gain_db
-    x = sdr.rx()
-    x = np.asarray(x).astype(np.complex64)
-    if len(x) >= n:
-        return x[:n]
-    return x
+    with PlutoSource(freq_hz, rate_hz, gain_db, uri) as src:
+        return src.read(n)
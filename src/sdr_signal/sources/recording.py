@@ -0,0 +1,160 @@
+import json
+import os
+import time
+import numpy as np
+from sdr_signal.sources.base import SampleSource, parse_gain
+
+# A recording is raw complex64 samples in `path` plus a JSON-lines sidecar
+# `path + ".jsonl"`: one header line, then one line per appended frame.
+SIDECAR_SUFFIX = ".jsonl"
+FORMAT_VERSION = 1
+
+def sidecar_path(path: str) -> str:
+    return str(path) + SIDECAR_SUFFIX
+
+def read_sidecar(path: str):
+    header = None
+    frames = []
+    with open(sidecar_path(path), "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            d = json.loads(line)
+            if header is None:
+                header = d
+            else:
+                frames.append(d)
+    if header is None:
+        raise ValueError(f"empty sidecar: {sidecar_path(path)}")
+    return header, frames
+
+def _same_setup(header, rate_hz, freq_hz, gain, device):
+    return (header.get("dtype") == "complex64" and header.get("sample_rate_hz") == float(rate_hz)
+            and header.get("center_freq_hz") == float(freq_hz)
+            and parse_gain(header.get("gain")) == parse_gain(gain) and header.get("device", "") == device)
+
+class IQRecorder:
+    """Appends to an existing recording only if it was made with the same
+    rate, frequency, gain and device; anything else raises ValueError."""
+
+    def __init__(self, path: str, rate_hz: float, freq_hz: float, gain="auto", device: str = ""):
+        self.path = str(path)
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        new = not os.path.exists(sidecar_path(self.path)) or size == 0
+        if not new and not _same_setup(read_sidecar(self.path)[0], rate_hz, freq_hz, gain, device):
+            raise ValueError(f"{self.path} was recorded with different settings; use a new file")
+        self._f = open(self.path, "ab")
+        self.offset = size // np.dtype(np.complex64).itemsize
+        self._meta = open(sidecar_path(self.path), "w" if new else "a")
+        if new:
+            self._line({
+                "version": FORMAT_VERSION,
+                "dtype": "complex64",
+                "sample_rate_hz": float(rate_hz),
+                "center_freq_hz": float(freq_hz),
+                "gain": gain,
+                "device": device,
+                "created": time.time(),
+            })
+        self.frames = 0
+
+    def _line(self, d):
+        self._meta.write(json.dumps(d) + "\n")
+        self._meta.flush()
+
+    def write(self, x: np.ndarray, timestamp: float | None = None):
+        x = np.asarray(x, dtype=np.complex64)
+        x.tofile(self._f)
+        self._f.flush()
+        self._line({"offset": self.offset, "n": len(x), "timestamp": time.time() if timestamp is None else timestamp})
+        self.offset += len(x)
+        self.frames += 1
+
+    def close(self):
+        self._f.close()
+        self._meta.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+class ReplaySource(SampleSource):
+    """Serves a recording through np.memmap.
+
+    read_into copies like a device would; frames() yields zero-copy views for
+    callers that can analyse in place. Runs as fast as possible unless
+    `realtime` is set.
+    """
+
+    device = "replay"
+
+    def __init__(self, path: str, loop: bool = False, realtime: bool = False):
+        header, frames = read_sidecar(path)
+        super().__init__(header["center_freq_hz"], header["sample_rate_hz"], header.get("gain", "auto"))
+        self.path = str(path)
+        self.header = header
+        self.loop = loop
+        self.realtime = realtime
+        self._offsets = np.array([fr["offset"] for fr in frames], dtype=np.int64)
+        self._stamps = np.array([fr["timestamp"] for fr in frames], dtype=np.float64)
+        self._mm = None
+        self.pos = 0
+        self._t0 = None
+
+    @property
+    def n_samples(self) -> int:
+        return os.path.getsize(self.path) // np.dtype(np.complex64).itemsize
+
+    def _open(self):
+        self._mm = np.memmap(self.path, dtype=np.complex64, mode="r")
+        self.pos = 0
+
+    def _close(self):
+        self._mm = None
+
+    def _pace(self, k: int):
+        if not self.realtime:
+            return
+        if self._t0 is None:
+            self._t0 = time.monotonic() - self.pos / self.rate_hz
+        d = self._t0 + (self.pos + k) / self.rate_hz - time.monotonic()
+        if d > 0:
+            time.sleep(d)
+
+    def timestamp_at(self, offset: int) -> float:
+        if not len(self._offsets):
+            return self.header.get("created", 0.0) + offset / self.rate_hz
+        i = max(0, int(np.searchsorted(self._offsets, offset, side="right")) - 1)
+        return float(self._stamps[i] + (offset - self._offsets[i]) / self.rate_hz)
+
+    def view(self, n: int):
+        if self.pos >= len(self._mm):
+            if not self.loop or not len(self._mm):
+                return None
+            self.pos = 0
+            self._t0 = None
+        x = self._mm[self.pos:self.pos + n]
+        self._pace(len(x))
+        self.pos += len(x)
+        return x
+
+    def frames(self, n: int):
+        if not self.is_open:
+            self.open()
+        while True:
+            start = self.pos
+            x = self.view(n)
+            if x is None:
+                return
+            yield x, self.timestamp_at(start)
+
+    def _read_into(self, buf: np.ndarray) -> int:
+        x = self.view(len(buf))
+        if x is None:
+            return 0
+        np.copyto(buf[:len(x)], x)
+        return len(x)
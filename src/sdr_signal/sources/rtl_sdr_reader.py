@@ -1,11 +1,70 @@
 import numpy as np
 from rtlsdr import RtlSdr
+from sdr_signal.sources.base import SampleSource
+
+class RtlSource(SampleSource):
+    device = "rtl"
+
+    def __init__(self, freq_hz: float, rate_hz: float, gain="auto"):
+        super().__init__(freq_hz, rate_hz, gain)
+        self._sdr = None
+
+    def _open(self):
+        sdr = RtlSdr()
+        sdr.sample_rate = self.rate_hz
+        sdr.center_freq = self.freq_hz
+        sdr.gain = self.gain
+        self._sdr = sdr
+
+    def _close(self):
+        self._sdr.close()
+        self._sdr = None
+
+    def _retune(self, freq_hz: float):
+        self._sdr.center_freq = freq_hz
+
+    def _read_into(self, buf: np.ndarray) -> int:
+        # Raw interleaved uint8 I/Q maps 1:1 onto the float view of a complex buffer,
+        # so the conversion writes straight into `buf` without a complex128 temporary.
+        n = len(buf)
+        raw = np.frombuffer(self._sdr.read_bytes(2 * n), dtype=np.uint8)
+        k = len(raw) // 2
+        v = buf.view(buf.real.dtype)[:2 * k]
+        np.subtract(raw[:2 * k], 127.5, out=v, casting="unsafe")
+        v *= 1.0 / 127.5
+        return k
+
+    def stream(self, ring, stop_event, on_samples=None, chunk: int = 65536):
+        # librtlsdr async read: USB transfers stay queued while frames are analysed,
+        # so there is no gap between consecutive frames.
+        slot = ring.acquire()
+        off = 0
+
+        def on_bytes(data, context):
+            nonlocal slot, off
+            if stop_event.is_set():
+                self._sdr.cancel_read_async()
+                return
+            raw = np.frombuffer(data, dtype=np.uint8)
+            n = len(raw) // 2
+            i = 0
+            while i < n:
+                dst = ring.buf[slot]
+                k = min(n - i, len(dst) - off)
+                v = dst.view(dst.real.dtype)[2 * off:2 * (off + k)]
+                np.subtract(raw[2 * i:2 * (i + k)], 127.5, out=v, casting="unsafe")
+                v *= 1.0 / 127.5
+                i += k
+                off += k
+                if off == len(dst):
+                    ring.commit(slot, off)
+                    slot = ring.acquire()
+                    off = 0
+            if on_samples:
+                on_samples(n)
+
+        self._sdr.read_bytes_async(on_bytes, num_bytes=2 * chunk)
 
 def read_samples(freq_hz: float, rate_hz: float, gain, n: int) -> np.ndarray:
-    sdr = RtlSdr()
-    sdr.sample_rate = rate_hz
-    sdr.center_freq = freq_hz
-    sdr.gain = gain
-    x = sdr.read_samples(n)
-    sdr.close()
-    return np.asarray(x)
+    with RtlSource(freq_hz, rate_hz, gain) as src:
+        return src.read(n)
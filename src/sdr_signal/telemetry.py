@@ -0,0 +1,135 @@
+import math
+import mmap
+import os
+import struct
+import tempfile
+import time
+import zlib
+
+# Fixed-layout record shared through a memory-mapped file. The writer bumps
+# `seq` to an odd value, writes the payload, then bumps it to the next even
+# value; a reader accepts a copy only if it saw the same even `seq` before and
+# after copying (seqlock), so it never returns a half-written record.
+#
+# Python has no memory barriers, and on weakly ordered CPUs (the Pi's ARM
+# cores) another process may see the new `seq` before the payload bytes it
+# guards. The header therefore also carries a CRC-32 of the payload, and the
+# reader only accepts a copy whose CRC matches; a torn copy is retried.
+#
+# Between writers (before the first write and after close()) `seq` is left
+# odd, so readers get None rather than a record from a writer that is gone.
+# A new writer continues the sequence, so a reader's last seq never repeats.
+MAGIC = b"SDRT"
+VERSION = 2
+HEADER = struct.Struct("<4sIQI")
+FLOAT_FIELDS = (
+    "timestamp",
+    "t_mono",
+    "center_freq_hz",
+    "sample_rate_hz",
+    "average_power_db",
+    "peak_power_db",
+    "peak_freq_hz",
+    "noise_floor_db",
+    "signal_strength_ratio",
+)
+INT_FIELDS = ("frame_seq", "frames_captured", "frames_dropped", "overruns")
+PAYLOAD = struct.Struct("<" + "d" * len(FLOAT_FIELDS) + "q" * len(INT_FIELDS) + "16s")
+SIZE = HEADER.size + PAYLOAD.size
+
+def _default_path():
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, "sdr_telemetry.bin")
+
+DEFAULT_PATH = _default_path()
+
+class TelemetryWriter:
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+        # Opened in place (never unlinked) so readers that already mapped the file keep seeing updates.
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size < SIZE:
+                os.ftruncate(fd, SIZE)
+            self._mm = mmap.mmap(fd, SIZE)
+        finally:
+            os.close(fd)
+        magic, version, seq, crc = HEADER.unpack_from(self._mm, 0)
+        self._seq = seq + (seq & 1) if magic == MAGIC and version == VERSION else 0
+        HEADER.pack_into(self._mm, 0, MAGIC, VERSION, self._seq + 1, 0)
+
+    def write(self, rec: dict):
+        vals = [math.nan if rec.get(k) is None else float(rec[k]) for k in FLOAT_FIELDS]
+        vals += [int(rec.get(k, -1)) for k in INT_FIELDS]
+        vals.append(str(rec.get("device", "")).encode("ascii", "ignore")[:16])
+        payload = PAYLOAD.pack(*vals)
+        self._seq += 1
+        HEADER.pack_into(self._mm, 0, MAGIC, VERSION, self._seq, 0)
+        self._mm[HEADER.size:SIZE] = payload
+        self._seq += 1
+        HEADER.pack_into(self._mm, 0, MAGIC, VERSION, self._seq, zlib.crc32(payload))
+
+    def close(self):
+        HEADER.pack_into(self._mm, 0, MAGIC, VERSION, self._seq + 1, 0)
+        self._mm.close()
+
+class TelemetryReader:
+    """Returns the latest record as a dict with the same keys as the JSON output.
+
+    Fields the writer did not have (NaN / -1) are left out.
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH, retries: int = 100):
+        self.path = path
+        self.retries = retries
+        self.seq = 0
+        self._mm = None
+
+    def _map(self):
+        if self._mm is None:
+            try:
+                with open(self.path, "rb") as f:
+                    if os.fstat(f.fileno()).st_size < SIZE:
+                        return None
+                    self._mm = mmap.mmap(f.fileno(), SIZE, access=mmap.ACCESS_READ)
+            except OSError:
+                return None
+        return self._mm
+
+    def read(self):
+        mm = self._map()
+        if mm is None:
+            return None
+        for _ in range(self.retries):
+            magic, version, s1, crc = HEADER.unpack_from(mm, 0)
+            if magic != MAGIC or version != VERSION or s1 == 0:
+                return None
+            if s1 & 1:
+                continue
+            payload = mm[HEADER.size:SIZE]
+            if HEADER.unpack_from(mm, 0)[2] == s1 and zlib.crc32(payload) == crc:
+                self.seq = s1
+                return _decode(PAYLOAD.unpack(payload))
+        return None
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+def _decode(vals):
+    rec = {}
+    nf = len(FLOAT_FIELDS)
+    for k, v in zip(FLOAT_FIELDS, vals[:nf]):
+        if not math.isnan(v):
+            rec[k] = v
+    for k, v in zip(INT_FIELDS, vals[nf:nf + len(INT_FIELDS)]):
+        if v >= 0:
+            rec[k] = v
+    dev = vals[-1].rstrip(b"\0").decode("ascii", "ignore")
+    if dev:
+        rec["device"] = dev
+    return rec
+
+def monotonic_from_wall(timestamp: float) -> float:
+    return time.monotonic() - (time.time() - timestamp)
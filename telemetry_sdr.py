@@ -1,21 +1,36 @@
 import json
+import math
 import os
+import sys
 import time
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from sdr_signal.telemetry import DEFAULT_PATH, TelemetryReader
+
 class TelemetrySDR:
-    def __init__(self, path="/tmp/sdr_last.json", interval=0.5):
+    # A shm record whose t_mono is older than `max_age` seconds (writer killed
+    # without closing) is ignored and the JSON file is used instead.
+    def __init__(self, path="/tmp/sdr_last.json", interval=0.5, shm_path=DEFAULT_PATH, max_age=5.0):
         self.path = path
         self.interval = interval
+        self.max_age = max_age
         self.last = {}
         self._last_t = 0.0
+        self._reader = TelemetryReader(shm_path) if shm_path else None
 
     def poll(self):
         t = time.time()
         if t - self._last_t < self.interval:
             return self.last
         self._last_t = t
+        if self._reader:
+            rec = self._reader.read()
+            if rec is not None and time.monotonic() - rec.get("t_mono", math.inf) <= self.max_age:
+                self.last = rec
+                return self.last
         try:
-            if os.path.exists(self.path):
+            if self.path and os.path.exists(self.path):
                 s = open(self.path, "r").read()
                 self.last = json.loads(s)
         except Exception:
@@ -0,0 +1,79 @@
+import time
+
+from arbiter import TargetArbiter
+from rotctl_server import RIG_ERJCTED, RotctlSession, _ProtocolConfig
+
+class FakeController:
+    def __init__(self):
+        self.targets = []
+        self.stops = 0
+
+    def set_target(self, az, el):
+        self.targets.append((az, el))
+
+    def get_position(self):
+        return 0.0, 0.0
+
+    def stop(self):
+        self.stops += 1
+
+def wait_for(cond, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not cond() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return cond()
+
+def test_targets_within_a_window_are_coalesced_to_the_latest():
+    ctrl = FakeController()
+    arb = TargetArbiter(ctrl, window=0.2, deadband=0.0)
+    for az in (1.0, 2.0, 3.0, 4.0):
+        assert arb.submit("c1", az, 10.0)
+    assert ctrl.targets == [(1.0, 10.0)]
+    assert wait_for(lambda: len(ctrl.targets) == 2)
+    time.sleep(0.25)
+    assert ctrl.targets == [(1.0, 10.0), (4.0, 10.0)]
+    s = arb.stats()
+    assert (s["received"], s["applied"], s["coalesced"]) == (4, 2, 2)
+
+def test_dead_band_drops_small_changes_across_the_wrap():
+    ctrl = FakeController()
+    arb = TargetArbiter(ctrl, window=0.0, deadband=0.5)
+    for az, el in ((179.9, 10.0), (-179.9, 10.2), (179.5, 10.0), (179.0, 10.0), (179.0, 10.6)):
+        arb.submit("c1", az, el)
+    assert ctrl.targets == [(179.9, 10.0), (179.0, 10.0), (179.0, 10.6)]
+    assert arb.stats()["suppressed"] == 2
+
+def test_only_the_owner_may_set_or_stop_until_release_or_timeout():
+    ctrl = FakeController()
+    arb = TargetArbiter(ctrl, window=0.0, deadband=0.0, owner_timeout=0.1)
+    assert arb.submit("c1", 1.0, 1.0)
+    assert not arb.submit("c2", 2.0, 2.0)
+    assert not arb.stop("c2")
+    assert ctrl.stops == 0 and arb.stats()["owner"] == "c1"
+    assert arb.stop("c1") and ctrl.stops == 1
+    arb.release("c2")
+    assert arb.stats()["owner"] == "c1"
+    arb.release("c1")
+    assert arb.submit("c2", 2.0, 2.0)
+    time.sleep(0.15)
+    assert arb.stop("c1") and ctrl.stops == 2
+    assert arb.submit("c1", 3.0, 3.0)
+    assert ctrl.targets == [(1.0, 1.0), (2.0, 2.0), (3.0, 3.0)]
+    assert arb.stats()["rejected"] == 2
+
+def test_stop_after_stop_forgets_the_applied_target():
+    ctrl = FakeController()
+    arb = TargetArbiter(ctrl, window=0.0, deadband=1.0)
+    arb.submit("c1", 5.0, 5.0)
+    arb.stop("c1")
+    arb.submit("c1", 5.0, 5.0)
+    assert ctrl.targets == [(5.0, 5.0), (5.0, 5.0)]
+
+def test_rotctl_stop_from_another_client_is_rejected():
+    ctrl = FakeController()
+    cfg = _ProtocolConfig(ctrl, arbiter=TargetArbiter(ctrl, window=0.0))
+    owner, other = RotctlSession(cfg, "c1"), RotctlSession(cfg, "c2")
+    assert owner.feed(b"P 1 2\n")[0] == b"RPRT 0\n"
+    assert other.feed(b"S\nR 0\n")[0] == f"RPRT {RIG_ERJCTED}\nRPRT {RIG_ERJCTED}\n".encode()
+    assert owner.feed(b"S\n")[0] == b"RPRT 0\n"
+    assert ctrl.stops == 1
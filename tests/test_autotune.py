@@ -0,0 +1,93 @@
+import math
+from bisect import bisect_right
+
+import numpy as np
+import pytest
+
+from gimbal import autotune
+from gimbal.gain_schedule import load_schedules
+from gimbal.sim import SimPlant, VirtualClock
+
+class DelayedIntegrator:
+    # y' = gain * u(t - delay): a relay sampled every `period` sees a total
+    # delay L = delay + period and gives an exact limit cycle of period 4 * L
+    # and amplitude relay * gain * L.
+
+    def __init__(self, clock, gain=1.0, delay=0.2, h=1e-3):
+        self.clock = clock
+        self.gain = gain
+        self.delay = delay
+        self.h = h
+        self.y = [0.0, 0.0]
+        self.t = clock.monotonic()
+        self._ts = [-math.inf]
+        self._us = [(0.0, 0.0)]
+
+    def _advance(self):
+        now = self.clock.monotonic()
+        while self.t < now - 1e-12:
+            h = min(self.h, now - self.t)
+            u = self._us[bisect_right(self._ts, self.t - self.delay + 1e-12) - 1]
+            self.y = [y + self.gain * v * h for y, v in zip(self.y, u)]
+            self.t += h
+
+    def read(self):
+        self._advance()
+        return tuple(self.y)
+
+    def drive(self, az, el):
+        self._advance()
+        self._ts.append(self.clock.monotonic())
+        self._us.append((az, el))
+
+    def stop(self):
+        self.drive(0.0, 0.0)
+
+@pytest.mark.parametrize("axis", ["az", "el"])
+def test_relay_identifies_the_ultimate_point_of_a_known_plant(axis):
+    clock = VirtualClock()
+    plant = DelayedIntegrator(clock, gain=0.5, delay=0.2)
+    r = autotune.relay_test(plant, plant, clock, axis, relay=20.0, hysteresis=0.01, cycles=4, period=0.02)
+    lag = 0.2 + 0.02
+    assert r.tu == pytest.approx(4 * lag, rel=0.02)
+    assert r.amplitude == pytest.approx(20.0 * 0.5 * lag, rel=0.02)
+    assert r.ku == pytest.approx(4.0 * 20.0 / (math.pi * r.amplitude))
+    assert plant._us[-1] == (0.0, 0.0)
+
+def test_relay_on_sim_plant_is_reproducible():
+    runs = []
+    for _ in range(2):
+        clock = VirtualClock()
+        plant = SimPlant(clock, start=autotune.START["az"])
+        runs.append(autotune.relay_test(plant, plant, clock, "az"))
+    assert runs[0] == runs[1]
+    assert runs[0].ku > 0 and 0.05 < runs[0].tu < 5.0
+    kp, ki, kd = autotune.seed_gains(runs[0])
+    assert kp == pytest.approx(0.2 * runs[0].ku) and kd == pytest.approx(kp * runs[0].tu / 3.0)
+
+def test_relay_without_oscillation_times_out():
+    clock = VirtualClock()
+    plant = DelayedIntegrator(clock, gain=0.0)
+    with pytest.raises(RuntimeError):
+        autotune.relay_test(plant, plant, clock, "az", timeout=2.0)
+
+def test_step_metrics():
+    t = np.arange(0.0, 12.0, 0.1)
+    err = np.where(t < autotune.T_STEP, 10.0, 10.0 * np.exp(-(t - autotune.T_STEP)) - 0.3)
+    m = autotune.step_metrics(t, err)
+    assert m["overshoot"] == pytest.approx(0.3, abs=0.02)
+    assert m["settle"] == pytest.approx(math.log(10.0 / 0.8), abs=0.1)
+    assert m["final"] == pytest.approx(0.3, abs=0.02)
+    assert autotune.step_metrics(t, np.full_like(t, 2.0))["settle"] == math.inf
+    assert autotune.step_metrics(t, np.zeros_like(t))["settle"] == 0.0
+
+def test_sweep_returns_the_best_candidate_reproducibly():
+    schedules = load_schedules()
+    grid = {"kp_factors": (0.5, 1.0), "ki_factors": (1.0,), "kd_factors": (1.0,)}
+    runs = [autotune.sweep("az", (9.0, 0.02, 1.2), schedules, jobs=2, **grid) for _ in range(2)]
+    assert [(s, g) for s, g, _ in runs[0]] == [(s, g) for s, g, _ in runs[1]]
+    scores = [s for s, _, _ in runs[0]]
+    assert scores == sorted(scores) and len(scores) == 2
+    best = runs[0][0]
+    assert best[0] == pytest.approx(autotune._evaluate(("az", {a: s.to_dict() for a, s in schedules.items()},
+                                                         best[1]))[0])
@@ -0,0 +1,90 @@
+import time
+
+import numpy as np
+import pytest
+
+from sdr_signal.sources.capture import CaptureThread, FrameRing
+from sdr_signal.sources.mock_reader import MockSource
+
+def fill(ring, value, k=None):
+    slot = ring.acquire()
+    ring.buf[slot, :] = value
+    ring.commit(slot, ring.frame_len if k is None else k, timestamp=float(value))
+    return slot
+
+def test_ring_wraps_around_free_slots():
+    ring = FrameRing(3, 4)
+    seen = []
+    for v in range(7):
+        fill(ring, v)
+        fr = ring.get(timeout=0)
+        seen.append((fr.seq, fr.slot, fr.samples[0].real, fr.timestamp))
+    assert [s[0] for s in seen] == list(range(7))
+    assert {s[1] for s in seen} == {0, 1, 2}
+    assert [s[2] for s in seen] == [float(v) for v in range(7)]
+    assert ring.dropped == 0 and ring.captured == 7
+
+def test_ring_overwrites_oldest_unread_frame_and_counts_it():
+    ring = FrameRing(3, 4)
+    for v in range(5):
+        fill(ring, v)
+    assert ring.dropped == 2 and ring.pending == 3
+    got = [ring.get(timeout=0) for _ in range(3)]
+    assert [fr.seq for fr in got] == [2, 3, 4]
+    assert got[-1].samples[0].real == 4.0
+    assert ring.get(timeout=0) is None
+
+def test_ring_never_overwrites_the_held_frame():
+    ring = FrameRing(3, 4)
+    fill(ring, 1)
+    held = ring.get(timeout=0)
+    for v in range(2, 8):
+        fill(ring, v)
+    assert held.samples[0].real == 1.0
+    assert ring.dropped == 4
+
+def test_ring_partial_commit_and_close():
+    ring = FrameRing(3, 8)
+    fill(ring, 1, k=5)
+    assert len(ring.get(timeout=0).samples) == 5
+    ring.close()
+    t0 = time.monotonic()
+    assert ring.get(timeout=5.0) is None
+    assert time.monotonic() - t0 < 1.0
+    with pytest.raises(ValueError):
+        FrameRing(2, 8)
+
+def test_capture_thread_counts_frames_lost_to_a_slow_consumer():
+    ring = FrameRing(4, 1024)
+    cap = CaptureThread(MockSource(100e6, 1e6), ring).start()
+    got = []
+    deadline = time.monotonic() + 5.0
+    while ring.dropped == 0 and time.monotonic() < deadline:
+        time.sleep(0.02)
+    for _ in range(20):
+        fr = ring.get(timeout=1.0)
+        got.append(fr.seq)
+        assert fr.samples.dtype == np.complex64 and len(fr.samples) == 1024
+    cap.stop()
+    assert not cap.alive
+    assert cap.error is None
+    fr = ring.get(timeout=0)
+    while fr is not None:
+        got.append(fr.seq)
+        fr = ring.get(timeout=0)
+    c = cap.counters()
+    assert c["overruns"] == c["frames_dropped"] == ring.dropped > 0
+    assert got == sorted(got)
+    assert c["frames_captured"] == len(got) + c["overruns"]
+
+def test_capture_thread_ends_on_source_error():
+    class Broken(MockSource):
+        def _read_into(self, buf):
+            raise OSError("usb gone")
+
+    ring = FrameRing(3, 256)
+    cap = CaptureThread(Broken(100e6, 1e6), ring).start()
+    assert ring.get(timeout=2.0) is None
+    cap.stop()
+    assert not cap.alive
+    assert isinstance(cap.error, OSError) and ring.closed
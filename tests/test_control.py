@@ -0,0 +1,153 @@
+import os
+from collections import deque
+
+import numpy as np
+import pytest
+
+from gimbal.control import AdaptiveControl
+from gimbal.gain_schedule import load_schedules
+from gimbal.sim import SimPlant, VirtualClock
+from gimbal.trajectory import TargetTrajectory
+
+GAINS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "motorPID", "gains.json")
+
+def ramp(rate, axis, duration=60.0, period=0.02, start=(10.0, 30.0)):
+    """Tracks a constant-rate ramp on one axis with velocity feed-forward;
+    returns the tracking error and the duty on that axis after 5 s."""
+    clock = VirtualClock()
+    plant = SimPlant(clock, seed=0, start=start)
+    ctl = AdaptiveControl(load_schedules(GAINS), clock=clock.monotonic)
+    v = [0.0, 0.0]
+    v[axis] = rate
+    err, out = [], []
+    for k in range(int(duration / period)):
+        t = k * period
+        target = (start[0] + v[0] * t, start[1] + v[1] * t)
+        u = ctl.step(*target, *plant.read(), period, *v)
+        plant.drive(*u)
+        clock.advance(period)
+        if t > 5.0:
+            err.append(target[axis] - plant.truth()[axis])
+            out.append(u[axis])
+    return np.array(err), np.array(out)
+
+@pytest.mark.parametrize("rate", [0.06, 0.1, 0.3])
+def test_slow_ramp_is_tracked_without_limit_cycling(rate):
+    # Before the offset was scaled, any feed-forward inside the lock zone got
+    # the full 18 % minimum duty: az chattered (~950 duty reversals per
+    # minute) at 0.18 deg RMS.
+    err, out = ramp(rate, 0)
+    assert np.sqrt(np.mean(err ** 2)) < 0.16
+    assert np.count_nonzero(np.diff(np.sign(out))) < 20
+
+def test_slow_elevation_ramp():
+    err, _ = ramp(0.1, 1)
+    assert np.sqrt(np.mean(err ** 2)) < 0.16
+
+def test_lock_zone_without_target_motion_cuts_the_drive():
+    ctl = AdaptiveControl(load_schedules(GAINS))
+    assert ctl.step(10.0, 30.0, 10.1, 29.9, 0.02) == (0.0, 0.0)
+
+def test_trajectory_fits_and_extrapolates_a_ramp():
+    tr = TargetTrajectory()
+    for k in range(5):
+        tr.push(k * 0.5, 100.0 + 2.0 * k * 0.5, 20.0 - 1.0 * k * 0.5)
+    az, el, vaz, vel = tr.sample(2.5)
+    assert (az, el) == pytest.approx((105.0, 17.5))
+    assert (vaz, vel) == pytest.approx((2.0, -1.0))
+    # Past the horizon the target is held, not extrapolated further.
+    assert tr.sample(100.0)[2:] == (0.0, 0.0)
+
+def test_trajectory_unwraps_across_the_seam_and_restarts_on_steps():
+    tr = TargetTrajectory()
+    assert tr.push(0.0, 179.0, 10.0)
+    assert not tr.push(1.0, -179.0, 10.0)
+    assert tr.sample(1.0)[0] == pytest.approx(181.0)
+    assert tr.push(2.0, 90.0, 10.0)
+    assert tr.sample(2.5)[2] == 0.0
+
+def test_trajectory_sample_does_not_read_the_writer_buffer():
+    # A writer that runs between sample()'s checks must not break it: here
+    # hold() clears the points as soon as sample() looks at them.
+    class Racing(deque):
+        def __bool__(self):
+            tr.hold(0.0, 0.0)
+            return True
+
+    tr = TargetTrajectory()
+    tr.push(0.0, 1.0, 1.0)
+    tr.follow([0.5, 1.0], [0.0, 10.0], [0.0, 10.0])
+    tr._pts = Racing(tr._pts, maxlen=tr.window)
+    assert tr.sample(2.0) == (10.0, 10.0, 0.0, 0.0)
+
+class StaleSensor:
+    stale = True
+
+    def read(self):
+        return 0.0, 0.0
+
+    def close(self):
+        pass
+
+class RecordingActuator:
+    def __init__(self):
+        self.drives = 0
+        self.stops = 0
+        self.closed = False
+        self.after_close = 0
+
+    def drive(self, az, el):
+        self.drives += 1
+        if self.closed:
+            self.after_close += 1
+
+    def stop(self):
+        self.stops += 1
+
+    def close(self):
+        self.closed = True
+
+class FlakySensor:
+    stale = False
+
+    def __init__(self):
+        self.fail = True
+
+    def read(self):
+        if self.fail:
+            raise OSError("bus error")
+        return 0.0, 0.0
+
+    def close(self):
+        pass
+
+def test_controller_stops_motors_while_sensor_is_stale():
+    import time
+    from controller import MotorController
+    sensor, act = StaleSensor(), RecordingActuator()
+    ctrl = MotorController(mock=False, sensor=sensor, actuator=act, gains=GAINS, period=0.005)
+    try:
+        time.sleep(0.1)
+        assert act.drives == 0 and act.stops > 0 and ctrl.stale_ticks > 0
+        sensor.stale = False
+        time.sleep(0.1)
+        assert act.drives > 0
+    finally:
+        ctrl.close()
+
+def test_controller_survives_tick_errors_with_motors_stopped():
+    import time
+    from controller import MotorController
+    sensor, act = FlakySensor(), RecordingActuator()
+    ctrl = MotorController(mock=False, sensor=sensor, actuator=act, gains=GAINS, period=0.005)
+    try:
+        time.sleep(0.1)
+        assert act.drives == 0 and act.stops > 0
+        assert ctrl.faults > 0 and isinstance(ctrl.fault, OSError)
+        sensor.fail = False
+        time.sleep(0.1)
+        assert act.drives > 0
+    finally:
+        ctrl.close()
+    assert not ctrl._thread.is_alive()
+    assert act.after_close == 0
@@ -0,0 +1,146 @@
+import math
+import threading
+
+import numpy as np
+import pytest
+
+from sdr_signal.analysis.metrics import (NOISE_FLOORS, PSDEngine, compute_metrics, compute_metrics_batch, make_floor,
+                                         psd_arrays)
+
+# Baseline implementation (before PSDEngine), kept as the parity reference.
+
+def ref_psd_arrays(x, fs_hz, fc_hz, nfft):
+    m = min(len(x), nfft)
+    w = np.hanning(m)
+    X = np.fft.fftshift(np.fft.fft(x[:m] * w, nfft))
+    P = 10.0 * np.log10((np.abs(X) ** 2) / float(np.sum(w ** 2)) + 1e-12)
+    f = np.fft.fftshift(np.fft.fftfreq(nfft, d=1.0 / fs_hz)) + fc_hz
+    return P, f
+
+def ref_compute_metrics(x, fs_hz, fc_hz, nfft=1024):
+    avg_db = 10.0 * math.log10(float(np.var(x)) + 1e-12)
+    P, f = ref_psd_arrays(x, fs_hz, fc_hz, nfft)
+    i = int(np.argmax(P))
+    peak_db, peak_f_hz = float(P[i]), float(f[i])
+    floor_db = float(np.percentile(P, 10.0))
+    ratio = float(np.clip((peak_db - floor_db) / max(1.0, abs(floor_db)), 0.0, 1.0))
+    return {
+        "average_power_db": float(avg_db),
+        "peak_power_db": peak_db,
+        "peak_freq_hz": peak_f_hz,
+        "noise_floor_db": floor_db,
+        "signal_strength_ratio": ratio,
+        "psd_db": P.tolist(),
+        "psd_freq_hz": f.tolist(),
+    }
+
+FS = 2.048e6
+FC = 100e6
+
+def tone(n, f0=100e3, snr_db=10.0, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(n) / FS
+    s = np.exp(2j * np.pi * f0 * t) * 10 ** (snr_db / 20.0)
+    return (s + (rng.standard_normal(n) + 1j * rng.standard_normal(n)) / np.sqrt(2)).astype(np.complex64)
+
+@pytest.mark.parametrize("n, nfft", [(4096, 1024), (1024, 1024), (700, 1024), (3000, 1001), (500, 1001)])
+def test_psd_arrays_matches_baseline(n, nfft):
+    x = tone(n)
+    P, f = psd_arrays(x, FS, FC, nfft)
+    P0, f0 = ref_psd_arrays(x, FS, FC, nfft)
+    np.testing.assert_allclose(P, P0, atol=1e-6)
+    np.testing.assert_array_equal(f, f0)
+
+def test_compute_metrics_matches_baseline():
+    x = tone(8192)
+    r = compute_metrics(x, FS, FC, 1024)
+    ref = ref_compute_metrics(x, FS, FC, 1024)
+    for k in ("average_power_db", "peak_power_db", "noise_floor_db", "signal_strength_ratio"):
+        assert r[k] == pytest.approx(ref[k], abs=1e-6)
+    assert r["peak_freq_hz"] == ref["peak_freq_hz"]
+    np.testing.assert_allclose(r["psd_db"], ref["psd_db"], atol=1e-6)
+    assert r["psd_freq_hz"] == ref["psd_freq_hz"]
+    assert set(r.keys()) == set(ref.keys())
+
+def test_engine_buffer_is_reused_until_copied():
+    a = compute_metrics(tone(1024, seed=1), FS, FC, 1024)
+    kept = a.copy()
+    b = compute_metrics(tone(1024, seed=2), FS, FC, 1024)
+    assert a.psd is b.psd
+    np.testing.assert_allclose(kept.psd, ref_psd_arrays(tone(1024, seed=1), FS, FC, 1024)[0], atol=1e-6)
+    assert a.freq.flags.writeable is False
+
+def test_batch_matches_per_frame():
+    X = np.stack([tone(2048, f0=50e3 * (k + 1), seed=k) for k in range(6)])
+    b = compute_metrics_batch(X, FS, FC, 1024)
+    for k, x in enumerate(X):
+        ref = ref_compute_metrics(x, FS, FC, 1024)
+        assert b["average_power_db"][k] == pytest.approx(ref["average_power_db"], abs=1e-4)
+        assert b["peak_power_db"][k] == pytest.approx(ref["peak_power_db"], abs=1e-6)
+        assert b["peak_freq_hz"][k] == ref["peak_freq_hz"]
+        assert b["noise_floor_db"][k] == pytest.approx(ref["noise_floor_db"], abs=1e-6)
+
+def test_welch_matches_segment_average():
+    nfft, hop = 256, 128
+    x = tone(4096)
+    P, _ = psd_arrays(x, FS, FC, nfft, avg="welch", overlap=0.5)
+    w = np.hanning(nfft)
+    segs = [x[i:i + nfft] for i in range(0, len(x) - nfft + 1, hop)]
+    acc = np.mean([np.abs(np.fft.fftshift(np.fft.fft(s * w))) ** 2 for s in segs], axis=0)
+    np.testing.assert_allclose(P, 10.0 * np.log10(acc / np.sum(w ** 2) + 1e-12), atol=1e-6)
+
+def test_welch_short_capture_falls_back_to_single_frame():
+    x = tone(200)
+    np.testing.assert_allclose(psd_arrays(x, FS, FC, 256, avg="welch")[0], ref_psd_arrays(x, FS, FC, 256)[0],
+                               atol=1e-6)
+
+@pytest.mark.parametrize("n", [1024, 1001, 7])
+def test_partition_floor_equals_percentile(n):
+    P = np.random.default_rng(n).normal(-80.0, 5.0, n)
+    assert make_floor("partition")(P) == pytest.approx(np.percentile(P, 10.0), abs=1e-12)
+    assert make_floor("median")(P) == pytest.approx(np.median(P), abs=1e-12)
+    Q = P.reshape(1, -1).repeat(3, axis=0)
+    np.testing.assert_allclose(make_floor("partition").batch(Q), np.percentile(Q, 10.0, axis=1))
+
+def test_streaming_floor_converges_to_percentile():
+    rng = np.random.default_rng(3)
+    est = NOISE_FLOORS["streaming"]()
+    for _ in range(400):
+        v = est(rng.normal(-80.0, 3.0, 1024))
+    assert v == pytest.approx(-80.0 + 3.0 * -1.2816, abs=0.5)
+
+def test_unknown_options_raise():
+    with pytest.raises(ValueError):
+        make_floor("nope")
+    with pytest.raises(ValueError):
+        PSDEngine(1024, FS, FC, window="nope")
+    with pytest.raises(ValueError):
+        psd_arrays(tone(1024), FS, FC, 1024, avg="nope")
+
+def test_empty_input_raises():
+    x = np.zeros(0, dtype=np.complex64)
+    with pytest.raises(ValueError):
+        compute_metrics(x, FS, FC, 1024)
+    with pytest.raises(ValueError):
+        psd_arrays(x, FS, FC, 1024, avg="welch")
+    with pytest.raises(ValueError):
+        compute_metrics_batch(np.zeros((2, 0), dtype=np.complex64), FS, FC, 1024)
+
+def test_concurrent_threads_get_independent_buffers():
+    frames = [tone(4096, f0=40e3 * (k + 1), seed=k) for k in range(4)]
+    expected = [compute_metrics(x, FS, FC, 1024).copy() for x in frames]
+    errors = []
+
+    def work(k):
+        for _ in range(200):
+            r = compute_metrics(frames[k], FS, FC, 1024)
+            if r.peak_freq_hz != expected[k].peak_freq_hz or r.noise_floor_db != expected[k].noise_floor_db:
+                errors.append(k)
+                return
+
+    threads = [threading.Thread(target=work, args=(k,)) for k in range(len(frames))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from gimbal.passes import PassPredictor, Station, load_tle
+
+# Reference values: skyfield 1.55 (EarthSatellite, wgs84.latlon, find_events at 10 deg),
+# ISS TLE from the skyfield documentation, Bandung ground station.
+TLE = """ISS (ZARYA)
+1 25544U 98067A   14020.93268519  .00009878  00000-0  18200-3 0  5082
+2 25544  51.6498 109.4756 0003572  55.9686 274.8005 15.49815350868473
+"""
+NAME = "ISS (ZARYA)"
+BANDUNG = Station(-6.9147, 107.6098, 768.0)
+T0 = 1390262400.0  # 2014-01-21 00:00 UTC
+
+# t_unix: (az, el, range km, range rate km/s)
+LOOK = {
+    1390276500: (1.2912, 18.6666, 1068.503, -5.24943),
+    1390318100: (219.7579, 30.2097, 767.288, -5.96341),
+    1390318190: (306.0707, 83.4892, 419.895, -0.00646),
+    1390318300: (32.2229, 24.4030, 889.409, 6.27950),
+}
+# rise, culmination, set, max el
+PASSES = [
+    (1390276428.363, 1390276611.245, 1390276795.550, 33.0197),
+    (1390317989.038, 1390318189.954, 1390318389.252, 83.4894),
+]
+
+@pytest.fixture
+def predictor(tmp_path):
+    path = tmp_path / "iss.tle"
+    path.write_text(TLE)
+    return PassPredictor(str(path), BANDUNG, min_el=10.0)
+
+def test_load_tle(tmp_path):
+    path = tmp_path / "iss.tle"
+    path.write_text(TLE)
+    tle = load_tle(str(path))
+    assert list(tle) == [NAME]
+    assert tle[NAME][0].startswith("1 25544U") and tle[NAME][1].startswith("2 25544")
+
+def test_look_angles_match_reference(predictor):
+    t = np.array(list(LOOK), dtype=float)
+    az, el, rng, rr = predictor.look(NAME, t)
+    ref = np.array(list(LOOK.values()))
+    assert np.abs((az - ref[:, 0] + 180.0) % 360.0 - 180.0).max() < 0.1
+    assert np.abs(el - ref[:, 1]).max() < 0.05
+    assert np.abs(rng - ref[:, 2]).max() < 0.5
+    assert np.abs(rr - ref[:, 3]).max() < 0.005
+
+@pytest.mark.parametrize("step", [10.0, 30.0, 60.0])
+def test_pass_boundaries_within_table_step(predictor, step):
+    found = predictor.passes(NAME, start=T0, hours=24.0, step=step)
+    assert len(found) == len(PASSES)
+    for p, (aos, tca, los, max_el) in zip(found, PASSES):
+        assert abs(p.aos - aos) < step and abs(p.los - los) < step
+        assert abs(p.aos - aos) < 2.0 and abs(p.los - los) < 2.0
+        assert abs(p.tca - tca) < 2.0
+        assert p.max_el == pytest.approx(max_el, abs=0.1)
+
+def test_next_pass_and_doppler_sign(predictor):
+    p = predictor.next_pass(NAME, start=T0)
+    assert p.aos == pytest.approx(PASSES[0][0], abs=2.0)
+    tr = predictor.track(p, step=5.0)
+    assert tr.t[0] == p.aos and tr.t[-1] == p.los
+    d = tr.doppler_hz(437e6)
+    assert d[0] > 0 > d[-1]
+    az, el = tr.at(p.tca)
+    assert el == pytest.approx(p.max_el, abs=0.5)
+
+def test_track_cache(predictor):
+    p1, p2 = predictor.passes(NAME, start=T0, hours=24.0)
+    tr = predictor.track(p1)
+    assert predictor.track(p1) is tr
+    assert predictor.track(p1, step=2.0) is not tr
+    for k in range(PassPredictor._MAX_TRACKS):
+        predictor.track(p2, step=1.0 + k)
+    assert len(predictor._tracks) == PassPredictor._MAX_TRACKS
+    assert predictor.track(p1) is not tr
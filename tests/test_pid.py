@@ -0,0 +1,104 @@
+import os
+
+import numpy as np
+import pytest
+
+from gimbal.gain_schedule import GainSchedule, ScheduledPID, Table1D, load_schedules
+from gimbal.pid import PID, PIDArray
+
+GAINS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "motorPID", "gains.json")
+
+def wound_up(ki=0.05, steps=200):
+    pid = PID(5.0, ki, 0.0, -100, 100, clock=lambda: 0.0)
+    for _ in range(steps):
+        pid.compute(10.0, dt=0.05)
+    return pid
+
+@pytest.mark.parametrize("ki_seq", [(0.05, 0.0), (0.05, 0.0, 0.03), (0.05, 0.01), (0.05, 0.2)])
+def test_output_is_continuous_across_ki_changes(ki_seq):
+    pid = wound_up(ki_seq[0])
+    assert pid.i == pytest.approx(0.05 * 10.0 * 0.05 * 200)
+    u = pid.compute(10.0, dt=1e-6)
+    for ki in ki_seq[1:]:
+        pid.set_gains(5.0, ki, 0.0)
+        u2 = pid.compute(10.0, dt=1e-6)
+        assert u2 == pytest.approx(u, abs=1e-4)
+        u = u2
+
+def test_zero_ki_holds_the_integral_share():
+    pid = wound_up()
+    share = pid.i
+    pid.set_gains(5.0, 0.0, 0.0)
+    for _ in range(100):
+        pid.compute(-3.0, dt=0.05)
+    assert pid.i == share
+
+def test_zero_ki_leaks_the_share_without_a_step():
+    pid = wound_up()
+    pid.ileak = 0.5
+    pid.set_gains(5.0, 0.0, 0.0)
+    u = [pid.compute(0.0, dt=0.01) for _ in range(400)]
+    assert u[0] == pytest.approx(5.0, rel=0.03)
+    assert np.max(np.abs(np.diff(u))) < 0.1
+    assert u[-1] < 0.01
+
+def test_not_bumpless_rescales_the_share():
+    pid = wound_up()
+    share = pid.i
+    pid.set_gains(5.0, 0.1, 0.0, bumpless=False)
+    assert pid.i == pytest.approx(2 * share)
+    pid.set_gains(5.0, 0.0, 0.0, bumpless=False)
+    assert pid.i == 0.0
+
+def test_ilim_clamps_the_integral_share():
+    pid = PID(0.0, 1.0, 0.0, ilim=2.0)
+    for _ in range(100):
+        pid.compute(10.0, dt=0.1)
+    assert pid.i == 2.0
+    assert pid.compute(10.0, dt=0.1) == 2.0
+
+def test_anti_windup_keeps_output_near_saturation():
+    pid = PID(1.0, 0.5, 0.0, -20, 20, kaw=5.0)
+    for _ in range(1000):
+        u = pid.compute(50.0, dt=0.02)
+    assert u == 20.0
+    assert pid.kp * 50.0 + pid.i < 40.0
+
+def test_scheduled_pid_has_no_steps_across_table_knots():
+    # gains.json has ki = 0 at the smallest-error knot, so a slowly closing
+    # error drives ki to 0 while the integral is charged.
+    pid = ScheduledPID(load_schedules(GAINS)["az"], -70, 70, tau=0.0)
+    err = np.linspace(8.0, 0.0, 4001)
+    u = [pid.compute(e, dt=0.01) for e in err][1:]
+    assert np.max(np.abs(np.diff(u))) < 0.1
+    assert pid.ki == 0.0 and abs(pid.i) < 1e-6
+
+def test_scheduled_pid_integrates_up_to_the_baseline_limit():
+    # The old AdaptivePID clamped the error integral at 40 deg*s: with
+    # ki = 0.05 at 6.5 deg that is a 2 % share of the output.
+    pid = ScheduledPID(load_schedules(GAINS)["az"], -70, 70, tau=0.0)
+    for _ in range(1000):
+        pid.compute(6.5, dt=0.05)
+    assert pid.i == pytest.approx(0.05 * 40.0)
+    assert pid.compute(6.5, dt=0.05) == pytest.approx(8.0 * 6.5 + 2.0)
+
+def test_pid_array_matches_scalar_pid():
+    rng = np.random.default_rng(0)
+    gains = [(4.0, 0.05, 1.0), (8.0, 0.0, 2.0), (6.0, 0.2, 0.5)]
+    pids = [PID(kp, ki, kd, -30, 30, ilim=5.0, tau=0.05, rate=500.0, wrap=360.0, ileak=0.3) for kp, ki, kd in gains]
+    arr = PIDArray(3, *zip(*gains), -30, 30, ilim=5.0, tau=0.05, rate=500.0, wrap=360.0, ileak=0.3)
+    meas = np.zeros(3)
+    for _ in range(300):
+        meas = (meas + rng.normal(0, 3, 3) + 180.0) % 360.0 - 180.0
+        err = rng.normal(0, 20, 3)
+        ua = arr.compute(err, meas, 0.02)
+        us = [p.compute(e, m, 0.02) for p, e, m in zip(pids, err, meas)]
+        np.testing.assert_allclose(ua, us, atol=1e-9)
+
+def test_table_interpolates_and_clamps():
+    t = Table1D([0.0, 1.0, 3.0], [0.0, 10.0, 30.0])
+    assert (t(-1), t(0.5), t(2.0), t(9)) == (0.0, 5.0, 20.0, 30.0)
+    with pytest.raises(ValueError):
+        Table1D([0.0, 0.0], [1.0, 2.0])
+    g = GainSchedule([1.0, 2.0], [1.0, 2.0], [0.0, 0.1], [0.0, 0.0], [0.0, 90.0], [0.0, 12.0])
+    assert g.gains(-1.5) == (1.5, pytest.approx(0.05), 0.0) and g.gravity(45.0) == 6.0
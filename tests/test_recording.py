@@ -0,0 +1,82 @@
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from sdr_signal.sources.recording import IQRecorder, ReplaySource, read_sidecar
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RATE = 1e6
+FREQ = 433e6
+
+def record(path, frames=5, n=1000, t0=1000.0):
+    rng = np.random.default_rng(0)
+    data = []
+    with IQRecorder(path, RATE, FREQ, 30.0, "rtl") as rec:
+        for k in range(frames):
+            x = (rng.standard_normal(n) + 1j * rng.standard_normal(n)).astype(np.complex64)
+            rec.write(x, t0 + k * n / RATE)
+            data.append(x)
+    return np.concatenate(data)
+
+def test_replay_serves_recorded_samples_and_timestamps(tmp_path):
+    path = str(tmp_path / "cap.cf32")
+    data = record(path)
+    header, frames = read_sidecar(path)
+    assert header["device"] == "rtl" and len(frames) == 5
+    src = ReplaySource(path)
+    with src:
+        got = list(src.frames(1000))
+    assert len(got) == 5
+    np.testing.assert_array_equal(np.concatenate([x for x, _ in got]), data)
+    assert [t for _, t in got] == [1000.0 + k * 1e-3 for k in range(5)]
+    assert src.timestamp_at(1500) == 1000.0015
+
+def run_scan(*argv):
+    env = dict(os.environ, PYTHONPATH=os.path.join(ROOT, "src"))
+    out = subprocess.run([sys.executable, os.path.join(ROOT, "src", "sdr_signal", "cli", "scan_peak.py"),
+                          "--shm", "", "--out", "", *argv], env=env, capture_output=True, text=True, check=True)
+    return [json.loads(line) for line in out.stdout.splitlines()]
+
+def test_replay_keeps_recorded_device_and_flushes_last_interval(tmp_path):
+    path = str(tmp_path / "cap.cf32")
+    record(path)
+    # 5 frames of 1 ms with a 2.5 ms interval: frames 0-3 fill one interval, frame 4 is left over.
+    recs = run_scan("--replay", path, "--continuous", "--n", "1000", "--nfft", "256", "--interval", "0.0025")
+    assert len(recs) == 2
+    assert {r["device"] for r in recs} == {"rtl"}
+    assert all(r["t_mono"] is None for r in recs)
+    assert recs[-1]["frame_seq"] == 4
+
+def test_re_recording_a_replay_keeps_its_header(tmp_path):
+    path = str(tmp_path / "cap.cf32")
+    copy = str(tmp_path / "copy.cf32")
+    record(path)
+    run_scan("--replay", path, "--continuous", "--n", "1000", "--nfft", "256", "--record", copy)
+    header, frames = read_sidecar(copy)
+    assert (header["device"], header["center_freq_hz"], header["sample_rate_hz"], header["gain"]) == \
+        ("rtl", FREQ, RATE, 30.0)
+    assert len(frames) == 5
+
+def test_append_requires_the_same_settings(tmp_path):
+    path = str(tmp_path / "cap.cf32")
+    record(path, frames=2)
+    with IQRecorder(path, RATE, FREQ, "30", "rtl") as rec:
+        rec.write(np.zeros(1000, dtype=np.complex64), 2000.0)
+    header, frames = read_sidecar(path)
+    assert len(frames) == 3 and frames[-1]["offset"] == 2000
+    for args in ((2e6, FREQ, 30.0, "rtl"), (RATE, 434e6, 30.0, "rtl"), (RATE, FREQ, "auto", "rtl"),
+                 (RATE, FREQ, 30.0, "pluto")):
+        with pytest.raises(ValueError):
+            IQRecorder(path, *args)
+    assert len(read_sidecar(path)[1]) == 3
+
+def test_closed_replay_source_is_still_truthy(tmp_path):
+    path = str(tmp_path / "cap.cf32")
+    record(path, frames=3)
+    src = ReplaySource(path)
+    assert src and not src.is_open
+    assert src.n_samples == 3000
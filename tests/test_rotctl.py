@@ -0,0 +1,95 @@
+import socket
+
+import pytest
+
+from arbiter import TargetArbiter
+
+from rotctl_server import AsyncRotctlServer, RIG_EINTERNAL, RotctlServer, RotctlSession, _ProtocolConfig
+
+class FakeController:
+    def __init__(self):
+        self.pos = (10.0, 20.0)
+        self.targets = []
+        self.stops = 0
+        self.fail = None
+
+    def set_target(self, az, el):
+        if self.fail:
+            raise self.fail
+        self.targets.append((az, el))
+
+    def get_position(self):
+        return self.pos
+
+    def stop(self):
+        self.stops += 1
+
+def session(ctrl=None):
+    ctrl = ctrl or FakeController()
+    return RotctlSession(_ProtocolConfig(ctrl), "c1"), ctrl
+
+def test_pipelined_lines_are_answered_in_order():
+    s, ctrl = session()
+    reply, close = s.feed(b"P 1.5 2.5\np\n+\\get_pos\nq\n")
+    assert reply == (b"RPRT 0\nAzimuth: 10.000\nElevation: 20.000\n"
+                     b"get_pos:\nAzimuth: 10.000\nElevation: 20.000\nRPRT 0\nRPRT 0\n")
+    assert close and ctrl.targets == [(1.5, 2.5)]
+
+def test_partial_lines_are_buffered():
+    s, ctrl = session()
+    assert s.feed(b"P 1 ") == (b"", False)
+    assert s.feed(b"2\n") == (b"RPRT 0\n", False)
+    assert ctrl.targets == [(1.0, 2.0)]
+
+def test_bad_arguments_and_unknown_commands():
+    s, _ = session()
+    assert s.feed(b"P x 2\nP 1\nZ\n")[0] == b"RPRT -1\nRPRT -1\nRPRT -8\n"
+
+def test_handler_exception_gives_rprt_and_session_continues():
+    s, ctrl = session()
+    ctrl.fail = RuntimeError("motor fault")
+    assert s.feed(b"P 1 2\np\n")[0] == f"RPRT {RIG_EINTERNAL}\nAzimuth: 10.000\nElevation: 20.000\n".encode()
+
+def connect(srv):
+    return socket.create_connection(("127.0.0.1", srv.port), timeout=2.0)
+
+def recv_lines(conn, n):
+    buf = b""
+    while buf.count(b"\n") < n:
+        data = conn.recv(4096)
+        if not data:
+            break
+        buf += data
+    return buf.decode().splitlines()
+
+@pytest.fixture(params=[AsyncRotctlServer, RotctlServer])
+def server(request):
+    ctrl = FakeController()
+    srv = request.param(ctrl, host="127.0.0.1", port=0)
+    srv.start()
+    if isinstance(srv, AsyncRotctlServer):
+        srv.port = srv._server.sockets[0].getsockname()[1]
+        yield srv, ctrl
+        srv.shutdown()
+    else:
+        srv.port = srv._srv.getsockname()[1]
+        yield srv, ctrl
+
+def test_server_survives_handler_exception(server):
+    srv, ctrl = server
+    ctrl.fail = RuntimeError("motor fault")
+    with connect(srv) as c:
+        c.sendall(b"P 1 2\n")
+        assert recv_lines(c, 1) == [f"RPRT {RIG_EINTERNAL}"]
+        c.sendall(b"p\n")
+        assert recv_lines(c, 2) == ["Azimuth: 10.000", "Elevation: 20.000"]
+
+@pytest.mark.parametrize("arbiter", [False, True])
+def test_stop_and_reset_stop_the_rotator(server, arbiter):
+    srv, ctrl = server
+    if arbiter:
+        srv.arbiter = TargetArbiter(ctrl)
+    with connect(srv) as c:
+        c.sendall(b"S\n\\stop\nR 1\n")
+        assert recv_lines(c, 3) == ["RPRT 0"] * 3
+    assert ctrl.stops == 3
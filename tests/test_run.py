@@ -0,0 +1,37 @@
+import os
+import signal
+import socket
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def start(*argv):
+    env = dict(os.environ, PYTHONPATH=os.path.join(ROOT, "src"), PYTHONUNBUFFERED="1")
+    return subprocess.Popen([sys.executable, os.path.join(ROOT, "run.py"), *argv], cwd=ROOT, env=env,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+
+def test_without_driver_falls_back_to_mock():
+    port = free_port()
+    proc = start("--port", str(port))
+    try:
+        lines = [proc.stdout.readline() for _ in range(2)]
+        assert "posisi mock" in lines[0]
+        assert "mock=True" in lines[1]
+        with socket.create_connection(("127.0.0.1", port), timeout=2.0) as c:
+            c.sendall(b"p\n")
+            assert c.recv(100).startswith(b"Azimuth:")
+    finally:
+        proc.send_signal(signal.SIGINT)
+        proc.communicate(timeout=5)
+    assert proc.returncode == 0
+
+def test_sensor_without_driver_is_an_argument_error():
+    proc = start("--sensor", "sim")
+    _, err = proc.communicate(timeout=10)
+    assert proc.returncode == 2 and "--sensor" in err
@@ -0,0 +1,90 @@
+import sys
+
+import numpy as np
+import pytest
+
+import sky_scan
+from controller import PositionSnapshot
+from gimbal.skyscan import SkyMap, raster
+
+class StalledController:
+    """Never reaches the start point; optionally interrupted while waiting."""
+
+    interrupt = False
+
+    def __init__(self, *a, **kw):
+        self.calls = []
+        self.kw = kw
+        self.targets = []
+        StalledController.last = self
+
+    def set_target(self, az, el):
+        self.calls.append("set_target")
+        self.targets.append((az, el))
+
+    def snapshot(self):
+        if self.interrupt:
+            raise KeyboardInterrupt
+        return PositionSnapshot(0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+
+    def follow(self, *a):
+        self.calls.append("follow")
+
+    def stop(self):
+        self.calls.append("stop")
+
+    def close(self):
+        self.calls.append("close")
+
+@pytest.fixture
+def scan_args(monkeypatch, tmp_path):
+    monkeypatch.setattr(sky_scan, "MotorController", StalledController)
+    out = tmp_path / "map.npz"
+
+    def run(*extra):
+        monkeypatch.setattr(sys, "argv", ["sky_scan.py", "scan", "--az_min", "40", "--az_max", "50", "--el_min",
+                                          "10", "--el_max", "20", "--shm", str(tmp_path / "none.bin"),
+                                          "--out", str(out), *extra])
+        sky_scan.main()
+        return StalledController.last, out
+    return run
+
+def test_stalled_preposition_times_out_and_stops(scan_args, monkeypatch):
+    monkeypatch.setattr(StalledController, "interrupt", False)
+    ctrl, out = scan_args("--start_timeout", "0.2")
+    assert ctrl.calls == ["set_target", "stop", "close"]
+    assert not out.exists()
+
+def test_ctrl_c_during_preposition_stops_the_motors(scan_args, monkeypatch):
+    monkeypatch.setattr(StalledController, "interrupt", True)
+    ctrl, out = scan_args()
+    assert ctrl.calls == ["set_target", "stop", "close"]
+    assert not out.exists()
+
+def test_scan_grid_and_controller_use_the_azimuth_limits(scan_args, monkeypatch):
+    monkeypatch.setattr(StalledController, "interrupt", False)
+    ctrl, _ = scan_args("--start_timeout", "0.0", "--az_limit_min", "45", "--az_limit_max", "200",
+                        "--profile", "scurve")
+    assert ctrl.kw["az_limits"] == (45.0, 200.0) and ctrl.kw["profile"] == "scurve"
+    assert ctrl.targets == [(45.0, 10.0)]
+    monkeypatch.setattr(StalledController, "last", None)
+    ctrl, out = scan_args("--az_limit_max", "30")
+    assert ctrl is None and not out.exists()
+
+def test_skymap_bins_interpolated_frames(tmp_path):
+    sky = SkyMap((0.0, 10.0), (0.0, 10.0), 1.0)
+    pos_t = np.array([0.0, 10.0])
+    n = sky.add_frames([0.5, 2.5, 2.6, 20.0], [-10.0, -20.0, -20.0, 0.0], pos_t, [0.0, 10.0], [5.0, 5.0])
+    assert n == 3
+    assert sky.query(0.5, 5.2) == pytest.approx((-10.0, -10.0, 1))
+    assert sky.query(2.5, 5.2)[2] == 2
+    assert sky.peaks(1)[0][:2] == (0.5, 5.5)
+    path = str(tmp_path / "m.npz")
+    sky.save(path)
+    np.testing.assert_array_equal(SkyMap.load(path).hits, sky.hits)
+
+def test_raster_covers_the_box_at_the_requested_speed():
+    t, az, el = raster((0.0, 10.0), (0.0, 4.0), step=2.0, speed=5.0)
+    assert (az.min(), az.max(), el.min(), el.max()) == (0.0, 10.0, 0.0, 4.0)
+    v = np.hypot(np.diff(az), np.diff(el)) / np.diff(t)
+    assert np.max(v) <= 5.0 + 1e-6
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from gimbal.slew import Profile, SlewPlan, branches, choose_wrap, nearest_branch, plan_pass
+
+@pytest.mark.parametrize("shape", ["trapezoid", "scurve"])
+@pytest.mark.parametrize("d", [0.5, 10.0, 120.0, -90.0])
+def test_profile_respects_limits_and_lands_on_goal(shape, d):
+    p = Profile(5.0, 5.0 + d, 20.0, 10.0, shape)
+    t = np.linspace(0.0, p.duration, 4001)
+    x, v = np.array([p.sample(s) for s in t]).T
+    assert x[0] == 5.0 and x[-1] == 5.0 + d and v[-1] == 0.0
+    assert np.max(np.abs(v)) <= 20.0 + 1e-9
+    a = np.diff(v) / np.diff(t)
+    assert np.max(np.abs(a)) <= 10.0 * 1.01
+    # Velocity is the derivative of position.
+    np.testing.assert_allclose(np.gradient(x, t), v, atol=0.05 * max(1.0, np.max(np.abs(v))))
+
+def test_scurve_starts_without_an_acceleration_step():
+    p = Profile(0.0, 50.0, 20.0, 10.0, "scurve")
+    assert p.sample(1e-3)[1] / 1e-3 < 0.1
+    assert Profile(0.0, 50.0, 20.0, 10.0).sample(1e-3)[1] / 1e-3 == pytest.approx(10.0)
+
+def test_slew_plan_axes_arrive_together():
+    plan = SlewPlan((0.0, 10.0), (100.0, 15.0))
+    assert plan.az.duration == pytest.approx(plan.el.duration)
+    t, az, el = plan.arrays(50.0)
+    assert t[0] == 50.0 and t[-1] == pytest.approx(50.0 + plan.duration)
+    assert (az[-1], el[-1]) == (100.0, 15.0)
+
+def test_branches_and_nearest_branch():
+    assert branches(170.0, (-270.0, 270.0)) == [-190.0, 170.0]
+    assert nearest_branch(170.0, -100.0, (-270.0, 270.0)) == -190.0
+    assert nearest_branch(-170.0, 100.0, (-270.0, 270.0)) == 190.0
+    assert nearest_branch(200.0, 0.0, (-90.0, 90.0)) == -90.0
+
+def test_pass_across_the_seam_needs_no_unwind():
+    # A pass from bearing 150 through 180 to 210 with +-270 limits: the
+    # branch 150..210 holds it, where -210..-150 would leave the limits.
+    track = (np.linspace(150.0, 210.0, 61) + 180.0) % 360.0 - 180.0
+    assert choose_wrap(0.0, track, (-270.0, 270.0)) == 0.0
+    az, plan = plan_pass((0.0, 0.0), track, np.full(61, 20.0), (-270.0, 270.0))
+    assert np.all(np.diff(az) > 0) and az[0] == pytest.approx(150.0) and az[-1] == pytest.approx(210.0)
+    assert plan.sample(plan.duration)[:2] == (pytest.approx(150.0), 20.0)
+    with pytest.raises(ValueError):
+        choose_wrap(0.0, [100.0, 110.0], (-50.0, 50.0))
+
+def test_wrap_cost_counts_lost_samples_in_seconds():
+    # Same 280 -> 250 bearing track, only the sample spacing differs: the
+    # near branch loses 10 samples above +270, the far one (-80..-110) costs
+    # a 14 s slew. Half-second samples are worth losing, 5 s ones are not.
+    track = np.linspace(280.0, 250.0, 31)
+    assert choose_wrap(200.0, track, (-270.0, 270.0), step=0.5) == 0.0
+    assert choose_wrap(200.0, track, (-270.0, 270.0), step=5.0) == -360.0
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from sdr_signal.analysis.metrics import compute_metrics
+from sdr_signal.sources.base import SampleSource, open_source, parse_gain
+from sdr_signal.sources.mock_reader import MockSource
+
+FS = 1.024e6
+FC = 100e6
+
+class CountingSource(SampleSource):
+    device = "count"
+
+    def __init__(self, total=10000, chunk=300):
+        super().__init__(FC, FS)
+        self.total = total
+        self.chunk = chunk
+        self.calls = []
+
+    def _open(self):
+        self.calls.append("open")
+
+    def _close(self):
+        self.calls.append("close")
+
+    def _retune(self, freq_hz):
+        self.calls.append(("retune", freq_hz))
+
+    def _read_into(self, buf):
+        n = min(len(buf), self.chunk, self.total)
+        buf[:n] = 1.0
+        self.total -= n
+        return n
+
+def test_mock_read_length_dtype_and_tone():
+    with MockSource(FC, FS, tone_offset_hz=100e3) as src:
+        x = src.read(4096)
+        assert src.is_open
+    assert len(x) == 4096
+    assert x.dtype == np.complex64
+    assert compute_metrics(x, FS, FC, 1024).peak_freq_hz == pytest.approx(FC + 100e3, abs=FS / 1024)
+    assert not src.is_open
+
+def test_read_spans_short_device_reads_and_stops_when_exhausted():
+    src = CountingSource(total=1000, chunk=300)
+    assert len(src.read(700)) == 700
+    assert len(src.read(700)) == 300
+    assert len(src.read(700)) == 0
+    assert src.calls == ["open"]
+
+def test_retune_only_reaches_device_when_open():
+    src = CountingSource()
+    src.retune(101e6)
+    assert src.freq_hz == 101e6
+    assert src.calls == []
+    src.open()
+    src.retune(102e6)
+    assert src.calls == ["open", ("retune", 102e6)]
+    src.close()
+
+def test_open_and_close_are_idempotent():
+    src = CountingSource()
+    src.open()
+    src.open()
+    src.close()
+    src.close()
+    with src:
+        pass
+    src.close()
+    assert src.calls == ["open", "close", "open", "close"]
+
+def test_open_source_selection():
+    assert isinstance(open_source("rtl", FC, FS, mock=True), MockSource)
+    with pytest.raises(ValueError):
+        open_source("nope", FC, FS)
+    assert parse_gain("AUTO") == "auto"
+    assert parse_gain("12.5") == 12.5
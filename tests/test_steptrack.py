@@ -0,0 +1,46 @@
+import math
+
+import pytest
+
+from gimbal.steptrack import PEAKERS
+
+SOURCE = (1.2, -0.8)  # pointing error to be found (deg)
+
+def beam_db(daz, del_, beamwidth=3.0):
+    return -12.0 * (math.hypot(daz, del_) / beamwidth) ** 2
+
+class Clock:
+    t = 0.0
+
+    def __call__(self):
+        return self.t
+
+@pytest.mark.parametrize("name", ["step", "conical"])
+def test_peaker_converges_on_the_signal(name):
+    clock = Clock()
+    pk = PEAKERS[name](0.5, clock=clock)
+    for k in range(int(600 / 0.05)):
+        clock.t = k * 0.05
+        oaz, oel = pk.offset(clock.t, 0.0)
+        p = beam_db(oaz - SOURCE[0], oel - SOURCE[1])
+        pk.add_record({"t_mono": clock.t, "peak_power_db": -40.0 + p, "noise_floor_db": -80.0})
+    assert pk.correction == pytest.approx(SOURCE, abs=0.2)
+    assert pk.updates > 0
+
+def test_peaker_ignores_weak_or_unstamped_records():
+    clock = Clock()
+    pk = PEAKERS["step"](0.5, clock=clock)
+    for k in range(2000):
+        clock.t = k * 0.05
+        pk.add_record({"t_mono": clock.t, "peak_power_db": -78.0 + k % 3, "noise_floor_db": -80.0})
+        pk.add_record({"peak_power_db": -20.0})
+    assert pk.correction == (0.0, 0.0) and pk.updates == 0
+
+def test_correction_is_bounded():
+    clock = Clock()
+    pk = PEAKERS["step"](0.5, max_offset=1.0, clock=clock)
+    for k in range(int(600 / 0.05)):
+        clock.t = k * 0.05
+        oaz, oel = pk.offset(clock.t, 0.0)
+        pk.add_record({"t_mono": clock.t, "peak_power_db": -40.0 + beam_db(oaz - 2.5, oel), "noise_floor_db": -80.0})
+    assert pk.correction[0] == pytest.approx(1.0)
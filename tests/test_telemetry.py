@@ -0,0 +1,100 @@
+import json
+import threading
+import time
+
+from sdr_signal.telemetry import HEADER, TelemetryReader, TelemetryWriter
+from telemetry_sdr import TelemetrySDR
+
+def test_round_trip_drops_missing_fields(tmp_path):
+    path = str(tmp_path / "t.bin")
+    w = TelemetryWriter(path)
+    r = TelemetryReader(path)
+    assert r.read() is None
+    w.write({"timestamp": 1.5, "t_mono": None, "peak_power_db": -40.0, "frame_seq": 7, "device": "rtl"})
+    rec = r.read()
+    assert rec == {"timestamp": 1.5, "peak_power_db": -40.0, "frame_seq": 7, "device": "rtl"}
+    assert r.seq == 2
+    w.close()
+    r.close()
+
+def test_writer_resumes_even_sequence(tmp_path):
+    path = str(tmp_path / "t.bin")
+    w = TelemetryWriter(path)
+    w.write({"timestamp": 1.0})
+    w.close()
+    w = TelemetryWriter(path)
+    w.write({"timestamp": 2.0})
+    r = TelemetryReader(path)
+    assert r.read()["timestamp"] == 2.0 and r.seq == 6
+    w.close()
+    r.close()
+
+def test_closed_writer_invalidates_the_record(tmp_path):
+    path = str(tmp_path / "t.bin")
+    w = TelemetryWriter(path)
+    r = TelemetryReader(path, retries=3)
+    w.write({"timestamp": 1.0})
+    assert r.read() == {"timestamp": 1.0}
+    w.close()
+    assert r.read() is None
+    w = TelemetryWriter(path)
+    assert r.read() is None
+    w.write({"timestamp": 2.0})
+    assert r.read() == {"timestamp": 2.0} and r.seq == 6
+    w.close()
+    r.close()
+
+def test_telemetry_sdr_falls_back_to_json_when_shm_is_stale(tmp_path):
+    path = str(tmp_path / "t.bin")
+    js = tmp_path / "last.json"
+    js.write_text(json.dumps({"peak_power_db": -70.0}))
+    w = TelemetryWriter(path)
+    tel = TelemetrySDR(str(js), interval=0.0, shm_path=path, max_age=1.0)
+    w.write({"t_mono": time.monotonic(), "peak_power_db": -40.0})
+    assert tel.poll()["peak_power_db"] == -40.0
+    w.write({"t_mono": time.monotonic() - 5.0, "peak_power_db": -40.0})
+    assert tel.poll() == {"peak_power_db": -70.0}
+    w.write({"t_mono": time.monotonic(), "peak_power_db": -41.0})
+    assert tel.poll()["peak_power_db"] == -41.0
+    w.close()
+    assert tel.poll() == {"peak_power_db": -70.0}
+
+def test_reader_rejects_payload_not_matching_checksum(tmp_path):
+    # Simulates a reader that sees the new even seq before the payload stores
+    # (weakly ordered memory): the CRC no longer matches and the copy is refused.
+    path = str(tmp_path / "t.bin")
+    w = TelemetryWriter(path)
+    w.write({"timestamp": 1.0, "peak_power_db": -50.0})
+    w._mm[HEADER.size] ^= 0xFF
+    r = TelemetryReader(path, retries=3)
+    assert r.read() is None
+    w.write({"timestamp": 2.0, "peak_power_db": -50.0})
+    assert r.read()["timestamp"] == 2.0
+    w.close()
+    r.close()
+
+def test_concurrent_reads_are_never_torn(tmp_path):
+    path = str(tmp_path / "t.bin")
+    w = TelemetryWriter(path)
+    w.write({"timestamp": 0.0, "peak_power_db": 0.0})
+    stop = threading.Event()
+
+    def writer():
+        k = 0
+        while not stop.is_set():
+            k += 1
+            w.write({"timestamp": float(k), "peak_power_db": -float(k)})
+
+    t = threading.Thread(target=writer)
+    t.start()
+    r = TelemetryReader(path)
+    try:
+        for _ in range(20000):
+            rec = r.read()
+            if rec is not None:
+                assert rec["peak_power_db"] == -rec["timestamp"]
+    finally:
+        stop.set()
+        t.join()
+    w.close()
+    r.close()
@@ -0,0 +1,161 @@
+import sys
+import time
+
+import pytest
+import serial
+
+from gimbal.fake_wt901 import FakeWT901
+from gimbal.wt901 import (BAUD_CODES, RATE_CODES, REG_BAUD, REG_KEY, REG_RRATE, REG_SAVE, UNLOCK_KEY, WT901,
+                          WT901Error, WT901Sensor, _frame, crc16)
+
+@pytest.fixture
+def fake():
+    f = FakeWT901(angles=(1.0, 12.5, -30.0))
+    yield f
+    f.close()
+
+def wait_for(cond, timeout=2.0):
+    end = time.monotonic() + timeout
+    while not cond():
+        if time.monotonic() > end:
+            return False
+        time.sleep(0.005)
+    return True
+
+def test_crc16_modbus():
+    assert crc16(b"123456789") == 0x4B37
+    # Read 3 registers from 0x3D at address 0x50, CRC low byte first.
+    assert _frame(bytes.fromhex("5003003d0003")).hex() == "5003003d00039986"
+
+def test_read_angles_decodes_signed_registers(fake):
+    dev = WT901(fake.port, 9600)
+    try:
+        assert dev.read_angles() == pytest.approx((1.0, 12.5, -30.0), abs=0.01)
+        fake.angles = (-179.99, 0.0, 90.0)
+        assert dev.read_angles() == pytest.approx((-179.99, 0.0, 90.0), abs=0.01)
+        assert dev.read_registers(REG_BAUD, 1) == (BAUD_CODES[9600],)
+    finally:
+        dev.close()
+
+def test_set_rate_and_baud_unlock_write_and_save(fake):
+    dev = WT901(fake.port, 9600)
+    try:
+        dev.set_rate(100)
+        dev.set_baud(115200)
+        assert dev.baud == 115200
+        assert fake.regs[REG_RRATE] == RATE_CODES[100]
+        assert fake.regs[REG_BAUD] == BAUD_CODES[115200]
+        assert fake.regs[REG_KEY] == UNLOCK_KEY and fake.regs[REG_SAVE] == 0
+        with pytest.raises(ValueError):
+            dev.set_baud(12345)
+    finally:
+        dev.close()
+
+def test_wrong_address_times_out(fake):
+    dev = WT901(fake.port, 9600, addr=0x51, timeout=0.05)
+    try:
+        with pytest.raises(WT901Error):
+            dev.read_angles()
+    finally:
+        dev.close()
+
+def test_sensor_goes_stale_when_replies_stop_and_recovers(fake):
+    s = WT901Sensor(fake.port, 9600, timeout=0.02, max_age=0.1)
+    try:
+        assert wait_for(lambda: s.reads > 0)
+        assert not s.stale and s.read() == pytest.approx((-30.0, 12.5), abs=0.01)
+        fake.mute = True
+        assert wait_for(lambda: s.stale)
+        assert s.errors > 0
+        fake.mute = False
+        assert wait_for(lambda: not s.stale)
+    finally:
+        s.close()
+
+def test_sensor_backs_off_and_reopens_after_port_failure(fake, monkeypatch):
+    s = WT901Sensor(fake.port, 9600, timeout=0.02, backoff=0.05, max_backoff=0.2)
+    try:
+        assert wait_for(lambda: s.reads > 0)
+        ok = s.dev.read_angles
+        fail = {"n": 0}
+
+        def unplugged():
+            fail["n"] += 1
+            raise serial.SerialException("device disconnected")
+
+        monkeypatch.setattr(s.dev, "read_angles", unplugged)
+        monkeypatch.setattr(s.dev, "reopen", lambda: None)
+        time.sleep(0.5)
+        # Backoff 0.05, 0.1, 0.2, 0.2...: a handful of attempts, not a busy spin.
+        assert 2 <= fail["n"] <= 6
+        monkeypatch.setattr(s.dev, "read_angles", ok)
+        assert wait_for(lambda: not s.stale)
+        assert s.reopens >= 2
+    finally:
+        s.close()
+
+SDK_DEVICE_MODEL = '''
+class _Config:
+    pass
+
+class _Processor:
+    def __init__(self):
+        self.onVarChanged = []
+
+class DeviceModel:
+    fail = False
+    last = None
+
+    def __init__(self, name, resolver, processor, key):
+        self.serialConfig = _Config()
+        self.dataProcessor = _Processor()
+        self.closed = False
+        DeviceModel.last = self
+
+    def openDevice(self):
+        pass
+
+    def closeDevice(self):
+        self.closed = True
+
+    def getDeviceData(self, key):
+        return {"angleZ": -30.0, "angleY": 12.5}[key]
+
+    def readReg(self, reg, count):
+        if DeviceModel.fail:
+            raise OSError("serial gone")
+        for cb in self.dataProcessor.onVarChanged:
+            cb(self)
+'''
+
+@pytest.fixture
+def sdk(tmp_path, monkeypatch):
+    files = {"lib/device_model.py": SDK_DEVICE_MODEL,
+             "lib/data_processor/roles/jy901s_dataProcessor.py": "class JY901SDataProcessor:\n    pass\n",
+             "lib/protocol_resolver/roles/protocol_485_resolver.py": "class Protocol485Resolver:\n    pass\n"}
+    for name, text in files.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    for mod in [m for m in sys.modules if m == "lib" or m.startswith("lib.")]:
+        monkeypatch.delitem(sys.modules, mod)
+    yield str(tmp_path)
+    for mod in [m for m in sys.modules if m == "lib" or m.startswith("lib.")]:
+        del sys.modules[mod]
+    sys.path.remove(str(tmp_path))
+
+def test_sdk_sensor_goes_stale_and_survives_read_errors(sdk):
+    from gimbal.backends import WT901SdkSensor
+    sensor = WT901SdkSensor(sdk_path=sdk, poll=0.005, max_age=0.1, max_backoff=0.02)
+    dev_cls = sys.modules["lib.device_model"].DeviceModel
+    try:
+        assert wait_for(lambda: not sensor.stale)
+        assert sensor.read() == (-30.0, 12.5)
+        dev_cls.fail = True
+        assert wait_for(lambda: sensor.stale and sensor.errors > 2)
+        dev_cls.fail = False
+        assert wait_for(lambda: not sensor.stale)
+        assert sensor._thread.is_alive()
+    finally:
+        sensor.close()
+    assert not sensor._thread.is_alive() and dev_cls.last.closed